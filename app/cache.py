@@ -0,0 +1,285 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # optional: json + json_default give the same output, slower
+    orjson = None
+
+from app.db import _env_float, _env_int
+from app.ingest.version import get_data_version
+from app.metrics import add_stage_time, stage_total
+
+
+def json_default(value):
+    """
+    Types jsonable_encoder used to convert before encoding, converted the same
+    way: Decimal -> int when it has no fractional digits, else float; dates and
+    times -> ISO 8601; RowMapping (any Mapping) -> object.
+    """
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (date, datetime, dt_time)):
+        return value.isoformat()
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(payload) -> bytes:
+    """
+    Compact UTF-8 JSON of a report payload. Rows can stay RowMappings with
+    Decimal/datetime values; they are converted while encoding instead of in
+    a jsonable_encoder pass over the whole payload first. Uses orjson when it
+    is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        payload,
+        default=json_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class ReportCache:
+    """
+    In-process LRU of encoded report responses (thread-safe).
+
+    Every entry belongs to one data version (salesops.data_version_seq). The
+    importer bumps the version after each commit, so the first lookup that
+    sees a new version drops everything; entries never outlive the data they
+    were built from by more than version_ttl seconds.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        version_ttl: float = 2.0,
+        historical_max_age: int = 300,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.version_ttl = version_ttl
+        self.historical_max_age = historical_max_age
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._version = None
+        self._version_checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_entries=_env_int("REPORT_CACHE_MAX_ENTRIES", 256),
+            max_bytes=_env_int("REPORT_CACHE_MAX_BYTES", 64 * 1024 * 1024),
+            version_ttl=_env_float("REPORT_CACHE_VERSION_TTL", 2.0),
+            historical_max_age=_env_int("REPORT_HISTORICAL_MAX_AGE", 300),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def current_version(self, conn) -> int:
+        """Data version, re-read from the database at most every version_ttl seconds."""
+        version = self.known_version()
+        if version is not None:
+            return version
+        now = time.monotonic()
+        version = get_data_version(conn)
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._bytes = 0
+                self._version = version
+            self._version_checked_at = now
+        return version
+
+    def known_version(self):
+        """Data version if it was checked within version_ttl, else None (never queries)."""
+        with self._lock:
+            if self._version is not None and time.monotonic() - self._version_checked_at < self.version_ttl:
+                return self._version
+        return None
+
+    def get(self, key, version: int):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, version: int, body: bytes):
+        size = len(body)
+        with self._lock:
+            # A response built from an older version must not be stored under the new one
+            if version != self._version or size > self.max_bytes:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[1])
+            self._entries[key] = (version, body)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "data_version": self._version,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+def cache_key(endpoint: str, params: dict) -> tuple:
+    """Order-independent key; dates and numbers are normalized so equal queries share an entry."""
+    items = []
+    for name, value in sorted(params.items()):
+        if isinstance(value, str):
+            value = value.strip()
+        elif isinstance(value, float):
+            value = round(value, 6)
+        elif isinstance(value, list):
+            # Multi-value filters (pivot); keys must stay hashable
+            value = tuple(value)
+        items.append((name, value))
+    return (endpoint, tuple(items))
+
+
+# =========================
+# HTTP revalidation
+# =========================
+
+def report_etag(version: int, request: Request) -> str:
+    """
+    Weak ETag from the data version plus the request path and query string
+    (sorted, so parameter order does not matter). Weak because GZipMiddleware
+    may re-encode the body.
+    """
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    digest = hashlib.sha1(f"{request.url.path}?{query}".encode("utf-8")).hexdigest()[:16]
+    return f'W/"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/"x" matches "x"
+    wanted = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if (tag[2:] if tag.startswith("W/") else tag) == wanted:
+            return True
+    return False
+
+
+def cache_control(request: Request, historical_max_age: int) -> str:
+    """
+    Ranges that ended before today only change on a backfill, so browsers may
+    reuse them for a while; anything touching today must be revalidated.
+    """
+    try:
+        end = date.fromisoformat(request.query_params.get("end_date", "").strip())
+    except ValueError:
+        return "no-cache"
+    if end < date.today() and historical_max_age > 0:
+        return f"private, max-age={historical_max_age}"
+    return "no-cache"
+
+
+def not_modified(request: Request, version: int):
+    """304 for a matching If-None-Match, else None."""
+    etag = report_etag(version, request)
+    if not etag_matches(request.headers.get("if-none-match", ""), etag):
+        return None
+    cache = request.app.state.report_cache
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": cache_control(request, cache.historical_max_age)},
+    )
+
+
+def timed_build(build):
+    """build() with its non-SQL time recorded as the "convert" stage (SQL time is recorded by fetch_*)."""
+    sql_before = stage_total("sql")
+    t0 = time.perf_counter()
+    payload = build()
+    add_stage_time("convert", time.perf_counter() - t0 - (stage_total("sql") - sql_before))
+    return payload
+
+
+def timed_encode(payload) -> bytes:
+    t0 = time.perf_counter()
+    body = encode_json(payload)
+    add_stage_time("encode", time.perf_counter() - t0)
+    return body
+
+
+def cached_report(request: Request, conn, endpoint: str, params: dict, build) -> Response:
+    """
+    Serve endpoint(params) from the app's ReportCache, calling build() (which
+    returns the JSON payload) only on a miss. Responses carry an ETag tied to
+    the data version; a matching If-None-Match gets 304 without running build().
+    """
+    cache = getattr(request.app.state, "report_cache", None)
+    if cache is None:
+        return Response(timed_encode(timed_build(build)), media_type="application/json")
+
+    version = cache.current_version(conn)
+    response = not_modified(request, version)
+    if response is not None:
+        return response
+
+    headers = {
+        "ETag": report_etag(version, request),
+        "Cache-Control": cache_control(request, cache.historical_max_age),
+    }
+    if not cache.enabled:
+        return Response(timed_encode(timed_build(build)), media_type="application/json", headers=headers)
+
+    key = cache_key(endpoint, params)
+    body = cache.get(key, version)
+    if body is not None:
+        return Response(body, media_type="application/json", headers={**headers, "X-Cache": "HIT"})
+
+    body = timed_encode(timed_build(build))
+    cache.put(key, version, body)
+    return Response(body, media_type="application/json", headers={**headers, "X-Cache": "MISS"})
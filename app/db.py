@@ -1,11 +1,147 @@
 import os
+import threading
+import time
+
+from fastapi import HTTPException, Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from dotenv import load_dotenv
 
+from app.metrics import add_stage_time
+
 load_dotenv()  # 自动读取 .env
 
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 def get_engine():
     database_url = os.environ.get("DATABASE_URL")
     if not database_url:
         raise RuntimeError("Missing DATABASE_URL in environment or .env")
-    return create_engine(database_url, future=True)
+    return create_engine(
+        database_url,
+        future=True,
+        pool_size=_env_int("DB_POOL_SIZE", 5),
+        max_overflow=_env_int("DB_MAX_OVERFLOW", 10),
+        pool_timeout=_env_int("DB_POOL_TIMEOUT", 30),
+        pool_recycle=_env_int("DB_POOL_RECYCLE", 1800),
+        pool_pre_ping=_env_bool("DB_POOL_PRE_PING", True),
+    )
+
+
+def async_database_url() -> str:
+    """ASYNC_DATABASE_URL, or DATABASE_URL with its driver switched to asyncpg."""
+    url = os.environ.get("ASYNC_DATABASE_URL")
+    if url:
+        return url
+    database_url = os.environ.get("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("Missing DATABASE_URL in environment or .env")
+    return make_url(database_url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+def get_async_engine():
+    # asyncpg is only needed when DB_ASYNC is enabled
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    return create_async_engine(
+        async_database_url(),
+        pool_size=_env_int("DB_POOL_SIZE", 5),
+        max_overflow=_env_int("DB_MAX_OVERFLOW", 10),
+        pool_timeout=_env_int("DB_POOL_TIMEOUT", 30),
+        pool_recycle=_env_int("DB_POOL_RECYCLE", 1800),
+        pool_pre_ping=_env_bool("DB_POOL_PRE_PING", True),
+    )
+
+
+def async_enabled() -> bool:
+    return _env_bool("DB_ASYNC", False)
+
+
+# =========================
+# Pool metrics
+# =========================
+
+# Upper bounds (seconds) of the checkout wait histogram
+CHECKOUT_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolMetrics:
+    """Checkout wait-time histogram for the app engine (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.bucket_counts = [0] * len(CHECKOUT_WAIT_BUCKETS)
+
+    def record_checkout(self, seconds: float):
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            for i, upper in enumerate(CHECKOUT_WAIT_BUCKETS):
+                if seconds <= upper:
+                    self.bucket_counts[i] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.count,
+                "wait_ms_avg": round(self.total_seconds / self.count * 1000, 3) if self.count else 0.0,
+                "wait_ms_max": round(self.max_seconds * 1000, 3),
+                "wait_buckets_le_seconds": dict(zip(map(str, CHECKOUT_WAIT_BUCKETS), self.bucket_counts)),
+            }
+
+
+def pool_status(engine) -> dict:
+    pool = engine.pool
+    return {
+        "pool_size": pool.size(),
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "max_overflow": getattr(pool, "_max_overflow", None),
+    }
+
+
+# =========================
+# FastAPI wiring (engine is created/disposed by the app lifespan in app.main)
+# =========================
+
+def get_async_db_engine(request: Request):
+    """Dependency: the app's AsyncEngine (each query checks out its own connection)."""
+    engine = getattr(request.app.state, "async_engine", None)
+    if engine is None:
+        raise HTTPException(status_code=503, detail="Async DB path is disabled (set DB_ASYNC=true)")
+    return engine
+
+
+def get_db(request: Request):
+    """Dependency: one pooled connection per request, returned to the pool afterwards."""
+    engine = request.app.state.engine
+    t0 = time.perf_counter()
+    conn = engine.connect()
+    wait = time.perf_counter() - t0
+    request.app.state.pool_metrics.record_checkout(wait)
+    add_stage_time("connect", wait)
+    try:
+        yield conn
+    finally:
+        conn.close()
@@ -0,0 +1,106 @@
+import io
+
+from sqlalchemy import text
+
+from app.ingest.dq_stats import dq_stats_add_sql
+from app.ingest.rollup import rollup_add_sql
+
+# Columns written to the staging table, in COPY order
+FACT_COLUMNS = [
+    "sale_time",
+    "product_id",
+    "seller_id",
+    "shipping_company_id",
+    "unit_price",
+    "units",
+    "line_total",
+    "source_file",
+    "source_row_number",
+]
+
+STAGING_TABLE = "stg_fact_sales_line"
+
+SQL_CREATE_STAGING = f"""
+CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+  sale_time           TIMESTAMPTZ NOT NULL,
+  product_id          BIGINT NOT NULL,
+  seller_id           BIGINT NOT NULL,
+  shipping_company_id BIGINT NULL,
+  unit_price          NUMERIC(12,2) NOT NULL,
+  units               NUMERIC(12,2) NOT NULL,
+  line_total          NUMERIC(12,2) NOT NULL,
+  source_file         TEXT NOT NULL,
+  source_row_number   INTEGER NOT NULL
+) ON COMMIT DROP;
+"""
+
+SQL_COPY_STAGING = f"""
+COPY {STAGING_TABLE} ({", ".join(FACT_COLUMNS)})
+FROM STDIN WITH (FORMAT csv, NULL '')
+"""
+
+# One set-based insert. New (source_file, source_row_number) keys go into
+# fact_source_key first (uq_fact_source keeps re-imports idempotent across
+# partitions); only rows whose key was new reach the fact table.
+# The rows actually inserted are added to agg_daily_sales and agg_daily_dq in
+# the same statement.
+SQL_MERGE_STAGING = f"""
+WITH new_keys AS (
+  INSERT INTO salesops.fact_source_key (source_file, source_row_number, sale_date)
+  SELECT source_file, source_row_number, (sale_time AT TIME ZONE 'UTC')::date
+  FROM {STAGING_TABLE}
+  ORDER BY source_file, source_row_number
+  ON CONFLICT (source_file, source_row_number) DO NOTHING
+  RETURNING source_file, source_row_number
+),
+ins AS (
+  INSERT INTO salesops.fact_sales_line ({", ".join(FACT_COLUMNS)}, sale_date)
+  SELECT {", ".join("s." + c for c in FACT_COLUMNS)}, (s.sale_time AT TIME ZONE 'UTC')::date
+  FROM {STAGING_TABLE} s
+  JOIN new_keys k USING (source_file, source_row_number)
+  RETURNING sale_date, seller_id, product_id, shipping_company_id, unit_price, line_total, units
+),
+agg_add AS (
+{rollup_add_sql("ins")}
+),
+dq_add AS (
+{dq_stats_add_sql("ins")}
+)
+SELECT sale_date, COUNT(*) AS inserted FROM ins GROUP BY sale_date;
+"""
+
+DEFAULT_COPY_CHUNK_ROWS = 50_000
+
+
+def copy_fact_rows(conn, staged, chunk_rows: int = DEFAULT_COPY_CHUNK_ROWS):
+    """
+    COPY a frame of resolved fact rows (columns = FACT_COLUMNS) into a temp
+    staging table, then merge it into salesops.fact_sales_line (and the
+    agg_daily_sales / agg_daily_dq rollups) in one statement.
+
+    Must run inside an open transaction (the staging table is ON COMMIT DROP),
+    after ensure_fact_partitions() has created the months being inserted.
+    Returns (inserted, skipped_duplicate, sale_dates_touched).
+    """
+    conn.execute(text(SQL_CREATE_STAGING))
+    conn.execute(text(f"TRUNCATE {STAGING_TABLE}"))
+
+    staged = staged[FACT_COLUMNS].copy()
+    staged["shipping_company_id"] = staged["shipping_company_id"].astype("Int64")
+    staged["product_id"] = staged["product_id"].astype("int64")
+    staged["seller_id"] = staged["seller_id"].astype("int64")
+    # Already rounded half away from zero by prepare_sales_frame()
+    for col in ("unit_price", "units", "line_total"):
+        staged[col] = staged[col].astype(float)
+
+    # Stream in fixed-size chunks so the CSV buffer never holds the whole file
+    with conn.connection.cursor() as cur:
+        for start in range(0, len(staged), chunk_rows):
+            buf = io.StringIO()
+            staged.iloc[start:start + chunk_rows].to_csv(buf, index=False, header=False, na_rep="")
+            buf.seek(0)
+            cur.copy_expert(SQL_COPY_STAGING, buf)
+
+    per_day = conn.execute(text(SQL_MERGE_STAGING)).fetchall()
+    inserted = sum(int(r.inserted) for r in per_day)
+    return inserted, len(staged) - inserted, {r.sale_date for r in per_day}
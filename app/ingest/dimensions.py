@@ -0,0 +1,80 @@
+from sqlalchemy import text
+
+# dimension -> (table, natural key column, surrogate key column)
+DIMENSIONS = {
+    "product": ("salesops.dim_product", "product_code", "product_id"),
+    "seller": ("salesops.dim_seller", "seller_name", "seller_id"),
+    "shipping": ("salesops.dim_shipping_company", "company_name", "shipping_company_id"),
+}
+
+
+class DimensionResolver:
+    """
+    In-memory natural key -> surrogate key maps for the dimension tables.
+
+    Unseen names are collected per batch and created with one multi-row
+    INSERT ... ON CONFLICT DO NOTHING RETURNING. Names another importer
+    inserted concurrently come back as conflicts (no RETURNING row), so they
+    are re-read in the same round. Names are inserted in sorted order so two
+    importers touching the same new keys lock them in the same order.
+
+    Ids created inside a transaction that later rolls back are invalid; call
+    reset() after a rollback before reusing the resolver.
+    """
+
+    def __init__(self):
+        self._maps = {dim: {} for dim in DIMENSIONS}
+        self._stats = {dim: {"hits": 0, "misses": 0, "created": 0} for dim in DIMENSIONS}
+
+    def preload(self, conn):
+        for dim, (table, name_col, id_col) in DIMENSIONS.items():
+            rows = conn.execute(text(f"SELECT {name_col}, {id_col} FROM {table}")).fetchall()
+            self._maps[dim].update({r[0]: int(r[1]) for r in rows})
+        return self
+
+    def reset(self):
+        for m in self._maps.values():
+            m.clear()
+
+    def resolve(self, conn, dim: str, names) -> dict:
+        """Return {name: id} for every non-null name, creating missing keys in one batch."""
+        table, name_col, id_col = DIMENSIONS[dim]
+        cache = self._maps[dim]
+        stats = self._stats[dim]
+
+        wanted = {n for n in names if n is not None and n == n}  # drop None/NaN
+        missing = sorted(n for n in wanted if n not in cache)
+        stats["hits"] += len(wanted) - len(missing)
+        stats["misses"] += len(missing)
+
+        if missing:
+            created = conn.execute(
+                text(
+                    f"""
+                    INSERT INTO {table} ({name_col})
+                    SELECT unnest(CAST(:names AS text[]))
+                    ON CONFLICT ({name_col}) DO NOTHING
+                    RETURNING {name_col}, {id_col}
+                    """
+                ),
+                {"names": missing},
+            ).fetchall()
+            cache.update({r[0]: int(r[1]) for r in created})
+            stats["created"] += len(created)
+
+            # Created by a concurrent importer (or already present but not preloaded)
+            leftover = [n for n in missing if n not in cache]
+            if leftover:
+                rows = conn.execute(
+                    text(f"SELECT {name_col}, {id_col} FROM {table} WHERE {name_col} = ANY(:names)"),
+                    {"names": leftover},
+                ).fetchall()
+                cache.update({r[0]: int(r[1]) for r in rows})
+
+        return {n: cache[n] for n in wanted}
+
+    def stats(self) -> dict:
+        return {
+            dim: {**s, "cached": len(self._maps[dim])}
+            for dim, s in self._stats.items()
+        }
@@ -0,0 +1,102 @@
+from sqlalchemy import text
+
+# Tolerance the stored mismatched_total_count is computed with; must match the
+# /reports/data-quality default and the initial fill in sql/01_create_tables.sql
+DQ_STATS_TOL = 0.05
+
+DQ_COUNTS = [
+    "line_count",
+    "mismatched_total_count",
+    "nonpositive_units_count",
+    "negative_amount_count",
+    "missing_shipping_company_count",
+]
+
+# Per-day counts, mirroring SQL_DATA_QUALITY_SUMMARY in app/queries/dq_queries.py
+DQ_COUNT_SELECT = f"""
+  sale_date,
+  COUNT(*) AS line_count,
+  COUNT(*) FILTER (WHERE ABS(line_total - ROUND((unit_price * units)::numeric, 2)) > {DQ_STATS_TOL})
+    AS mismatched_total_count,
+  COUNT(*) FILTER (WHERE units <= 0) AS nonpositive_units_count,
+  COUNT(*) FILTER (WHERE unit_price < 0 OR line_total < 0) AS negative_amount_count,
+  COUNT(*) FILTER (WHERE shipping_company_id IS NULL) AS missing_shipping_company_count"""
+
+# Adds freshly inserted fact rows (a CTE/table named by {source}) to the daily
+# counts. Days are upserted in order so concurrent importers touching overlapping
+# days lock agg_daily_dq rows in the same order and wait instead of deadlocking.
+SQL_DQ_STATS_ADD_TEMPLATE = f"""
+INSERT INTO salesops.agg_daily_dq AS d (sale_date, {", ".join(DQ_COUNTS)})
+SELECT {DQ_COUNT_SELECT}
+FROM {{source}}
+GROUP BY sale_date
+ORDER BY sale_date
+ON CONFLICT (sale_date) DO UPDATE
+SET {", ".join(f"{c} = d.{c} + EXCLUDED.{c}" for c in DQ_COUNTS)}
+"""
+
+# Single-line version for the row-by-row insert path
+SQL_DQ_STATS_ADD_LINE = SQL_DQ_STATS_ADD_TEMPLATE.format(source="""(
+  SELECT CAST(:sale_date AS date) AS sale_date,
+         CAST(:unit_price AS numeric) AS unit_price,
+         CAST(:units AS numeric) AS units,
+         CAST(:line_total AS numeric) AS line_total,
+         CAST(:shipping_company_id AS bigint) AS shipping_company_id
+) line""") + ";"
+
+# Every day in the range whose stored counts differ from the raw facts
+SQL_DQ_STATS_DIFF = f"""
+WITH raw AS (
+  SELECT {DQ_COUNT_SELECT}
+  FROM salesops.fact_sales_line
+  WHERE sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
+  GROUP BY sale_date
+),
+stored AS (
+  SELECT sale_date, {", ".join(DQ_COUNTS)}
+  FROM salesops.agg_daily_dq
+  WHERE sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
+)
+SELECT
+  COALESCE(r.sale_date, s.sale_date) AS sale_date,
+  {", ".join(f"r.{c} AS raw_{c}, s.{c} AS stored_{c}" for c in DQ_COUNTS)}
+FROM raw r
+FULL OUTER JOIN stored s ON s.sale_date = r.sale_date
+WHERE {" OR ".join(f"r.{c} IS DISTINCT FROM s.{c}" for c in DQ_COUNTS)}
+ORDER BY 1;
+"""
+
+SQL_DQ_STATS_DELETE_RANGE = """
+DELETE FROM salesops.agg_daily_dq
+WHERE sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date);
+"""
+
+SQL_DQ_STATS_INSERT_RANGE = f"""
+INSERT INTO salesops.agg_daily_dq (sale_date, {", ".join(DQ_COUNTS)})
+SELECT {DQ_COUNT_SELECT}
+FROM salesops.fact_sales_line
+WHERE sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
+GROUP BY sale_date;
+"""
+
+
+def dq_stats_add_sql(source: str) -> str:
+    return SQL_DQ_STATS_ADD_TEMPLATE.format(source=source)
+
+
+def check_dq_stats(conn, start_date, end_date) -> list:
+    """Days where agg_daily_dq disagrees with fact_sales_line (empty list = consistent)."""
+    return conn.execute(
+        text(SQL_DQ_STATS_DIFF), {"start_date": start_date, "end_date": end_date}
+    ).mappings().all()
+
+
+def recompute_dq_stats(conn, start_date, end_date) -> int:
+    """
+    Recompute the daily DQ counts for a date range from the raw facts, under
+    the same EXCLUSIVE lock rebuild_rollup() uses so importers wait.
+    """
+    params = {"start_date": start_date, "end_date": end_date}
+    conn.execute(text("LOCK TABLE salesops.agg_daily_dq IN EXCLUSIVE MODE"))
+    conn.execute(text(SQL_DQ_STATS_DELETE_RANGE), params)
+    return conn.execute(text(SQL_DQ_STATS_INSERT_RANGE), params).rowcount
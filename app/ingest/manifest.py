@@ -0,0 +1,119 @@
+import hashlib
+from pathlib import Path
+
+from sqlalchemy import text
+
+SQL_IS_LOADED = """
+SELECT source_file, finished_at
+FROM salesops.ingest_manifest
+WHERE content_hash = :content_hash
+  AND status = 'loaded'
+ORDER BY finished_at DESC
+LIMIT 1;
+"""
+
+SQL_MARK_RUNNING = """
+INSERT INTO salesops.ingest_manifest (source_file, content_hash, status)
+VALUES (:source_file, :content_hash, 'running')
+ON CONFLICT (source_file, content_hash) DO UPDATE
+SET status = 'running',
+    -- keep the checkpoint of an interrupted/failed run; a forced re-import starts over
+    last_committed_row = CASE
+      WHEN salesops.ingest_manifest.status = 'loaded' THEN NULL
+      ELSE salesops.ingest_manifest.last_committed_row
+    END,
+    row_count = NULL,
+    inserted_count = NULL,
+    skipped_count = NULL,
+    duration_ms = NULL,
+    error_message = NULL,
+    started_at = now(),
+    finished_at = NULL
+RETURNING last_committed_row;
+"""
+
+SQL_SAVE_CHECKPOINT = """
+UPDATE salesops.ingest_manifest
+SET last_committed_row = :last_row
+WHERE source_file = :source_file AND content_hash = :content_hash;
+"""
+
+SQL_MARK_LOADED = """
+UPDATE salesops.ingest_manifest
+SET status = 'loaded',
+    row_count = :row_count,
+    inserted_count = :inserted_count,
+    skipped_count = :skipped_count,
+    duration_ms = :duration_ms,
+    finished_at = now()
+WHERE source_file = :source_file AND content_hash = :content_hash;
+"""
+
+SQL_MARK_FAILED = """
+UPDATE salesops.ingest_manifest
+SET status = 'failed',
+    duration_ms = :duration_ms,
+    error_message = :error_message,
+    finished_at = now()
+WHERE source_file = :source_file AND content_hash = :content_hash;
+"""
+
+
+def file_sha256(path: Path, block_size: int = 1 << 20) -> str:
+    """Content hash, read in 1 MiB blocks (the file is never parsed)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def find_loaded(engine, content_hash: str):
+    """Return the manifest row of an earlier successful load of this content, if any."""
+    with engine.connect() as conn:
+        return conn.execute(text(SQL_IS_LOADED), {"content_hash": content_hash}).mappings().first()
+
+
+def mark_running(engine, source_file: str, content_hash: str) -> int:
+    """Record the attempt and return the row to resume after (0 = start from the top)."""
+    with engine.begin() as conn:
+        row = conn.execute(
+            text(SQL_MARK_RUNNING), {"source_file": source_file, "content_hash": content_hash}
+        ).first()
+    return int(row.last_committed_row or 0) if row else 0
+
+
+def save_checkpoint(conn, source_file: str, content_hash: str, last_row: int):
+    """Called inside each batch transaction, so the checkpoint commits with the rows."""
+    conn.execute(
+        text(SQL_SAVE_CHECKPOINT),
+        {"source_file": source_file, "content_hash": content_hash, "last_row": last_row},
+    )
+
+
+def mark_loaded(engine, source_file: str, content_hash: str, row_count: int, inserted: int, skipped: int, seconds: float):
+    with engine.begin() as conn:
+        conn.execute(
+            text(SQL_MARK_LOADED),
+            {
+                "source_file": source_file,
+                "content_hash": content_hash,
+                "row_count": row_count,
+                "inserted_count": inserted,
+                "skipped_count": skipped,
+                "duration_ms": int(seconds * 1000),
+            },
+        )
+
+
+def mark_failed(engine, source_file: str, content_hash: str, error: str, seconds: float):
+    with engine.begin() as conn:
+        conn.execute(
+            text(SQL_MARK_FAILED),
+            {
+                "source_file": source_file,
+                "content_hash": content_hash,
+                "error_message": error[:2000],
+                "duration_ms": int(seconds * 1000),
+            },
+        )
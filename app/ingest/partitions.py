@@ -0,0 +1,126 @@
+import gzip
+import re
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import text
+
+from app.ingest.dq_stats import SQL_DQ_STATS_DELETE_RANGE
+from app.ingest.rollup import SQL_ROLLUP_DELETE_RANGE
+
+PARENT_TABLE = "salesops.fact_sales_line"
+PARTITION_NAME_RE = re.compile(r"^fact_sales_line_p(\d{4})_(\d{2})$")
+
+# UTC month of every timestamp -> ensure_fact_partition() (see sql/01_create_tables.sql)
+SQL_ENSURE_PARTITIONS = """
+SELECT salesops.ensure_fact_partition(m) AS partition_name
+FROM (
+  SELECT DISTINCT date_trunc('month', t AT TIME ZONE 'UTC')::date AS m
+  FROM unnest(CAST(:times AS timestamptz[])) AS t
+) months
+ORDER BY m;
+"""
+
+SQL_LIST_PARTITIONS = """
+SELECT
+  c.relname                           AS partition_name,
+  pg_get_expr(c.relpartbound, c.oid)  AS bounds,
+  c.reltuples::bigint                 AS approx_rows,
+  pg_total_relation_size(c.oid)       AS total_bytes
+FROM pg_inherits i
+JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = 'salesops.fact_sales_line'::regclass
+ORDER BY c.relname;
+"""
+
+
+def partition_month(partition_name: str):
+    """First day of the month a fact_sales_line_pYYYY_MM partition holds (None for other names)."""
+    m = PARTITION_NAME_RE.match(partition_name)
+    return date(int(m.group(1)), int(m.group(2)), 1) if m else None
+
+
+def month_bounds(month: date) -> tuple:
+    """(first, last) day of the month starting at month."""
+    next_month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+    return month, next_month - timedelta(days=1)
+
+
+def _checked_name(partition_name: str) -> str:
+    # Names are interpolated into DDL, so only accept the ones ensure_fact_partition() creates
+    if partition_month(partition_name) is None:
+        raise ValueError(f"Not a fact_sales_line partition name: {partition_name!r}")
+    return partition_name
+
+
+def ensure_fact_partitions(conn, times) -> list:
+    """
+    Create any missing monthly partitions for a batch of sale timestamps.
+
+    Runs its own short transaction: CREATE TABLE ... PARTITION OF locks the
+    parent until commit, so it must not ride along with the batch insert.
+    Returns the partition names covering the batch.
+    """
+    days = pd.Series(pd.to_datetime(pd.Series(times))).dropna().dt.normalize().unique()
+    if len(days) == 0:
+        return []
+    # First and last instant of each day; their UTC months cover every row of that day
+    bounds = []
+    for d in map(pd.Timestamp, days):
+        bounds.append(d.to_pydatetime())
+        bounds.append((d + pd.Timedelta(days=1) - pd.Timedelta(microseconds=1)).to_pydatetime())
+
+    with conn.begin():
+        return [r.partition_name for r in conn.execute(text(SQL_ENSURE_PARTITIONS), {"times": bounds})]
+
+
+def list_fact_partitions(conn) -> list:
+    rows = conn.execute(text(SQL_LIST_PARTITIONS)).mappings().all()
+    return [{**r, "month": partition_month(r["partition_name"])} for r in rows]
+
+
+def delete_month_stats(conn, partition_name: str) -> int:
+    """
+    Remove a partition's month from agg_daily_sales and agg_daily_dq, so
+    reports stop counting lines that left fact_sales_line. Partitions are
+    ranges of sale_date, the key of both tables. Returns the rows deleted.
+    """
+    first, last = month_bounds(partition_month(_checked_name(partition_name)))
+    params = {"start_date": first, "end_date": last}
+    return sum(conn.execute(text(sql), params).rowcount for sql in (SQL_ROLLUP_DELETE_RANGE, SQL_DQ_STATS_DELETE_RANGE))
+
+
+def detach_partition(conn, partition_name: str, concurrently: bool = False):
+    """
+    DETACH a month from fact_sales_line and delete its rollup and DQ rows
+    (delete_month_stats); the table and its rows stay as
+    salesops.<partition_name>. Pass a connection in a transaction so both
+    commit together. concurrently=True (PostgreSQL 14+) does not block
+    readers but cannot run inside a transaction block, so pass an AUTOCOMMIT
+    connection; the rollup rows are then deleted right after the detach.
+    The caller bumps the data version once this has committed.
+    """
+    name = _checked_name(partition_name)
+    mode = " CONCURRENTLY" if concurrently else ""
+    conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION salesops.{name}{mode}"))
+    delete_month_stats(conn, name)
+
+
+def archive_partition(conn, partition_name: str, out_dir: Path) -> tuple:
+    """COPY a (detached) partition to <out_dir>/<name>.csv.gz. Returns (path, rows)."""
+    name = _checked_name(partition_name)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / f"{name}.csv.gz"
+    with gzip.open(path, "wt", encoding="utf-8", newline="") as f:
+        with conn.connection.cursor() as cur:
+            cur.copy_expert(f"COPY (SELECT * FROM salesops.{name} ORDER BY line_id) TO STDOUT WITH (FORMAT csv, HEADER)", f)
+            rows = cur.rowcount
+    return path, rows
+
+
+def drop_partition(conn, partition_name: str):
+    """DROP a (usually already detached) partition and, like detach_partition(), its month's rollup and DQ rows."""
+    name = _checked_name(partition_name)
+    conn.execute(text(f"DROP TABLE salesops.{name}"))
+    delete_month_stats(conn, name)
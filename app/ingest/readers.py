@@ -0,0 +1,102 @@
+from pathlib import Path
+
+import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 50_000
+
+SUPPORTED_SUFFIXES = {".xlsx", ".xlsm", ".csv", ".parquet"}
+
+# Dimension name columns are read as text: left to inference, numeric-looking
+# codes lose leading zeros and chunks containing a blank turn "123" into "123.0"
+TEXT_DTYPES = {"Product": str, "Seller": str, "Shipping Company": str}
+
+
+def text_cell(value):
+    """A sheet cell as text; integral numbers lose the ".0" (123 and 123.0 are both "123")."""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def xlsx_frame(buf: list, columns: list) -> pd.DataFrame:
+    df = pd.DataFrame.from_records(buf, columns=columns)
+    # Built from the raw cells, not df's columns, which may already be float
+    for i, col in enumerate(columns):
+        if col in TEXT_DTYPES:
+            df[col] = pd.Series([text_cell(r[i]) for r in buf], index=df.index, dtype=object)
+    return df
+
+
+def iter_xlsx_chunks(path: Path, chunk_rows: int):
+    # read_only mode streams rows from the sheet XML instead of building the workbook in memory
+    from openpyxl import load_workbook
+
+    wb = load_workbook(str(path), read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(c).strip() if c is not None else "" for c in header]
+
+        buf = []
+        first_row_number = 2
+        for values in rows:
+            buf.append(values)
+            if len(buf) >= chunk_rows:
+                yield xlsx_frame(buf, columns), first_row_number
+                first_row_number += len(buf)
+                buf = []
+
+        # openpyxl reports trailing blank rows; pandas.read_excel trims them
+        while buf and all(v is None for v in buf[-1]):
+            buf.pop()
+        if buf:
+            yield xlsx_frame(buf, columns), first_row_number
+    finally:
+        wb.close()
+
+
+def iter_csv_chunks(path: Path, chunk_rows: int):
+    # Keep blank lines so row numbers still line up with the file (header is line 1)
+    first_row_number = 2
+    for chunk in pd.read_csv(
+        path, chunksize=chunk_rows, skip_blank_lines=False, dtype=TEXT_DTYPES
+    ):
+        yield chunk.reset_index(drop=True), first_row_number
+        first_row_number += len(chunk)
+
+
+def iter_parquet_chunks(path: Path, chunk_rows: int):
+    import pyarrow.parquet as pq
+
+    # Same numbering convention as a sheet: first data row is 2
+    first_row_number = 2
+    pf = pq.ParquetFile(str(path))
+    for batch in pf.iter_batches(batch_size=chunk_rows):
+        chunk = batch.to_pandas()
+        yield chunk, first_row_number
+        first_row_number += len(chunk)
+
+
+def iter_sales_chunks(path, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """
+    Yield (raw_chunk, first_row_number) for an xlsx/CSV/Parquet sales file,
+    reading at most chunk_rows rows at a time. first_row_number is what
+    prepare_sales_frame() needs to keep _source_row_number correct across chunks.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be positive")
+
+    if suffix in (".xlsx", ".xlsm"):
+        return iter_xlsx_chunks(path, chunk_rows)
+    if suffix == ".csv":
+        return iter_csv_chunks(path, chunk_rows)
+    if suffix == ".parquet":
+        return iter_parquet_chunks(path, chunk_rows)
+    raise ValueError(f"Unsupported sales file type: {path.name} (expected one of {sorted(SUPPORTED_SUFFIXES)})")
@@ -0,0 +1,104 @@
+from sqlalchemy import text
+
+ROLLUP_KEY = "(sale_date, seller_id, product_id, COALESCE(shipping_company_id, 0))"
+
+# Adds freshly inserted fact rows (a CTE/table named by {source}) to the rollup.
+# Rows are upserted in key order so concurrent importers touching overlapping
+# keys lock agg_daily_sales rows in the same order and wait instead of deadlocking.
+SQL_ROLLUP_ADD_TEMPLATE = """
+INSERT INTO salesops.agg_daily_sales AS a
+  (sale_date, seller_id, product_id, shipping_company_id, revenue, units, line_count)
+SELECT sale_date, seller_id, product_id, shipping_company_id,
+       SUM(line_total), SUM(units), COUNT(*)
+FROM {source}
+GROUP BY sale_date, seller_id, product_id, shipping_company_id
+ORDER BY sale_date, seller_id, product_id, COALESCE(shipping_company_id, 0)
+ON CONFLICT """ + ROLLUP_KEY + """ DO UPDATE
+SET revenue    = a.revenue + EXCLUDED.revenue,
+    units      = a.units + EXCLUDED.units,
+    line_count = a.line_count + EXCLUDED.line_count
+"""
+
+# Single-line version for the row-by-row insert path
+SQL_ROLLUP_ADD_LINE = """
+INSERT INTO salesops.agg_daily_sales AS a
+  (sale_date, seller_id, product_id, shipping_company_id, revenue, units, line_count)
+VALUES
+  (:sale_date, :seller_id, :product_id, :shipping_company_id, :line_total, :units, 1)
+ON CONFLICT """ + ROLLUP_KEY + """ DO UPDATE
+SET revenue    = a.revenue + EXCLUDED.revenue,
+    units      = a.units + EXCLUDED.units,
+    line_count = a.line_count + 1;
+"""
+
+# Every rollup key in the range whose totals differ from the raw facts
+SQL_ROLLUP_DIFF = """
+WITH raw AS (
+  SELECT sale_date, seller_id, product_id, shipping_company_id,
+         SUM(line_total) AS revenue, SUM(units) AS units, COUNT(*) AS line_count
+  FROM salesops.fact_sales_line
+  WHERE sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
+  GROUP BY sale_date, seller_id, product_id, shipping_company_id
+),
+agg AS (
+  SELECT sale_date, seller_id, product_id, shipping_company_id, revenue, units, line_count
+  FROM salesops.agg_daily_sales
+  WHERE sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
+)
+SELECT
+  COALESCE(r.sale_date, a.sale_date)                     AS sale_date,
+  COALESCE(r.seller_id, a.seller_id)                     AS seller_id,
+  COALESCE(r.product_id, a.product_id)                   AS product_id,
+  COALESCE(r.shipping_company_id, a.shipping_company_id) AS shipping_company_id,
+  r.revenue AS raw_revenue,     a.revenue AS rollup_revenue,
+  r.units AS raw_units,         a.units AS rollup_units,
+  r.line_count AS raw_lines,    a.line_count AS rollup_lines
+FROM raw r
+FULL OUTER JOIN agg a
+  ON  a.sale_date = r.sale_date
+  AND a.seller_id = r.seller_id
+  AND a.product_id = r.product_id
+  AND a.shipping_company_id IS NOT DISTINCT FROM r.shipping_company_id
+WHERE r.revenue IS DISTINCT FROM a.revenue
+   OR r.units IS DISTINCT FROM a.units
+   OR r.line_count IS DISTINCT FROM a.line_count
+ORDER BY 1, 2, 3, 4;
+"""
+
+SQL_ROLLUP_DELETE_RANGE = """
+DELETE FROM salesops.agg_daily_sales
+WHERE sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date);
+"""
+
+SQL_ROLLUP_INSERT_RANGE = """
+INSERT INTO salesops.agg_daily_sales
+  (sale_date, seller_id, product_id, shipping_company_id, revenue, units, line_count)
+SELECT sale_date, seller_id, product_id, shipping_company_id,
+       SUM(line_total), SUM(units), COUNT(*)
+FROM salesops.fact_sales_line
+WHERE sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
+GROUP BY sale_date, seller_id, product_id, shipping_company_id;
+"""
+
+
+def rollup_add_sql(source: str) -> str:
+    return SQL_ROLLUP_ADD_TEMPLATE.format(source=source)
+
+
+def check_rollup(conn, start_date, end_date) -> list:
+    """Rows where agg_daily_sales disagrees with fact_sales_line (empty list = consistent)."""
+    return conn.execute(
+        text(SQL_ROLLUP_DIFF), {"start_date": start_date, "end_date": end_date}
+    ).mappings().all()
+
+
+def rebuild_rollup(conn, start_date, end_date) -> int:
+    """
+    Recompute the rollup for a date range from the raw facts. Takes an
+    EXCLUSIVE lock on agg_daily_sales (reads still allowed) so importers wait
+    instead of adding increments to rows being rebuilt.
+    """
+    params = {"start_date": start_date, "end_date": end_date}
+    conn.execute(text("LOCK TABLE salesops.agg_daily_sales IN EXCLUSIVE MODE"))
+    conn.execute(text(SQL_ROLLUP_DELETE_RANGE), params)
+    return conn.execute(text(SQL_ROLLUP_INSERT_RANGE), params).rowcount
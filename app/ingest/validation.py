@@ -0,0 +1,153 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+EXPECTED_COLUMNS = ["Time", "Product", "Seller", "Unit Price", "Units", "Total Price", "Shipping Company"]
+REQUIRED_COLUMNS = ["Product", "Seller", "Unit Price", "Units", "Total Price"]
+STRING_COLUMNS = ["Product", "Seller", "Shipping Company"]
+NUMERIC_COLUMNS = ["Unit Price", "Units", "Total Price"]
+
+# Same default as /reports/data-quality
+DEFAULT_TOL = 0.05
+
+# Flag name -> rule, mirroring SQL_DATA_QUALITY_SUMMARY in app/queries/dq_queries.py
+CHECKS = {
+    "mismatched_total": "abs(line_total - round(unit_price*units, 2)) > tol",
+    "nonpositive_units": "units <= 0",
+    "negative_amount": "unit_price < 0 OR line_total < 0",
+    "missing_shipping_company": "shipping_company IS NULL",
+}
+
+# Rows with these flags would violate the CHECK constraints on fact_sales_line
+REJECT_CHECKS = ["nonpositive_units", "negative_amount"]
+
+
+def round_half_away(x):
+    """Vectorized ROUND(x, 2) with PostgreSQL numeric semantics (half away from zero)."""
+    x = np.asarray(x, dtype=float)
+    return np.sign(x) * np.floor(np.abs(x) * 100 + 0.5 + 1e-9) / 100
+
+
+def norm_str_series(s: pd.Series) -> pd.Series:
+    """Vectorized norm_str: strip, and turn blanks/NaN into None."""
+    out = s.astype("string").str.strip()
+    out = out.mask(out == "")
+    return out.astype(object).where(out.notna(), None)
+
+
+def prepare_sales_frame(df: pd.DataFrame, first_row_number: int = 2) -> pd.DataFrame:
+    """
+    Column check, source row numbering, datetime parsing and string cleaning.
+    first_row_number is the sheet row of df's first line (header is row 1).
+    """
+    missing = [c for c in EXPECTED_COLUMNS if c not in df.columns]
+    if missing:
+        raise RuntimeError(f"Missing columns in Excel: {missing}. Found: {list(df.columns)}")
+
+    # Keep original excel row number (best effort: header is row 1; data starts row 2)
+    df["_source_row_number"] = np.arange(first_row_number, first_row_number + len(df))
+
+    # Parse datetime
+    df["Time"] = pd.to_datetime(df["Time"], errors="coerce")
+    if df["Time"].isna().any():
+        bad = df[df["Time"].isna()][["_source_row_number", "Time", "Product", "Seller"]].head(20)
+        raise RuntimeError(f"Found unparsable Time values (showing up to 20):\n{bad}")
+
+    # Clean strings
+    for col in STRING_COLUMNS:
+        df[col] = norm_str_series(df[col])
+
+    # Drop rows missing required fields
+    df = df.dropna(subset=REQUIRED_COLUMNS).copy()
+
+    # Rounded once here to what NUMERIC(12,2) stores; validation and both
+    # insert paths use these values as they are
+    for col in NUMERIC_COLUMNS:
+        df[col] = round_half_away(pd.to_numeric(df[col]))
+
+    return df
+
+
+def validate_sales_frame(df: pd.DataFrame, tol: float = DEFAULT_TOL) -> pd.DataFrame:
+    """One boolean column per CHECKS entry, computed for every row at once."""
+    # Already rounded by prepare_sales_frame(), i.e. the values that get inserted
+    unit_price = df["Unit Price"].to_numpy(dtype=float)
+    units = df["Units"].to_numpy(dtype=float)
+    line_total = df["Total Price"].to_numpy(dtype=float)
+    expected_total = round_half_away(unit_price * units)
+
+    flags = pd.DataFrame(
+        {
+            "mismatched_total": np.abs(line_total - expected_total) > tol + 1e-9,
+            "nonpositive_units": units <= 0,
+            "negative_amount": (unit_price < 0) | (line_total < 0),
+            "missing_shipping_company": df["Shipping Company"].isna().to_numpy(),
+        },
+        index=df.index,
+    )
+    flags.insert(0, "_source_row_number", df["_source_row_number"].to_numpy())
+    return flags
+
+
+def summarize_flags(flags: pd.DataFrame) -> dict:
+    counts = {f"{name}_count": int(flags[name].sum()) for name in CHECKS}
+    return {
+        "rows_checked": int(len(flags)),
+        **counts,
+        "rejected_count": int(flags[REJECT_CHECKS].any(axis=1).sum()),
+    }
+
+
+def merge_summaries(summaries) -> dict:
+    """Add up summarize_flags() results from several chunks of the same file."""
+    merged = {"rows_checked": 0, **{f"{name}_count": 0 for name in CHECKS}, "rejected_count": 0}
+    for s in summaries:
+        for k in merged:
+            merged[k] += s[k]
+    return merged
+
+
+def offending_rows(flags: pd.DataFrame) -> pd.DataFrame:
+    return flags[flags[list(CHECKS)].any(axis=1)]
+
+
+def rejected_mask(flags: pd.DataFrame) -> pd.Series:
+    return flags[REJECT_CHECKS].any(axis=1)
+
+
+def write_validation_report(
+    flags: pd.DataFrame,
+    source_file: str,
+    out_dir: Path,
+    tol: float = DEFAULT_TOL,
+    fmt: str = "csv",
+    summary: dict = None,
+) -> Path:
+    """
+    Write <source_file>.validation.json (counts + rules) and a CSV/Parquet
+    sidecar listing every offending _source_row_number with its flags.
+    Returns the path of the JSON summary.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    offending = offending_rows(flags)
+    sidecar = out_dir / f"{source_file}.validation.{fmt}"
+    if fmt == "parquet":
+        offending.to_parquet(sidecar, index=False)
+    else:
+        offending.to_csv(sidecar, index=False)
+
+    report = {
+        "source_file": source_file,
+        "tol": tol,
+        "rules": CHECKS,
+        "rejected_rules": REJECT_CHECKS,
+        **(summary if summary is not None else summarize_flags(flags)),
+        "offending_rows_file": sidecar.name,
+    }
+    summary_path = out_dir / f"{source_file}.validation.json"
+    summary_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return summary_path
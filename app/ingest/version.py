@@ -0,0 +1,21 @@
+from sqlalchemy import text
+
+SQL_GET_DATA_VERSION = """
+SELECT CASE WHEN is_called THEN last_value ELSE 0 END AS version
+FROM salesops.data_version_seq;
+"""
+
+SQL_BUMP_DATA_VERSION = "SELECT nextval('salesops.data_version_seq');"
+
+
+def get_data_version(conn) -> int:
+    return int(conn.execute(text(SQL_GET_DATA_VERSION)).scalar_one())
+
+
+def bump_data_version(engine) -> int:
+    """
+    Call after the data change has committed. nextval() is not transactional
+    and takes no row lock, so parallel importers never queue on it.
+    """
+    with engine.begin() as conn:
+        return int(conn.execute(text(SQL_BUMP_DATA_VERSION)).scalar_one())
@@ -0,0 +1,82 @@
+import time
+from datetime import timedelta
+
+from sqlalchemy import text
+
+from app.ingest.version import bump_data_version
+
+# Day and week totals behind the trend endpoints. Plain tables, so a refresh can
+# rewrite just the weeks an import touched instead of re-aggregating all of
+# agg_daily_sales.
+TREND_TABLES = ["salesops.agg_daily_totals", "salesops.agg_weekly_totals"]
+
+# {weeks} is either every week or the Mondays bound as :weeks
+WEEKS_ALL = "SELECT DISTINCT date_trunc('week', sale_date::timestamp)::date FROM salesops.agg_daily_sales"
+WEEKS_BOUND = "SELECT unnest(CAST(:weeks AS date[]))"
+
+SQL_TREND_DELETE = {
+    "salesops.agg_daily_totals": """
+DELETE FROM salesops.agg_daily_totals
+WHERE date_trunc('week', sale_date::timestamp)::date IN ({weeks});
+""",
+    "salesops.agg_weekly_totals": """
+DELETE FROM salesops.agg_weekly_totals
+WHERE week_start_monday IN ({weeks});
+""",
+}
+
+# Range joins keep the agg_daily_sales read on its sale_date index
+SQL_TREND_INSERT = {
+    "salesops.agg_daily_totals": """
+INSERT INTO salesops.agg_daily_totals (sale_date, revenue, units, line_count)
+SELECT a.sale_date, ROUND(SUM(a.revenue), 2), SUM(a.units), SUM(a.line_count)::bigint
+FROM ({weeks}) w(week_start)
+JOIN salesops.agg_daily_sales a
+  ON a.sale_date >= w.week_start AND a.sale_date < w.week_start + 7
+GROUP BY a.sale_date;
+""",
+    "salesops.agg_weekly_totals": """
+INSERT INTO salesops.agg_weekly_totals (week_start_monday, revenue, units, line_count)
+SELECT w.week_start, ROUND(SUM(a.revenue), 2), SUM(a.units), SUM(a.line_count)::bigint
+FROM ({weeks}) w(week_start)
+JOIN salesops.agg_daily_sales a
+  ON a.sale_date >= w.week_start AND a.sale_date < w.week_start + 7
+GROUP BY w.week_start;
+""",
+}
+
+
+def affected_weeks(dates) -> list:
+    """Monday of every week containing one of the given sale_dates."""
+    return sorted({d - timedelta(days=d.weekday()) for d in dates})
+
+
+def refresh_sales_views(engine, weeks=None) -> dict:
+    """
+    Recompute agg_daily_totals / agg_weekly_totals for the given weeks (Mondays,
+    see affected_weeks()) from agg_daily_sales; weeks=None rewrites every week.
+    Runs in one transaction under an EXCLUSIVE lock, so readers keep the old
+    totals until it commits and concurrent refreshes queue instead of
+    overwriting each other with older reads. Returns {table: seconds}.
+    """
+    if weeks is not None and not weeks:
+        return {}
+    if weeks is None:
+        weeks_sql, params = WEEKS_ALL, {}
+    else:
+        weeks_sql, params = WEEKS_BOUND, {"weeks": list(weeks)}
+
+    timings = {}
+    with engine.begin() as conn:
+        conn.execute(text(f"LOCK TABLE {', '.join(TREND_TABLES)} IN EXCLUSIVE MODE"))
+        for table in TREND_TABLES:
+            t0 = time.perf_counter()
+            if weeks is None:
+                conn.execute(text(f"DELETE FROM {table}"))
+            else:
+                conn.execute(text(SQL_TREND_DELETE[table].format(weeks=weeks_sql)), params)
+            conn.execute(text(SQL_TREND_INSERT[table].format(weeks=weeks_sql)), params)
+            timings[table] = time.perf_counter() - t0
+    # Cached trend responses were built from the old totals
+    bump_data_version(engine)
+    return timings
@@ -1,13 +1,91 @@
+import time
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from app.routers import reports
+from app.cache import ReportCache, not_modified
+from app.db import PoolMetrics, _env_int, async_enabled, get_async_engine, get_engine, pool_status
+from app.metrics import REQUEST_STAGES, AppMetrics, render_gauges, set_app_metrics
+from app.routers import reports, reports_async
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 进程内唯一的连接池，所有请求共享
+    app.state.engine = get_engine()
+    app.state.pool_metrics = PoolMetrics()
+    app.state.report_cache = ReportCache.from_env()
+    app.state.metrics = AppMetrics.from_env()
+    set_app_metrics(app.state.metrics)
+    app.state.async_engine = get_async_engine() if async_enabled() else None
+    try:
+        yield
+    finally:
+        app.state.engine.dispose()
+        if app.state.async_engine is not None:
+            await app.state.async_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# JSON report bodies compress ~10x; tiny responses are not worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=_env_int("GZIP_MIN_SIZE", 1024))
+
+# Report routes that are not served through the report cache
+UNCACHED_REPORT_PATHS = {"/reports/export"}
+
 
-app = FastAPI()
+@app.middleware("http")
+async def report_revalidation(request: Request, call_next):
+    """
+    Answer a conditional GET /reports/* with 304 before the route runs (and
+    before a pooled connection is checked out), as long as the data version
+    was confirmed within REPORT_CACHE_VERSION_TTL. Otherwise the route
+    re-reads the version and does the same check itself. /reports/export
+    streams without an ETag, so it never gets a 304.
+    """
+    path = request.url.path
+    if (
+        request.method == "GET"
+        and path.startswith("/reports/")
+        and path not in UNCACHED_REPORT_PATHS
+        and "if-none-match" in request.headers
+    ):
+        version = request.app.state.report_cache.known_version()
+        if version is not None:
+            response = not_modified(request, version)
+            if response is not None:
+                return response
+    return await call_next(request)
+
+
+@app.middleware("http")
+async def request_metrics(request: Request, call_next):
+    """Latency per route template and per stage (connect / sql / convert / encode), for /metrics."""
+    stages = {}
+    token = REQUEST_STAGES.set(stages)
+    t0 = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - t0
+        REQUEST_STAGES.reset(token)
+        # Route template, not the raw path, so label cardinality stays bounded
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        metrics = request.app.state.metrics
+        metrics.requests.observe((route, request.method, str(status)), elapsed)
+        for stage, seconds in stages.items():
+            metrics.stages.observe((route, stage), seconds)
 
 app.include_router(reports.router)
+app.include_router(reports_async.router)
 
 # 静态资源
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
@@ -20,3 +98,31 @@ templates = Jinja2Templates(directory="app/templates")
 def dashboard(request: Request):
     return templates.TemplateResponse("dashboard.html", {"request": request})
 
+
+@app.get("/health/db-pool")
+def db_pool(request: Request):
+    status = {
+        **pool_status(request.app.state.engine),
+        **request.app.state.pool_metrics.snapshot(),
+    }
+    if request.app.state.async_engine is not None:
+        status["async_pool"] = pool_status(request.app.state.async_engine.sync_engine)
+    return status
+
+
+@app.get("/health/report-cache")
+def report_cache(request: Request):
+    return request.app.state.report_cache.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics(request: Request):
+    """Prometheus text exposition: request/stage/SQL histograms plus pool and report-cache gauges."""
+    state = request.app.state
+    return PlainTextResponse(
+        state.metrics.render()
+        + render_gauges("salesops_db_pool", pool_status(state.engine), "Sync connection pool")
+        + render_gauges("salesops_db_checkout", state.pool_metrics.snapshot(), "Pool checkout wait")
+        + render_gauges("salesops_report_cache", state.report_cache.stats(), "Report response cache"),
+        media_type="text/plain; version=0.0.4",
+    )
@@ -0,0 +1,225 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from app.queries import dq_queries, report_queries
+
+# Upper bounds (seconds) for request / stage / SQL latency histograms
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Upper bounds for rows returned per query
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10_000, 100_000)
+
+slow_query_log = logging.getLogger("salesops.slow_query")
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram keyed by a label tuple (thread-safe)."""
+
+    def __init__(self, name: str, help_text: str, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, labels: tuple, value: float):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            series["sum"] += value
+            series["count"] += 1
+            for i, upper in enumerate(self.buckets):
+                if value <= upper:
+                    series["counts"][i] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, series in sorted(self._series.items()):
+                base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.label_names, labels))
+                sep = "," if base else ""
+                label_set = f"{{{base}}}" if base else ""
+                for upper, count in zip(self.buckets, series["counts"]):
+                    lines.append(f'{self.name}_bucket{{{base}{sep}le="{upper}"}} {count}')
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="+Inf"}} {series["count"]}')
+                lines.append(f"{self.name}_sum{label_set} {series['sum']:.6f}")
+                lines.append(f"{self.name}_count{label_set} {series['count']}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class AppMetrics:
+    """Every histogram the API exports on /metrics (one instance per process, on app.state)."""
+
+    def __init__(self, slow_query_ms: int = 500):
+        self.slow_query_ms = slow_query_ms
+        self.requests = Histogram(
+            "salesops_http_request_duration_seconds",
+            "End-to-end request latency",
+            ("route", "method", "status"),
+            LATENCY_BUCKETS,
+        )
+        self.stages = Histogram(
+            "salesops_request_stage_seconds",
+            "Time per request stage: connect (pool checkout), sql, convert (rows to payload), encode (JSON)",
+            ("route", "stage"),
+            LATENCY_BUCKETS,
+        )
+        self.queries = Histogram(
+            "salesops_sql_duration_seconds",
+            "Execute + fetch time per named SQL constant",
+            ("query",),
+            LATENCY_BUCKETS,
+        )
+        self.query_rows = Histogram(
+            "salesops_sql_rows",
+            "Rows returned per named SQL constant",
+            ("query",),
+            ROW_BUCKETS,
+        )
+
+    @classmethod
+    def from_env(cls):
+        return cls(slow_query_ms=int(os.environ.get("SLOW_QUERY_MS") or 500))
+
+    def render(self) -> str:
+        lines = []
+        for h in (self.requests, self.stages, self.queries, self.query_rows):
+            lines.extend(h.render())
+        return "\n".join(lines) + "\n"
+
+
+def render_gauges(prefix: str, values: dict, help_text: str) -> str:
+    """Numeric entries of a status dict (pool_status, ReportCache.stats) as Prometheus gauges."""
+    lines = []
+    for key, value in values.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = f"{prefix}_{key}"
+        lines.extend([f"# HELP {name} {help_text}: {key}", f"# TYPE {name} gauge", f"{name} {value}"])
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+# =========================
+# Per-request stage timings
+# =========================
+
+# Set by the metrics middleware to a fresh {stage: seconds} dict per request.
+# Dependencies and handlers run in worker threads with a copy of the context,
+# which still points at the same dict.
+REQUEST_STAGES: ContextVar = ContextVar("request_stages", default=None)
+
+
+def add_stage_time(stage: str, seconds: float):
+    stages = REQUEST_STAGES.get()
+    if stages is not None:
+        stages[stage] = stages.get(stage, 0.0) + seconds
+
+
+def stage_total(stage: str) -> float:
+    stages = REQUEST_STAGES.get()
+    return stages.get(stage, 0.0) if stages else 0.0
+
+
+# =========================
+# Named query execution
+# =========================
+
+def _named_queries() -> dict:
+    names = {}
+    for module in (report_queries, dq_queries):
+        for attr, value in vars(module).items():
+            if attr.startswith("SQL_") and isinstance(value, str):
+                names[value] = attr
+    return names
+
+
+SQL_NAMES = _named_queries()
+
+# Set by the app lifespan so fetch_* can record without a request object
+_metrics = None
+
+
+def set_app_metrics(metrics):
+    global _metrics
+    _metrics = metrics
+
+
+def _record_query(sql: str, params: dict, seconds: float, rows: int, name: str = None):
+    add_stage_time("sql", seconds)
+    _observe_query(name or SQL_NAMES.get(sql, "unnamed"), params, seconds, rows)
+
+
+def _observe_query(name: str, params: dict, seconds: float, rows: int):
+    if _metrics is None:
+        return
+    _metrics.queries.observe((name,), seconds)
+    _metrics.query_rows.observe((name,), rows)
+    if _metrics.slow_query_ms > 0 and seconds * 1000 >= _metrics.slow_query_ms:
+        slow_query_log.warning(json.dumps({
+            "event": "slow_query",
+            "query": name,
+            "ms": round(seconds * 1000, 1),
+            "rows": rows,
+            "params": params,
+        }, default=str))
+
+
+def fetch_all(conn, sql: str, params: dict, name: str = None) -> list:
+    """
+    conn.execute(text(sql), params).mappings().all(), timed under the SQL_*
+    constant's name (or name, for SQL built at request time).
+    """
+    t0 = time.perf_counter()
+    rows = conn.execute(text(sql), params).mappings().all()
+    _record_query(sql, params, time.perf_counter() - t0, len(rows), name)
+    return rows
+
+
+async def fetch_all_async(engine, sql: str, params: dict, name: str = None) -> list:
+    """
+    fetch_all() on an AsyncEngine. Each call checks out its own pooled
+    connection, so independent queries of one request can run concurrently
+    with asyncio.gather().
+    """
+    # asyncpg binds typed parameters: CAST(:tol AS numeric) needs a Decimal, not a float
+    bound = {k: Decimal(str(v)) if isinstance(v, float) else v for k, v in params.items()}
+    t0 = time.perf_counter()
+    async with engine.connect() as conn:
+        t1 = time.perf_counter()
+        add_stage_time("connect", t1 - t0)
+        result = await conn.execute(text(sql), bound)
+        rows = result.mappings().all()
+    _record_query(sql, params, time.perf_counter() - t1, len(rows), name)
+    return rows
+
+
+def record_streamed_query(route: str, sql: str, params: dict, stages: dict, rows: int):
+    """
+    For a body streamed after the metrics middleware has already observed the
+    request: the query goes to the SQL histograms and slow-query log like
+    fetch_all(), and stages ({stage: seconds}) to route's stage histogram.
+    """
+    _observe_query(SQL_NAMES.get(sql, "unnamed"), params, stages.get("sql", 0.0), rows)
+    if _metrics is None:
+        return
+    for stage, seconds in stages.items():
+        _metrics.stages.observe((route, stage), seconds)
+
+
+def fetch_first(conn, sql: str, params: dict):
+    t0 = time.perf_counter()
+    row = conn.execute(text(sql), params).mappings().first()
+    _record_query(sql, params, time.perf_counter() - t0, 0 if row is None else 1)
+    return row
@@ -0,0 +1,223 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import ROUND_FLOOR, Decimal
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.offline.snapshot import read_state
+
+# Offline versions of the report queries in app/queries, computed from a
+# Parquet snapshot (app.offline.snapshot) instead of the database.
+#
+# Results match the SQL row for row: money columns are summed as int64 cents
+# and returned as Decimal with two places (what ROUND(SUM(numeric), 2) gives),
+# and line-level rounding follows numeric ROUND (half away from zero). Row
+# order among equal revenues is unspecified in the SQL; here it is by name.
+
+EPOCH_DAY = date(1970, 1, 1)
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+MONEY_COLUMNS = ["unit_price", "units", "line_total"]
+REPORT_COLUMNS = ["product_code", "seller_name", "shipping_company", "units", "line_total"]
+DQ_COLUMNS = ["line_id", "sale_time", "product_code", "seller_name", "shipping_company", *MONEY_COLUMNS]
+
+
+class OfflineSnapshot:
+    """Reads a snapshot directory through memory-mapped Parquet, pruning sale_date directories by range."""
+
+    def __init__(self, snapshot_dir):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        from pyarrow import fs
+
+        self.snapshot_dir = Path(snapshot_dir).resolve()
+        if not any(self.snapshot_dir.glob("sale_date=*/part-*.parquet")):
+            raise FileNotFoundError(f"No snapshot files under {self.snapshot_dir} (run scripts/snapshot_parquet.py)")
+        self.dataset = ds.dataset(
+            str(self.snapshot_dir),
+            format="parquet",
+            partitioning=ds.partitioning(pa.schema([("sale_date", pa.date32())]), flavor="hive"),
+            filesystem=fs.LocalFileSystem(use_mmap=True),
+        )
+
+    def watermark(self):
+        return read_state(self.snapshot_dir)["watermark"]
+
+    def lines(self, start_date, end_date, columns=REPORT_COLUMNS) -> pd.DataFrame:
+        """
+        Snapshot lines with start_date <= sale_date <= end_date as a DataFrame:
+        sale_day (days since 1970-01-01), names as categoricals, money columns
+        as int64 cents (<name>_c), sale_time as sale_time_us (UTC microseconds).
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        start_date, end_date = to_date(start_date), to_date(end_date)
+        table = self.dataset.to_table(
+            columns=["sale_date", *columns],
+            filter=(ds.field("sale_date") >= pa.scalar(start_date, pa.date32()))
+            & (ds.field("sale_date") <= pa.scalar(end_date, pa.date32())),
+        )
+
+        data = {"sale_day": table["sale_date"].cast(pa.int32()).to_numpy()}
+        for name in columns:
+            col = table[name]
+            if name in MONEY_COLUMNS:
+                # NUMERIC(12,2) fits a double exactly enough to recover the cents
+                data[f"{name}_c"] = np.rint(col.cast(pa.float64()).to_numpy() * 100).astype(np.int64)
+            elif name == "sale_time":
+                data["sale_time_us"] = col.cast(pa.int64()).to_numpy()
+            elif pa.types.is_dictionary(col.type):
+                data[name] = col.to_pandas()
+            else:
+                data[name] = col.to_numpy()
+        return pd.DataFrame(data)
+
+
+# ====== helpers ======
+def to_date(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+def day_number(value) -> int:
+    return (to_date(value) - EPOCH_DAY).days
+
+
+def between(lines: pd.DataFrame, start_date, end_date) -> pd.DataFrame:
+    """Rows of a wider lines() frame inside one period."""
+    day = lines["sale_day"]
+    return lines[(day >= day_number(start_date)) & (day <= day_number(end_date))]
+
+
+def money(cents) -> Decimal:
+    return Decimal(int(cents)).scaleb(-2)
+
+
+def round_cents(hundredths_of_cents):
+    """ROUND(x, 2) for x given in 1/10000 units: half away from zero, like numeric ROUND."""
+    x = hundredths_of_cents
+    return np.where(x < 0, -((-x + 50) // 100), (x + 50) // 100)
+
+
+def tol_cents(tol) -> int:
+    """|diff_cents| > tol  <=>  |diff_cents| > floor(tol * 100), since diff_cents is an integer."""
+    return int((Decimal(str(tol)) * 100).to_integral_value(rounding=ROUND_FLOOR))
+
+
+def total_diff_cents(lines: pd.DataFrame):
+    """line_total - ROUND(unit_price * units, 2) in cents (the stored total_diff column)."""
+    price = lines["unit_price_c"].to_numpy()
+    units = lines["units_c"].to_numpy()
+    bound = int(np.abs(price).max(initial=0)) * int(np.abs(units).max(initial=0))
+    if bound >= 2 ** 62:
+        # Products past int64: exact Python ints, slower
+        price, units = price.astype(object), units.astype(object)
+    return lines["line_total_c"].to_numpy() - round_cents(price * units)
+
+
+def shipping_names(lines: pd.DataFrame) -> pd.Series:
+    """COALESCE(company_name, 'UNKNOWN')."""
+    ship = lines["shipping_company"]
+    if "UNKNOWN" not in ship.cat.categories:
+        ship = ship.cat.add_categories(["UNKNOWN"])
+    return ship.fillna("UNKNOWN")
+
+
+def ranked(lines: pd.DataFrame, key, name: str, with_units: bool, with_count: bool) -> list:
+    grouped = lines.groupby(key, observed=True, sort=False)
+    out = pd.DataFrame({"line_total_c": grouped["line_total_c"].sum()})
+    if with_units:
+        out["units_c"] = grouped["units_c"].sum()
+    if with_count:
+        out["line_count"] = grouped.size()
+    out.index = out.index.astype(str)
+    out = out.rename_axis(name).reset_index()
+    out = out.sort_values(["line_total_c", name], ascending=[False, True], kind="stable")
+
+    rows = []
+    for rec in out.itertuples(index=False):
+        row = {name: getattr(rec, name), "revenue": money(rec.line_total_c)}
+        if with_units:
+            row["units"] = money(rec.units_c)
+        if with_count:
+            row["line_count"] = int(rec.line_count)
+        rows.append(row)
+    return rows
+
+
+# ====== reports (SQL_WEEKLY_SUMMARY, SQL_SELLER_RANKING, SQL_TOP_PRODUCTS, SQL_SHIPPING) ======
+def weekly_summary(lines: pd.DataFrame, start_date, end_date) -> dict:
+    return {
+        "start_date": to_date(start_date),
+        "end_date": to_date(end_date),
+        "revenue": money(lines["line_total_c"].sum()),
+        "units": money(lines["units_c"].sum()),
+        "line_count": len(lines),
+    }
+
+
+def seller_ranking(lines: pd.DataFrame) -> list:
+    return ranked(lines, "seller_name", "seller_name", with_units=True, with_count=True)
+
+
+def top_products(lines: pd.DataFrame, limit: int = 10) -> list:
+    return ranked(lines, "product_code", "product_code", with_units=True, with_count=False)[:limit]
+
+
+def shipping_breakdown(lines: pd.DataFrame) -> list:
+    return ranked(lines, shipping_names(lines), "shipping_company", with_units=False, with_count=True)
+
+
+# ====== data quality (SQL_DATA_QUALITY_SUMMARY, SQL_DATA_QUALITY_SAMPLES) ======
+def data_quality_summary(lines: pd.DataFrame, start_date, end_date, tol=0.05) -> dict:
+    row = {"start_date": to_date(start_date), "end_date": to_date(end_date), "rows_in_range": len(lines)}
+    counts = {
+        "mismatched_total_count": np.abs(total_diff_cents(lines)) > tol_cents(tol),
+        "nonpositive_units_count": lines["units_c"].to_numpy() <= 0,
+        "negative_amount_count": (lines["unit_price_c"].to_numpy() < 0) | (lines["line_total_c"].to_numpy() < 0),
+        "missing_shipping_company_count": lines["shipping_company"].isna().to_numpy(),
+    }
+    for name, mask in counts.items():
+        # SUM over no rows is NULL
+        row[name] = int(np.count_nonzero(mask)) if len(lines) else None
+    return row
+
+
+def data_quality_samples(lines: pd.DataFrame, tol=0.05, limit: int = 200, after_time=None, after_id=None) -> list:
+    """Anomalous lines in (sale_time, line_id) order, after the keyset cursor when given."""
+    diff = total_diff_cents(lines)
+    mask = (
+        ((diff != 0) & (np.abs(diff) > tol_cents(tol)))
+        | (lines["units_c"].to_numpy() <= 0)
+        | (lines["unit_price_c"].to_numpy() < 0)
+        | (lines["line_total_c"].to_numpy() < 0)
+    )
+    times = lines["sale_time_us"].to_numpy()
+    ids = lines["line_id"].to_numpy()
+    if after_time is not None:
+        after_us = (after_time - EPOCH) // timedelta(microseconds=1)
+        mask &= (times > after_us) | ((times == after_us) & (ids > int(after_id)))
+
+    picked = np.flatnonzero(mask)
+    picked = picked[np.lexsort((ids[picked], times[picked]))][:limit]
+
+    sub = lines.iloc[picked]
+    ship = shipping_names(sub)
+    rows = []
+    for i, pos in enumerate(picked):
+        rec = sub.iloc[i]
+        rows.append({
+            "line_id": int(rec["line_id"]),
+            "sale_time": EPOCH + timedelta(microseconds=int(rec["sale_time_us"])),
+            "sale_date": EPOCH_DAY + timedelta(days=int(rec["sale_day"])),
+            "product_code": rec["product_code"],
+            "seller_name": rec["seller_name"],
+            "shipping_company": ship.iloc[i],
+            "unit_price": money(rec["unit_price_c"]),
+            "units": money(rec["units_c"]),
+            "line_total": money(rec["line_total_c"]),
+            "expected_total": money(rec["line_total_c"] - diff[pos]),
+            "diff": money(diff[pos]),
+        })
+    return rows
@@ -0,0 +1,216 @@
+import itertools
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Snapshot layout (hive-style, one directory per sale_date):
+#   <dir>/sale_date=2026-01-19/part-<run_id>.parquet
+#   <dir>/_snapshot.json   watermark + completed runs
+# Each run appends the fact lines ingested in [previous watermark, new watermark).
+STATE_FILE = "_snapshot.json"
+
+DEFAULT_FETCH_ROWS = 50_000
+
+# Low-cardinality names are stored as Parquet dictionary pages and read back as
+# Arrow dictionary arrays (pandas categoricals)
+DICTIONARY_COLUMNS = ["product_code", "seller_name", "shipping_company"]
+
+# Upper bound for this run: now, or the start of the oldest open transaction if
+# that is earlier. ingested_at defaults to now() (the inserting transaction's
+# start), so every line below this bound is already committed, and lines of
+# transactions still open are picked up by the next run instead of being missed.
+# Only holds if every session's xact_start is visible: pg_stat_activity shows
+# NULL for other roles' sessions unless the exporter has pg_read_all_stats
+# (SQL_SNAPSHOT_CAN_SEE_XACTS, checked before every run).
+SQL_SNAPSHOT_CAN_SEE_XACTS = """
+SELECT pg_has_role('pg_read_all_stats', 'USAGE') AS can_see;
+"""
+
+SQL_SNAPSHOT_WATERMARK = """
+SELECT LEAST(
+  now(),
+  COALESCE((
+    SELECT MIN(xact_start)
+    FROM pg_stat_activity
+    WHERE xact_start IS NOT NULL
+      AND pid <> pg_backend_pid()
+      AND datname = current_database()
+  ), now())
+) AS watermark;
+"""
+
+# Ordered by sale_date so each day's rows arrive together and go to one file.
+# Raw shipping_company (NULL when missing); the offline engine applies 'UNKNOWN'
+# like the SQL does.
+SQL_SNAPSHOT_LINES = """
+SELECT
+  f.sale_date,
+  f.line_id,
+  f.sale_time,
+  p.product_code,
+  s.seller_name,
+  sc.company_name AS shipping_company,
+  f.unit_price,
+  f.units,
+  f.line_total,
+  f.source_file,
+  f.source_row_number,
+  f.ingested_at
+FROM salesops.fact_sales_line f
+JOIN salesops.dim_product p ON p.product_id = f.product_id
+JOIN salesops.dim_seller s ON s.seller_id = f.seller_id
+LEFT JOIN salesops.dim_shipping_company sc ON sc.shipping_company_id = f.shipping_company_id
+WHERE (CAST(:after AS timestamptz) IS NULL OR f.ingested_at >= CAST(:after AS timestamptz))
+  AND f.ingested_at < CAST(:before AS timestamptz)
+ORDER BY f.sale_date, f.line_id;
+"""
+
+
+def arrow_schema():
+    import pyarrow as pa
+
+    name = pa.dictionary(pa.int32(), pa.string())
+    money = pa.decimal128(12, 2)
+    return pa.schema([
+        ("line_id", pa.int64()),
+        ("sale_time", pa.timestamp("us", tz="UTC")),
+        ("product_code", name),
+        ("seller_name", name),
+        ("shipping_company", name),
+        ("unit_price", money),
+        ("units", money),
+        ("line_total", money),
+        ("source_file", pa.string()),
+        ("source_row_number", pa.int32()),
+        ("ingested_at", pa.timestamp("us", tz="UTC")),
+    ])
+
+
+def rows_to_table(rows: list, schema):
+    import pyarrow as pa
+
+    # sale_date (column 0) is the partition directory, not a file column
+    columns = list(zip(*rows))[1:]
+    return pa.Table.from_arrays(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+        schema=schema,
+    )
+
+
+def partition_dir(snapshot_dir: Path, sale_date) -> Path:
+    return snapshot_dir / f"sale_date={sale_date.isoformat()}"
+
+
+def read_state(snapshot_dir: Path) -> dict:
+    path = snapshot_dir / STATE_FILE
+    if not path.exists():
+        return {"watermark": None, "runs": []}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_state(snapshot_dir: Path, state: dict):
+    # Replace atomically: a crash leaves the previous state, never half a file
+    path = snapshot_dir / STATE_FILE
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+
+def remove_orphans(snapshot_dir: Path, state: dict) -> int:
+    """Delete part files of runs that never reached the state file (crashed runs); they would double-count."""
+    done = {run["run_id"] for run in state["runs"]}
+    removed = 0
+    for path in snapshot_dir.glob("sale_date=*/part-*.parquet"):
+        if path.stem[len("part-"):] not in done:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def reset_snapshot(snapshot_dir: Path):
+    for path in snapshot_dir.glob("sale_date=*"):
+        shutil.rmtree(path)
+    (snapshot_dir / STATE_FILE).unlink(missing_ok=True)
+
+
+def export_snapshot(engine, snapshot_dir, fetch_rows: int = DEFAULT_FETCH_ROWS, full: bool = False) -> dict:
+    """
+    Append the lines ingested since the last run to the Parquet snapshot.
+
+    Streams the rows with a server-side cursor and writes one file per
+    sale_date touched by this run. The watermark only advances once every file
+    is closed. Raises RuntimeError, before writing anything, when the role
+    lacks pg_read_all_stats. Returns the run record stored in the state file.
+    """
+    import pyarrow.parquet as pq
+
+    with engine.connect() as conn:
+        can_see_xacts = conn.execute(text(SQL_SNAPSHOT_CAN_SEE_XACTS)).scalar_one()
+    if not can_see_xacts:
+        # Without it the watermark could pass an in-flight import whose lines would never be exported
+        raise RuntimeError(
+            "Snapshot export needs the pg_read_all_stats role to see other sessions' open "
+            "transactions (GRANT pg_read_all_stats TO <exporter role>)"
+        )
+
+    snapshot_dir = Path(snapshot_dir)
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    if full:
+        reset_snapshot(snapshot_dir)
+    state = read_state(snapshot_dir)
+    orphans = remove_orphans(snapshot_dir, state)
+
+    schema = arrow_schema()
+    rows_written = 0
+    days = 0
+    writer = None
+    with engine.connect().execution_options(postgresql_readonly=True) as conn, conn.begin():
+        before = conn.execute(text(SQL_SNAPSHOT_WATERMARK)).scalar_one()
+        run_id = before.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        result = conn.execution_options(yield_per=fetch_rows).execute(
+            text(SQL_SNAPSHOT_LINES), {"after": state["watermark"], "before": before}
+        )
+        current_day = None
+        try:
+            for batch in result.partitions():
+                for day, group in itertools.groupby(batch, key=lambda r: r[0]):
+                    if day != current_day:
+                        if writer is not None:
+                            writer.close()
+                        out_dir = partition_dir(snapshot_dir, day)
+                        out_dir.mkdir(exist_ok=True)
+                        writer = pq.ParquetWriter(
+                            str(out_dir / f"part-{run_id}.parquet"),
+                            schema,
+                            use_dictionary=DICTIONARY_COLUMNS,
+                            compression="zstd",
+                        )
+                        current_day = day
+                        days += 1
+                    group = list(group)
+                    writer.write_table(rows_to_table(group, schema))
+                    rows_written += len(group)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    run = {
+        "run_id": run_id,
+        "after": state["watermark"],
+        "before": before.isoformat(),
+        "rows": rows_written,
+        "days": days,
+        "orphans_removed": orphans,
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+    }
+    if rows_written:
+        state["runs"].append(run)
+    state["watermark"] = run["before"]
+    write_state(snapshot_dir, state)
+    return run
@@ -30,6 +30,27 @@ SELECT
 FROM base;
 """
 
+# Same columns as SQL_DATA_QUALITY_SUMMARY at the tolerance agg_daily_dq is kept
+# at (app.ingest.dq_stats.DQ_STATS_TOL), summed from one row per day
+SQL_DATA_QUALITY_SUMMARY_DAILY = """
+SELECT
+  CAST(:start_date AS date) AS start_date,
+  CAST(:end_date   AS date) AS end_date,
+
+  COALESCE(SUM(line_count), 0)::bigint                     AS rows_in_range,
+  COALESCE(SUM(mismatched_total_count), 0)::bigint         AS mismatched_total_count,
+  COALESCE(SUM(nonpositive_units_count), 0)::bigint        AS nonpositive_units_count,
+  COALESCE(SUM(negative_amount_count), 0)::bigint          AS negative_amount_count,
+  COALESCE(SUM(missing_shipping_company_count), 0)::bigint AS missing_shipping_company_count
+
+FROM salesops.agg_daily_dq
+WHERE sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date);
+"""
+
+# Keyset-paginated: rows after (:after_time, :after_id) in (sale_time, line_id)
+# order, both NULL for the first page. total_diff is the stored
+# line_total - round(unit_price*units, 2); the "total_diff <> 0" arm matches the
+# predicate of idx_fact_dq_anomaly, so only anomalous rows are read.
 SQL_DATA_QUALITY_SAMPLES = """
 SELECT
   f.line_id,
@@ -41,19 +62,25 @@ SELECT
   f.unit_price,
   f.units,
   f.line_total,
-  ROUND((f.unit_price * f.units)::numeric, 2) AS expected_total,
-  ROUND((f.line_total - ROUND((f.unit_price * f.units)::numeric, 2))::numeric, 2) AS diff
+  f.line_total - f.total_diff AS expected_total,
+  f.total_diff AS diff
 FROM salesops.fact_sales_line f
 JOIN salesops.dim_product p ON p.product_id = f.product_id
 JOIN salesops.dim_seller s ON s.seller_id = f.seller_id
 LEFT JOIN salesops.dim_shipping_company sc ON sc.shipping_company_id = f.shipping_company_id
 WHERE f.sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
+  -- Lets deep pages skip the partitions before the cursor
+  AND f.sale_date >= COALESCE((CAST(:after_time AS timestamptz) AT TIME ZONE 'UTC')::date, CAST(:start_date AS date))
+  AND (
+    CAST(:after_time AS timestamptz) IS NULL
+    OR (f.sale_time, f.line_id) > (CAST(:after_time AS timestamptz), CAST(:after_id AS bigint))
+  )
   AND (
-    ABS(f.line_total - ROUND((f.unit_price * f.units)::numeric, 2)) > CAST(:tol AS numeric)
+    (f.total_diff <> 0 AND ABS(f.total_diff) > CAST(:tol AS numeric))
     OR f.units <= 0
     OR f.unit_price < 0
     OR f.line_total < 0
   )
-ORDER BY f.sale_time
+ORDER BY f.sale_time, f.line_id
 LIMIT :limit;
 """
@@ -0,0 +1,176 @@
+from app.queries.routing import rollup_enabled
+
+# Every identifier below comes from these tables; request values only ever
+# reach the SQL as bind parameters.
+
+# Dimension -> (select expression, join it needs or None). "src" is the source alias.
+DIMENSIONS = {
+    "sale_date": ("src.sale_date", None),
+    "seller": ("s.seller_name", "JOIN salesops.dim_seller s ON s.seller_id = src.seller_id"),
+    "product": ("p.product_code", "JOIN salesops.dim_product p ON p.product_id = src.product_id"),
+    "shipping_company": (
+        "COALESCE(sc.company_name, 'UNKNOWN')",
+        "LEFT JOIN salesops.dim_shipping_company sc ON sc.shipping_company_id = src.shipping_company_id",
+    ),
+}
+
+# Filter -> (source column, id lookup by name)
+FILTERS = {
+    "seller": ("seller_id", "SELECT seller_id FROM salesops.dim_seller WHERE seller_name = ANY(CAST(:{p} AS text[]))"),
+    "product": ("product_id", "SELECT product_id FROM salesops.dim_product WHERE product_code = ANY(CAST(:{p} AS text[]))"),
+    "shipping_company": (
+        "shipping_company_id",
+        "SELECT shipping_company_id FROM salesops.dim_shipping_company WHERE company_name = ANY(CAST(:{p} AS text[]))",
+    ),
+}
+
+# Sources from cheapest to most expensive, with what each one can answer.
+# agg_daily_sales has one row per day x seller x product x shipping company;
+# fact_sales_line one per line. (vw_daily_sales is a plain view over
+# fact_sales_line, so it is never cheaper than the facts.) agg_daily_totals is
+# left out: it lags until the importer's trend refresh, while the cache key's
+# data version moves with every import, so a pivot from it would be cached as
+# current and disagree with the agg_daily_sales-backed reports.
+SOURCES = [
+    {
+        "name": "agg_daily_sales",
+        "table": "salesops.agg_daily_sales",
+        "dimensions": set(DIMENSIONS),
+        "filters": set(FILTERS),
+        "sums": {"revenue": "src.revenue", "units": "src.units", "line_count": "src.line_count"},
+    },
+    {
+        "name": "fact_sales_line",
+        "table": "salesops.fact_sales_line",
+        "dimensions": set(DIMENSIONS),
+        "filters": set(FILTERS),
+        "sums": {"revenue": "src.line_total", "units": "src.units", "line_count": "1"},
+        "line_level": True,
+    },
+]
+
+# Measure -> SQL over the source's SUM() expressions ({revenue} etc.);
+# line-level measures read fact columns directly and only the facts have them.
+MEASURES = {
+    "revenue": "ROUND(COALESCE(SUM({revenue}), 0), 2)",
+    "units": "ROUND(COALESCE(SUM({units}), 0), 2)",
+    "line_count": "COALESCE(SUM({line_count}), 0)::bigint",
+    "avg_price": "ROUND(SUM({revenue}) / NULLIF(SUM({units}), 0), 2)",
+    "avg_line_total": "ROUND(SUM({revenue}) / NULLIF(SUM({line_count}), 0), 2)",
+}
+LINE_LEVEL_MEASURES = {
+    "max_line_total": "MAX(src.line_total)",
+    "max_unit_price": "MAX(src.unit_price)",
+    "min_unit_price": "MIN(src.unit_price)",
+}
+
+MAX_PIVOT_LIMIT = 10_000
+
+
+def parse_list(value) -> list:
+    """"a,b" or ["a", "b,c"] -> ["a", "b", "c"], blanks dropped, order kept."""
+    if value is None:
+        return []
+    items = value if isinstance(value, (list, tuple)) else [value]
+    out = []
+    for item in items:
+        out.extend(v.strip() for v in str(item).split(",") if v.strip())
+    return out
+
+
+def choose_source(dimensions: list, measures: list, filters: dict) -> tuple:
+    """(source, skipped) for the cheapest source that can answer the request; skipped says why cheaper ones could not."""
+    skipped = []
+    for source in SOURCES:
+        if source["name"] != "fact_sales_line" and not rollup_enabled():
+            skipped.append(f"{source['name']}: USE_DAILY_ROLLUP is off")
+            continue
+        missing_dims = set(dimensions) - source["dimensions"]
+        missing_filters = set(filters) - source["filters"]
+        line_level = [m for m in measures if m in LINE_LEVEL_MEASURES]
+        if missing_dims:
+            skipped.append(f"{source['name']}: no {', '.join(sorted(missing_dims))} dimension")
+        elif missing_filters:
+            skipped.append(f"{source['name']}: cannot filter on {', '.join(sorted(missing_filters))}")
+        elif line_level and not source.get("line_level"):
+            skipped.append(f"{source['name']}: {', '.join(line_level)} needs line-level rows")
+        else:
+            return source, skipped
+    raise AssertionError("fact_sales_line answers every pivot")
+
+
+def plan_pivot(dimensions, measures, filters: dict, sort=None, limit: int = 100) -> dict:
+    """
+    Validate a pivot request and build its SQL.
+
+    dimensions/measures are names from DIMENSIONS/MEASURES/LINE_LEVEL_MEASURES,
+    filters maps a FILTERS name to a list of values, sort is an output column
+    with an optional "-" for descending. Raises ValueError on anything unknown.
+    Returns {"source", "skipped", ..., "sql", "params"}; params still need
+    :start_date and :end_date.
+    """
+    dimensions = list(dict.fromkeys(dimensions))
+    measures = list(dict.fromkeys(measures or ["revenue", "units", "line_count"]))
+    filters = {k: list(v) for k, v in filters.items() if v}
+
+    unknown = [d for d in dimensions if d not in DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown dimension(s): {', '.join(unknown)} (use {', '.join(DIMENSIONS)})")
+    all_measures = {**MEASURES, **LINE_LEVEL_MEASURES}
+    unknown = [m for m in measures if m not in all_measures]
+    if unknown:
+        raise ValueError(f"Unknown measure(s): {', '.join(unknown)} (use {', '.join(all_measures)})")
+    unknown = [f for f in filters if f not in FILTERS]
+    if unknown:
+        raise ValueError(f"Unknown filter(s): {', '.join(unknown)} (use {', '.join(FILTERS)})")
+    if not 1 <= limit <= MAX_PIVOT_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_PIVOT_LIMIT}")
+
+    if not sort:
+        sort = "-revenue" if "revenue" in measures else f"-{measures[0]}"
+    sort_col = sort.lstrip("-")
+    if sort_col not in dimensions and sort_col not in measures:
+        raise ValueError(f"sort must be one of the requested dimensions or measures, not {sort_col!r}")
+    descending = sort.startswith("-")
+
+    source, skipped = choose_source(dimensions, measures, filters)
+
+    select = [f"{DIMENSIONS[d][0]} AS {d}" for d in dimensions]
+    for m in measures:
+        expr = MEASURES[m].format(**source["sums"]) if m in MEASURES else LINE_LEVEL_MEASURES[m]
+        select.append(f"{expr} AS {m}")
+    joins = [DIMENSIONS[d][1] for d in dimensions if DIMENSIONS[d][1]]
+
+    where = ["src.sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)"]
+    params = {}
+    for name, values in filters.items():
+        column, lookup = FILTERS[name]
+        where.append(f"src.{column} IN ({lookup.format(p='f_' + name)})")
+        params[f"f_{name}"] = values
+
+    # Ties broken by the dimensions so pages and cache entries are stable
+    order = [f"{sort_col} {'DESC' if descending else 'ASC'} NULLS LAST"]
+    order += [d for d in dimensions if d != sort_col]
+
+    sql = "\n".join(filter(None, [
+        "SELECT",
+        "  " + ",\n  ".join(select),
+        f"FROM {source['table']} src",
+        "\n".join(joins),
+        "WHERE " + "\n  AND ".join(where),
+        ("GROUP BY " + ", ".join(str(i) for i in range(1, len(dimensions) + 1))) if dimensions else None,
+        "ORDER BY " + ", ".join(order),
+        "LIMIT :limit;",
+    ]))
+    params["limit"] = limit
+
+    return {
+        "source": source["name"],
+        "skipped": skipped,
+        "dimensions": dimensions,
+        "measures": measures,
+        "filters": filters,
+        "sort": sort,
+        "sql": sql,
+        "params": params,
+    }
@@ -51,3 +51,323 @@ WHERE f.sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
 GROUP BY 1
 ORDER BY revenue DESC;
 """
+
+
+# Dashboard: summary + seller + product + shipping aggregates in one scan.
+# grouping_id bits (GROUPING order seller, product, shipping):
+#   7 = grand total, 3 = per seller, 5 = per product, 6 = per shipping company
+SQL_DASHBOARD_AGGREGATES = """
+SELECT
+  GROUPING(s.seller_name, p.product_code, COALESCE(sc.company_name, 'UNKNOWN')) AS grouping_id,
+  CAST(:start_date AS date) AS start_date,
+  CAST(:end_date   AS date) AS end_date,
+  s.seller_name,
+  p.product_code,
+  COALESCE(sc.company_name, 'UNKNOWN') AS shipping_company,
+  ROUND(COALESCE(SUM(f.line_total), 0), 2) AS revenue,
+  ROUND(COALESCE(SUM(f.units), 0), 2)      AS units,
+  COUNT(*)                                  AS line_count
+FROM salesops.fact_sales_line f
+JOIN salesops.dim_seller s ON s.seller_id = f.seller_id
+JOIN salesops.dim_product p ON p.product_id = f.product_id
+LEFT JOIN salesops.dim_shipping_company sc
+  ON sc.shipping_company_id = f.shipping_company_id
+WHERE f.sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
+GROUP BY GROUPING SETS (
+  (),
+  (s.seller_name),
+  (p.product_code),
+  (COALESCE(sc.company_name, 'UNKNOWN'))
+);
+"""
+
+
+# Batch reports: the same four panels for many periods in one scan of the
+# whole range. :period_starts / :period_ends are parallel date arrays;
+# :start_date / :end_date span all of them (keeps partition pruning).
+# grouping_id as in SQL_DASHBOARD_AGGREGATES; periods without sales return no rows.
+SQL_PERIOD_AGGREGATES = """
+WITH periods AS (
+  SELECT period_start, period_end
+  FROM unnest(CAST(:period_starts AS date[]), CAST(:period_ends AS date[])) AS t(period_start, period_end)
+)
+SELECT
+  GROUPING(s.seller_name, p.product_code, COALESCE(sc.company_name, 'UNKNOWN')) AS grouping_id,
+  per.period_start,
+  per.period_end,
+  s.seller_name,
+  p.product_code,
+  COALESCE(sc.company_name, 'UNKNOWN') AS shipping_company,
+  ROUND(COALESCE(SUM(f.line_total), 0), 2) AS revenue,
+  ROUND(COALESCE(SUM(f.units), 0), 2)      AS units,
+  COUNT(*)                                  AS line_count
+FROM periods per
+JOIN salesops.fact_sales_line f
+  ON f.sale_date BETWEEN per.period_start AND per.period_end
+JOIN salesops.dim_seller s ON s.seller_id = f.seller_id
+JOIN salesops.dim_product p ON p.product_id = f.product_id
+LEFT JOIN salesops.dim_shipping_company sc
+  ON sc.shipping_company_id = f.shipping_company_id
+WHERE f.sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
+GROUP BY per.period_start, per.period_end, GROUPING SETS (
+  (),
+  (s.seller_name),
+  (p.product_code),
+  (COALESCE(sc.company_name, 'UNKNOWN'))
+);
+"""
+
+
+# =========================
+# Day-grain variants answered from salesops.agg_daily_sales
+# (same columns and ordering as the raw-fact queries above)
+# =========================
+
+SQL_WEEKLY_SUMMARY_ROLLUP = """
+SELECT
+  CAST(:start_date AS date) AS start_date,
+  CAST(:end_date   AS date) AS end_date,
+  ROUND(COALESCE(SUM(revenue), 0), 2)    AS revenue,
+  ROUND(COALESCE(SUM(units), 0), 2)      AS units,
+  COALESCE(SUM(line_count), 0)::bigint   AS line_count
+FROM salesops.agg_daily_sales
+WHERE sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date);
+"""
+
+
+SQL_SELLER_RANKING_ROLLUP = """
+SELECT
+  s.seller_name,
+  ROUND(COALESCE(SUM(a.revenue), 0), 2)  AS revenue,
+  ROUND(COALESCE(SUM(a.units), 0), 2)    AS units,
+  COALESCE(SUM(a.line_count), 0)::bigint AS line_count
+FROM salesops.agg_daily_sales a
+JOIN salesops.dim_seller s ON s.seller_id = a.seller_id
+WHERE a.sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
+GROUP BY s.seller_name
+ORDER BY revenue DESC;
+"""
+
+
+SQL_TOP_PRODUCTS_ROLLUP = """
+SELECT
+  p.product_code,
+  ROUND(COALESCE(SUM(a.revenue), 0), 2)  AS revenue,
+  ROUND(COALESCE(SUM(a.units), 0), 2)    AS units
+FROM salesops.agg_daily_sales a
+JOIN salesops.dim_product p ON p.product_id = a.product_id
+WHERE a.sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
+GROUP BY p.product_code
+ORDER BY revenue DESC
+LIMIT :limit;
+"""
+
+
+SQL_SHIPPING_ROLLUP = """
+SELECT
+  COALESCE(sc.company_name, 'UNKNOWN') AS shipping_company,
+  ROUND(COALESCE(SUM(a.revenue), 0), 2)  AS revenue,
+  COALESCE(SUM(a.line_count), 0)::bigint AS line_count
+FROM salesops.agg_daily_sales a
+LEFT JOIN salesops.dim_shipping_company sc
+  ON sc.shipping_company_id = a.shipping_company_id
+WHERE a.sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
+GROUP BY 1
+ORDER BY revenue DESC;
+"""
+
+
+SQL_DASHBOARD_AGGREGATES_ROLLUP = """
+SELECT
+  GROUPING(s.seller_name, p.product_code, COALESCE(sc.company_name, 'UNKNOWN')) AS grouping_id,
+  CAST(:start_date AS date) AS start_date,
+  CAST(:end_date   AS date) AS end_date,
+  s.seller_name,
+  p.product_code,
+  COALESCE(sc.company_name, 'UNKNOWN') AS shipping_company,
+  ROUND(COALESCE(SUM(a.revenue), 0), 2)  AS revenue,
+  ROUND(COALESCE(SUM(a.units), 0), 2)    AS units,
+  COALESCE(SUM(a.line_count), 0)::bigint AS line_count
+FROM salesops.agg_daily_sales a
+JOIN salesops.dim_seller s ON s.seller_id = a.seller_id
+JOIN salesops.dim_product p ON p.product_id = a.product_id
+LEFT JOIN salesops.dim_shipping_company sc
+  ON sc.shipping_company_id = a.shipping_company_id
+WHERE a.sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
+GROUP BY GROUPING SETS (
+  (),
+  (s.seller_name),
+  (p.product_code),
+  (COALESCE(sc.company_name, 'UNKNOWN'))
+);
+"""
+
+
+SQL_PERIOD_AGGREGATES_ROLLUP = """
+WITH periods AS (
+  SELECT period_start, period_end
+  FROM unnest(CAST(:period_starts AS date[]), CAST(:period_ends AS date[])) AS t(period_start, period_end)
+)
+SELECT
+  GROUPING(s.seller_name, p.product_code, COALESCE(sc.company_name, 'UNKNOWN')) AS grouping_id,
+  per.period_start,
+  per.period_end,
+  s.seller_name,
+  p.product_code,
+  COALESCE(sc.company_name, 'UNKNOWN') AS shipping_company,
+  ROUND(COALESCE(SUM(a.revenue), 0), 2)  AS revenue,
+  ROUND(COALESCE(SUM(a.units), 0), 2)    AS units,
+  COALESCE(SUM(a.line_count), 0)::bigint AS line_count
+FROM periods per
+JOIN salesops.agg_daily_sales a
+  ON a.sale_date BETWEEN per.period_start AND per.period_end
+JOIN salesops.dim_seller s ON s.seller_id = a.seller_id
+JOIN salesops.dim_product p ON p.product_id = a.product_id
+LEFT JOIN salesops.dim_shipping_company sc
+  ON sc.shipping_company_id = a.shipping_company_id
+WHERE a.sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
+GROUP BY per.period_start, per.period_end, GROUPING SETS (
+  (),
+  (s.seller_name),
+  (p.product_code),
+  (COALESCE(sc.company_name, 'UNKNOWN'))
+);
+"""
+
+
+# =========================
+# Trend charts (day/week totals, refreshed for the weeks each import touched)
+# =========================
+
+SQL_DAILY_TREND = """
+SELECT sale_date, revenue, units, line_count
+FROM salesops.agg_daily_totals
+WHERE sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
+ORDER BY sale_date;
+"""
+
+
+SQL_WEEKLY_TREND = """
+SELECT week_start_monday, revenue, units, line_count
+FROM salesops.agg_weekly_totals
+WHERE week_start_monday BETWEEN date_trunc('week', CAST(:start_date AS timestamp))::date
+                            AND CAST(:end_date AS date)
+ORDER BY week_start_monday;
+"""
+
+
+# =========================
+# Time series with period-over-period deltas (from agg_daily_sales)
+# =========================
+
+# :granularity is day, week or month; :year_step is the distance to the same
+# bucket last year ('1 year', or '52 weeks' so weeks stay Monday-aligned).
+# Buckets are whole periods overlapping the range. The series starts one year
+# step earlier so the first bucket has both comparisons; generate_series fills
+# empty buckets with zeros, LAG gives the previous bucket and a self-join on
+# bucket_start - year_step gives last year's.
+SQL_TIMESERIES = """
+WITH bounds AS (
+  SELECT
+    date_trunc(CAST(:granularity AS text), CAST(:start_date AS timestamp))::date AS first_bucket,
+    date_trunc(CAST(:granularity AS text), CAST(:end_date AS timestamp))::date   AS last_bucket,
+    CAST('1 ' || CAST(:granularity AS text) AS interval)                         AS step,
+    CAST(:year_step AS interval)                                                 AS year_step
+),
+buckets AS (
+  SELECT gs::date AS bucket_start, (gs + b.step)::date - 1 AS bucket_end
+  FROM bounds b,
+       generate_series(b.first_bucket - b.year_step, b.last_bucket::timestamp, b.step) AS gs
+),
+per_bucket AS (
+  SELECT
+    date_trunc(CAST(:granularity AS text), a.sale_date::timestamp)::date AS bucket_start,
+    SUM(a.revenue)    AS revenue,
+    SUM(a.units)      AS units,
+    SUM(a.line_count) AS line_count
+  FROM salesops.agg_daily_sales a, bounds b
+  WHERE a.sale_date >= (b.first_bucket - b.year_step)::date
+    AND a.sale_date <  (b.last_bucket + b.step)::date
+    AND (CAST(:seller AS text) IS NULL OR a.seller_id = (
+          SELECT seller_id FROM salesops.dim_seller WHERE seller_name = CAST(:seller AS text)))
+    AND (CAST(:product AS text) IS NULL OR a.product_id = (
+          SELECT product_id FROM salesops.dim_product WHERE product_code = CAST(:product AS text)))
+    AND (CAST(:shipping AS text) IS NULL OR a.shipping_company_id = (
+          SELECT shipping_company_id FROM salesops.dim_shipping_company WHERE company_name = CAST(:shipping AS text)))
+  GROUP BY 1
+),
+series AS (
+  SELECT
+    k.bucket_start,
+    k.bucket_end,
+    COALESCE(p.revenue, 0)    AS revenue,
+    COALESCE(p.units, 0)      AS units,
+    COALESCE(p.line_count, 0) AS line_count
+  FROM buckets k
+  LEFT JOIN per_bucket p USING (bucket_start)
+),
+windowed AS (
+  SELECT
+    s.*,
+    LAG(s.revenue)    OVER w AS prev_revenue,
+    LAG(s.units)      OVER w AS prev_units,
+    LAG(s.line_count) OVER w AS prev_line_count
+  FROM series s
+  WINDOW w AS (ORDER BY s.bucket_start)
+)
+SELECT
+  w.bucket_start,
+  w.bucket_end,
+  w.revenue,
+  w.units,
+  w.line_count,
+
+  w.prev_revenue,
+  w.prev_units,
+  w.prev_line_count,
+  ROUND((w.revenue - w.prev_revenue) / NULLIF(w.prev_revenue, 0) * 100, 2) AS revenue_vs_prev_pct,
+  ROUND((w.units - w.prev_units) / NULLIF(w.prev_units, 0) * 100, 2)       AS units_vs_prev_pct,
+
+  y.revenue    AS yoy_revenue,
+  y.units      AS yoy_units,
+  y.line_count AS yoy_line_count,
+  ROUND((w.revenue - y.revenue) / NULLIF(y.revenue, 0) * 100, 2) AS revenue_vs_yoy_pct,
+  ROUND((w.units - y.units) / NULLIF(y.units, 0) * 100, 2)       AS units_vs_yoy_pct
+FROM windowed w
+CROSS JOIN bounds b
+LEFT JOIN series y ON y.bucket_start = (w.bucket_start - b.year_step)::date
+WHERE w.bucket_start >= b.first_bucket
+ORDER BY w.bucket_start;
+"""
+
+
+# =========================
+# Line-level export (streamed through a server-side cursor)
+# =========================
+
+# Optional filters are resolved to ids first so the fact scan can use
+# idx_fact_seller_date / idx_fact_product_date; a NULL filter folds away.
+SQL_EXPORT_LINES = """
+SELECT
+  f.line_id,
+  f.sale_time,
+  f.sale_date,
+  p.product_code,
+  s.seller_name,
+  sc.company_name AS shipping_company,
+  f.unit_price,
+  f.units,
+  f.line_total,
+  f.source_file,
+  f.source_row_number
+FROM salesops.fact_sales_line f
+JOIN salesops.dim_product p ON p.product_id = f.product_id
+JOIN salesops.dim_seller s ON s.seller_id = f.seller_id
+LEFT JOIN salesops.dim_shipping_company sc ON sc.shipping_company_id = f.shipping_company_id
+WHERE f.sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
+  AND (CAST(:seller AS text) IS NULL OR f.seller_id = (
+        SELECT seller_id FROM salesops.dim_seller WHERE seller_name = CAST(:seller AS text)))
+  AND (CAST(:product AS text) IS NULL OR f.product_id = (
+        SELECT product_id FROM salesops.dim_product WHERE product_code = CAST(:product AS text)))
+ORDER BY f.sale_date, f.line_id;
+"""
@@ -0,0 +1,48 @@
+import os
+
+from app.ingest.dq_stats import DQ_STATS_TOL
+from app.queries.dq_queries import SQL_DATA_QUALITY_SUMMARY, SQL_DATA_QUALITY_SUMMARY_DAILY
+from app.queries.report_queries import (
+    SQL_WEEKLY_SUMMARY,
+    SQL_SELLER_RANKING,
+    SQL_TOP_PRODUCTS,
+    SQL_SHIPPING,
+    SQL_DASHBOARD_AGGREGATES,
+    SQL_PERIOD_AGGREGATES,
+    SQL_WEEKLY_SUMMARY_ROLLUP,
+    SQL_SELLER_RANKING_ROLLUP,
+    SQL_TOP_PRODUCTS_ROLLUP,
+    SQL_SHIPPING_ROLLUP,
+    SQL_DASHBOARD_AGGREGATES_ROLLUP,
+    SQL_PERIOD_AGGREGATES_ROLLUP,
+)
+
+# Raw-fact query -> equivalent over salesops.agg_daily_sales.
+# Only queries that group at day level (or coarser) belong here; anything that
+# needs line-level columns (DQ samples) always reads fact_sales_line.
+ROLLUP_EQUIVALENTS = {
+    SQL_WEEKLY_SUMMARY: SQL_WEEKLY_SUMMARY_ROLLUP,
+    SQL_SELLER_RANKING: SQL_SELLER_RANKING_ROLLUP,
+    SQL_TOP_PRODUCTS: SQL_TOP_PRODUCTS_ROLLUP,
+    SQL_SHIPPING: SQL_SHIPPING_ROLLUP,
+    SQL_DASHBOARD_AGGREGATES: SQL_DASHBOARD_AGGREGATES_ROLLUP,
+    SQL_PERIOD_AGGREGATES: SQL_PERIOD_AGGREGATES_ROLLUP,
+}
+
+
+def rollup_enabled() -> bool:
+    return os.environ.get("USE_DAILY_ROLLUP", "true").strip().lower() in ("1", "true", "yes", "on")
+
+
+def report_sql(sql: str) -> str:
+    """Route a report query to the daily rollup when it has a day-grain equivalent."""
+    if rollup_enabled():
+        return ROLLUP_EQUIVALENTS.get(sql, sql)
+    return sql
+
+
+def dq_summary_sql(tol: float) -> str:
+    """The DQ summary over agg_daily_dq when tol is the one it is kept at, else the raw scan."""
+    if rollup_enabled() and abs(tol - DQ_STATS_TOL) < 1e-9:
+        return SQL_DATA_QUALITY_SUMMARY_DAILY
+    return SQL_DATA_QUALITY_SUMMARY
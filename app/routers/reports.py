@@ -1,35 +1,55 @@
-from fastapi import APIRouter, Query
+import base64
+import binascii
+import csv
+import io
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy import text
-from app.db import get_engine
+from app.cache import cached_report, encode_json
+from app.db import _env_int, get_db
+from app.metrics import fetch_all, fetch_first, record_streamed_query
 from app.queries.report_queries import (
     SQL_WEEKLY_SUMMARY,
     SQL_SELLER_RANKING,
     SQL_TOP_PRODUCTS,
     SQL_SHIPPING,
+    SQL_DASHBOARD_AGGREGATES,
+    SQL_DAILY_TREND,
+    SQL_WEEKLY_TREND,
+    SQL_EXPORT_LINES,
+    SQL_TIMESERIES,
 )
-from app.queries.dq_queries import (
-    SQL_DATA_QUALITY_SUMMARY,
-    SQL_DATA_QUALITY_SAMPLES
-)
+from app.queries.pivot import parse_list, plan_pivot
+from app.queries.routing import dq_summary_sql, report_sql
+from app.queries.dq_queries import SQL_DATA_QUALITY_SAMPLES
 router = APIRouter(prefix="/reports", tags=["reports"])
 
+# /reports/timeseries granularity -> distance to the same bucket last year
+TIMESERIES_YEAR_STEPS = {"day": "1 year", "week": "52 weeks", "month": "1 year"}
 
-# =========================
-# Weekly Summary
-# =========================
+# Rows per server-side cursor fetch in /reports/export
+EXPORT_FETCH_ROWS = _env_int("EXPORT_FETCH_ROWS", 5000)
 
-@router.get("/weekly-summary")
-def weekly_summary(
-    start_date: str = Query(..., description="YYYY-MM-DD"),
-    end_date: str = Query(..., description="YYYY-MM-DD"),
-):
-    engine = get_engine()
-    params = {"start_date": start_date, "end_date": end_date}
+# Default sample rows of /reports/data-quality and /reports/data-quality-samples
+DQ_SAMPLE_LIMIT = 20
+
+EXPORT_COLUMNS = [
+    "line_id", "sale_time", "sale_date", "product_code", "seller_name", "shipping_company",
+    "unit_price", "units", "line_total", "source_file", "source_row_number",
+]
 
-    with engine.connect() as conn:
-        row = conn.execute(text(SQL_WEEKLY_SUMMARY), params).mappings().first()
 
-    return dict(row) if row else {
+# =========================
+# Response helpers (shared with app/routers/reports_async.py)
+# =========================
+
+def empty_weekly_summary(start_date, end_date) -> dict:
+    return {
         "start_date": start_date,
         "end_date": end_date,
         "revenue": 0,
@@ -38,27 +58,277 @@ def weekly_summary(
     }
 
 
+def data_quality_status(summary) -> str:
+    if summary and (
+        summary["mismatched_total_count"] > 0
+        or summary["nonpositive_units_count"] > 0
+        or summary["negative_amount_count"] > 0
+    ):
+        return "warn"
+    return "ok"
+
+
+def data_quality_notes(tol: float, limit: int) -> dict:
+    return {
+        "mismatch_rule": f"abs(line_total - round(unit_price*units,2)) > {tol}",
+        "sample_limit": limit,
+    }
+
+
+def split_dashboard_aggregates(rows, limit: int) -> dict:
+    """Split SQL_DASHBOARD_AGGREGATES rows into the per-panel lists, ordered like the single-panel SQL."""
+    summary = None
+    sellers, products, shipping = [], [], []
+    for r in rows:
+        gid = r["grouping_id"]
+        if gid == 7:
+            summary = {
+                "start_date": r["start_date"],
+                "end_date": r["end_date"],
+                "revenue": r["revenue"],
+                "units": r["units"],
+                "line_count": r["line_count"],
+            }
+        elif gid == 3:
+            sellers.append({
+                "seller_name": r["seller_name"],
+                "revenue": r["revenue"],
+                "units": r["units"],
+                "line_count": r["line_count"],
+            })
+        elif gid == 5:
+            products.append({
+                "product_code": r["product_code"],
+                "revenue": r["revenue"],
+                "units": r["units"],
+            })
+        elif gid == 6:
+            shipping.append({
+                "shipping_company": r["shipping_company"],
+                "revenue": r["revenue"],
+                "line_count": r["line_count"],
+            })
+
+    return {
+        "summary": summary,
+        "sellers": sorted(sellers, key=lambda d: d["revenue"], reverse=True),
+        "top_products": sorted(products, key=lambda d: d["revenue"], reverse=True)[:limit],
+        "shipping_companies": sorted(shipping, key=lambda d: d["revenue"], reverse=True),
+    }
+
+
+def check_row_format(fmt: str, numbers: str):
+    if fmt not in ("rows", "columnar"):
+        raise HTTPException(status_code=422, detail="format must be rows or columnar")
+    if numbers not in ("float", "scaled"):
+        raise HTTPException(status_code=422, detail="numbers must be float or scaled")
+
+
+def columnar(rows, numbers: str = "float") -> dict:
+    """
+    {"columns": [...], "data": [[...], ...]}: one array per column instead of
+    one object per row. Decimal columns become floats, or with numbers="scaled"
+    integers in units of 10**-scale (12.34 -> 1234), scales listed in "scales".
+    """
+    rows = list(rows)
+    columns = list(rows[0].keys()) if rows else []
+    data = []
+    scales = {}
+    for name in columns:
+        values = [r[name] for r in rows]
+        if any(isinstance(v, Decimal) for v in values):
+            if numbers == "scaled":
+                scale = max(-v.as_tuple().exponent for v in values if v is not None)
+                scale = max(scale, 0)
+                scales[name] = scale
+                values = [None if v is None else int(v.scaleb(scale)) for v in values]
+            else:
+                values = [None if v is None else float(v) for v in values]
+        data.append(values)
+    out = {"columns": columns, "data": data}
+    if numbers == "scaled":
+        out["scales"] = scales
+    return out
+
+
+def shape_rows(rows, fmt: str, numbers: str):
+    """Row list as returned by fetch_all (format=rows) or its columnar form."""
+    return columnar(rows, numbers) if fmt == "columnar" else list(rows)
+
+
+def encode_samples_cursor(row) -> str:
+    """Opaque next-page token for the (sale_time, line_id) keyset of data-quality samples."""
+    raw = f"{row['sale_time'].isoformat()}|{row['line_id']}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_samples_cursor(cursor: Optional[str]) -> dict:
+    """{"after_time": datetime, "after_id": int} for a token, both None without one."""
+    if not cursor:
+        return {"after_time": None, "after_id": None}
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        sale_time, line_id = raw.split("|")
+        return {"after_time": datetime.fromisoformat(sale_time), "after_id": int(line_id)}
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def samples_page(rows, limit: int):
+    """(page, next_cursor) from limit + 1 fetched rows; next_cursor is None on the last page."""
+    if len(rows) > limit:
+        return rows[:limit], encode_samples_cursor(rows[limit - 1])
+    return rows, None
+
+
+def range_rows_response(
+    start_date, end_date, key: str, rows, fmt: str = "rows", numbers: str = "float", **extra
+) -> dict:
+    """Payload of the row-list reports: the range, any extra fields, then the rows under key."""
+    return {"start_date": start_date, "end_date": end_date, **extra, key: shape_rows(rows, fmt, numbers)}
+
+
+def data_quality_response(summary, samples, tol: float, limit: int) -> dict:
+    """/reports/data-quality payload."""
+    return {
+        "status": data_quality_status(summary),
+        "summary": dict(summary) if summary else None,
+        "samples": list(samples),
+        "notes": data_quality_notes(tol, limit),
+    }
+
+
+def data_quality_samples_response(
+    start_date, end_date, tol: float, limit: int, rows, fmt: str = "rows", numbers: str = "float"
+) -> dict:
+    """/reports/data-quality-samples payload from limit + 1 fetched rows (see samples_page())."""
+    rows, next_cursor = samples_page(rows, limit)
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "tol": tol,
+        "limit": limit,
+        "count": len(rows),
+        "samples": shape_rows(rows, fmt, numbers),
+        "next_cursor": next_cursor,
+    }
+
+
 # =========================
-# Seller Ranking
+# Report definitions (shared with app/routers/reports_async.py)
+# Each returns (queries, respond): queries maps a name to (sql, params) and
+# respond({name: rows}) builds the endpoint's payload. Sync handlers run the
+# queries on their request connection (run_report), the async ones side by
+# side on the asyncpg engine.
 # =========================
 
-@router.get("/seller-ranking")
-def seller_ranking(
-    start_date: str = Query(..., description="YYYY-MM-DD"),
-    end_date: str = Query(..., description="YYYY-MM-DD"),
-):
-    engine = get_engine()
+def weekly_summary_report(start_date, end_date) -> tuple:
+    params = {"start_date": start_date, "end_date": end_date}
+
+    def respond(results):
+        rows = results["summary"]
+        return dict(rows[0]) if rows else empty_weekly_summary(start_date, end_date)
+
+    return {"summary": (report_sql(SQL_WEEKLY_SUMMARY), params)}, respond
+
+
+def seller_ranking_report(start_date, end_date, fmt: str = "rows", numbers: str = "float") -> tuple:
+    params = {"start_date": start_date, "end_date": end_date}
+
+    def respond(results):
+        return range_rows_response(start_date, end_date, "sellers", results["sellers"], fmt, numbers)
+
+    return {"sellers": (report_sql(SQL_SELLER_RANKING), params)}, respond
+
+
+def top_products_report(start_date, end_date, limit: int, fmt: str = "rows", numbers: str = "float") -> tuple:
+    params = {"start_date": start_date, "end_date": end_date, "limit": limit}
+
+    def respond(results):
+        return range_rows_response(start_date, end_date, "top_products", results["products"], fmt, numbers, limit=limit)
+
+    return {"products": (report_sql(SQL_TOP_PRODUCTS), params)}, respond
+
+
+def shipping_breakdown_report(start_date, end_date, fmt: str = "rows", numbers: str = "float") -> tuple:
     params = {"start_date": start_date, "end_date": end_date}
 
-    with engine.connect() as conn:
-        rows = conn.execute(text(SQL_SELLER_RANKING), params).mappings().all()
+    def respond(results):
+        return range_rows_response(start_date, end_date, "shipping_companies", results["shipping"], fmt, numbers)
+
+    return {"shipping": (report_sql(SQL_SHIPPING), params)}, respond
+
+
+def data_quality_report(start_date, end_date, tol: float, limit: int) -> tuple:
+    params = {"start_date": start_date, "end_date": end_date, "tol": tol}
+
+    def respond(results):
+        summary = results["summary"][0] if results["summary"] else None
+        return data_quality_response(summary, results["samples"], tol, limit)
 
     return {
+        "summary": (dq_summary_sql(tol), params),
+        "samples": (SQL_DATA_QUALITY_SAMPLES, {**params, **decode_samples_cursor(None), "limit": limit}),
+    }, respond
+
+
+def data_quality_samples_report(
+    start_date, end_date, tol: float, limit: int, cursor, fmt: str = "rows", numbers: str = "float"
+) -> tuple:
+    params = {
         "start_date": start_date,
         "end_date": end_date,
-        "sellers": list(rows)
+        "tol": tol,
+        **decode_samples_cursor(cursor),
+        "limit": limit + 1,
     }
 
+    def respond(results):
+        return data_quality_samples_response(start_date, end_date, tol, limit, results["samples"], fmt, numbers)
+
+    return {"samples": (SQL_DATA_QUALITY_SAMPLES, params)}, respond
+
+
+def run_report(conn, report: tuple):
+    """Payload of a report definition, its queries run one after another on conn."""
+    queries, respond = report
+    return respond({name: fetch_all(conn, sql, params) for name, (sql, params) in queries.items()})
+
+
+# =========================
+# Weekly Summary
+# =========================
+
+@router.get("/weekly-summary")
+def weekly_summary(
+    request: Request,
+    start_date: str = Query(..., description="YYYY-MM-DD"),
+    end_date: str = Query(..., description="YYYY-MM-DD"),
+    conn=Depends(get_db),
+):
+    params = {"start_date": start_date, "end_date": end_date}
+    report = weekly_summary_report(start_date, end_date)
+    return cached_report(request, conn, "weekly-summary", params, lambda: run_report(conn, report))
+
+
+# =========================
+# Seller Ranking
+# =========================
+
+@router.get("/seller-ranking")
+def seller_ranking(
+    request: Request,
+    start_date: str = Query(..., description="YYYY-MM-DD"),
+    end_date: str = Query(..., description="YYYY-MM-DD"),
+    fmt: str = Query("rows", alias="format", description="rows (one object per row) or columnar"),
+    numbers: str = Query("float", description="columnar decimals as float or scaled integers"),
+    conn=Depends(get_db),
+):
+    check_row_format(fmt, numbers)
+    params = {"start_date": start_date, "end_date": end_date, "format": fmt, "numbers": numbers}
+    report = seller_ranking_report(start_date, end_date, fmt, numbers)
+    return cached_report(request, conn, "seller-ranking", params, lambda: run_report(conn, report))
+
 
 # =========================
 # Top Products
@@ -66,22 +336,18 @@ def seller_ranking(
 
 @router.get("/top-products")
 def top_products(
+    request: Request,
     start_date: str = Query(..., description="YYYY-MM-DD"),
     end_date: str = Query(..., description="YYYY-MM-DD"),
     limit: int = Query(12, ge=1, le=50, description="Max number of products"),
+    fmt: str = Query("rows", alias="format", description="rows (one object per row) or columnar"),
+    numbers: str = Query("float", description="columnar decimals as float or scaled integers"),
+    conn=Depends(get_db),
 ):
-    engine = get_engine()
-    params = {"start_date": start_date, "end_date": end_date, "limit": limit}
-
-    with engine.connect() as conn:
-        rows = conn.execute(text(SQL_TOP_PRODUCTS), params).mappings().all()
-
-    return {
-        "start_date": start_date,
-        "end_date": end_date,
-        "limit": limit,
-        "top_products": list(rows)
-    }
+    check_row_format(fmt, numbers)
+    params = {"start_date": start_date, "end_date": end_date, "limit": limit, "format": fmt, "numbers": numbers}
+    report = top_products_report(start_date, end_date, limit, fmt, numbers)
+    return cached_report(request, conn, "top-products", params, lambda: run_report(conn, report))
 
 
 # =========================
@@ -90,21 +356,171 @@ def top_products(
 
 @router.get("/shipping-breakdown")
 def shipping_breakdown(
+    request: Request,
     start_date: str = Query(..., description="YYYY-MM-DD"),
     end_date: str = Query(..., description="YYYY-MM-DD"),
+    fmt: str = Query("rows", alias="format", description="rows (one object per row) or columnar"),
+    numbers: str = Query("float", description="columnar decimals as float or scaled integers"),
+    conn=Depends(get_db),
 ):
-    engine = get_engine()
+    check_row_format(fmt, numbers)
+    params = {"start_date": start_date, "end_date": end_date, "format": fmt, "numbers": numbers}
+    report = shipping_breakdown_report(start_date, end_date, fmt, numbers)
+    return cached_report(request, conn, "shipping-breakdown", params, lambda: run_report(conn, report))
+
+
+# =========================
+# Trends (agg_daily_totals / agg_weekly_totals)
+# =========================
+
+@router.get("/daily-trend")
+def daily_trend(
+    request: Request,
+    start_date: str = Query(..., description="YYYY-MM-DD"),
+    end_date: str = Query(..., description="YYYY-MM-DD"),
+    fmt: str = Query("rows", alias="format", description="rows (one object per row) or columnar"),
+    numbers: str = Query("float", description="columnar decimals as float or scaled integers"),
+    conn=Depends(get_db),
+):
+    check_row_format(fmt, numbers)
     params = {"start_date": start_date, "end_date": end_date}
 
-    with engine.connect() as conn:
-        rows = conn.execute(text(SQL_SHIPPING), params).mappings().all()
+    def build():
+        rows = fetch_all(conn, SQL_DAILY_TREND, params)
+        return range_rows_response(start_date, end_date, "days", rows, fmt, numbers)
 
-    return {
+    return cached_report(request, conn, "daily-trend", {**params, "format": fmt, "numbers": numbers}, build)
+
+
+@router.get("/weekly-trend")
+def weekly_trend(
+    request: Request,
+    start_date: str = Query(..., description="YYYY-MM-DD"),
+    end_date: str = Query(..., description="YYYY-MM-DD"),
+    fmt: str = Query("rows", alias="format", description="rows (one object per row) or columnar"),
+    numbers: str = Query("float", description="columnar decimals as float or scaled integers"),
+    conn=Depends(get_db),
+):
+    """Weeks (Monday start) overlapping the range; totals cover the whole week."""
+    check_row_format(fmt, numbers)
+    params = {"start_date": start_date, "end_date": end_date}
+
+    def build():
+        rows = fetch_all(conn, SQL_WEEKLY_TREND, params)
+        return range_rows_response(start_date, end_date, "weeks", rows, fmt, numbers)
+
+    return cached_report(request, conn, "weekly-trend", {**params, "format": fmt, "numbers": numbers}, build)
+
+
+@router.get("/timeseries")
+def timeseries(
+    request: Request,
+    start_date: str = Query(..., description="YYYY-MM-DD"),
+    end_date: str = Query(..., description="YYYY-MM-DD"),
+    granularity: str = Query("week", description="day, week or month"),
+    seller: Optional[str] = Query(None, description="Only this seller_name"),
+    product: Optional[str] = Query(None, description="Only this product_code"),
+    shipping: Optional[str] = Query(None, description="Only this shipping company"),
+    fmt: str = Query("rows", alias="format", description="rows (one object per row) or columnar"),
+    numbers: str = Query("float", description="columnar decimals as float or scaled integers"),
+    conn=Depends(get_db),
+):
+    """
+    Revenue, units and line_count per day/week/month bucket overlapping the
+    range (whole buckets, empty ones as zeros), each with the previous bucket
+    and the same bucket last year. One query over agg_daily_sales.
+    """
+    if granularity not in TIMESERIES_YEAR_STEPS:
+        raise HTTPException(status_code=422, detail="granularity must be day, week or month")
+    check_row_format(fmt, numbers)
+    params = {
         "start_date": start_date,
         "end_date": end_date,
-        "shipping_companies": list(rows)
+        "granularity": granularity,
+        "year_step": TIMESERIES_YEAR_STEPS[granularity],
+        "seller": seller,
+        "product": product,
+        "shipping": shipping,
     }
 
+    def build():
+        t0 = time.perf_counter()
+        rows = fetch_all(conn, SQL_TIMESERIES, params)
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "granularity": granularity,
+            "filters": {"seller": seller, "product": product, "shipping": shipping},
+            "buckets": shape_rows(rows, fmt, numbers),
+            # Time to build this payload; a cached response repeats it
+            "timing_ms": {"sql": round((time.perf_counter() - t0) * 1000, 1)},
+        }
+
+    return cached_report(request, conn, "timeseries", {**params, "format": fmt, "numbers": numbers}, build)
+
+
+# =========================
+# Pivot / drilldown
+# =========================
+
+@router.get("/pivot")
+def pivot(
+    request: Request,
+    start_date: str = Query(..., description="YYYY-MM-DD"),
+    end_date: str = Query(..., description="YYYY-MM-DD"),
+    dims: Optional[str] = Query(None, description="Comma-separated: sale_date, seller, product, shipping_company"),
+    measures: Optional[str] = Query(
+        None,
+        description="Comma-separated: revenue, units, line_count, avg_price, avg_line_total, "
+                    "max_line_total, max_unit_price, min_unit_price (default revenue,units,line_count)"
+    ),
+    seller: Optional[List[str]] = Query(None, description="Only these seller_names"),
+    product: Optional[List[str]] = Query(None, description="Only these product_codes"),
+    shipping_company: Optional[List[str]] = Query(None, description="Only these shipping companies"),
+    sort: Optional[str] = Query(None, description="Output column, '-' prefix for descending (default -revenue)"),
+    limit: int = Query(100, ge=1, le=10_000, description="Top N groups"),
+    fmt: str = Query("rows", alias="format", description="rows (one object per row) or columnar"),
+    numbers: str = Query("float", description="columnar decimals as float or scaled integers"),
+    conn=Depends(get_db),
+):
+    """
+    Measures grouped by any subset of dimensions. The planner answers from
+    the cheapest source that has the requested dimensions, filters and
+    measures (agg_daily_sales, then fact_sales_line);
+    the chosen source and SQL are returned under "debug".
+    """
+    filters = {
+        "seller": parse_list(seller),
+        "product": parse_list(product),
+        "shipping_company": parse_list(shipping_company),
+    }
+    try:
+        plan = plan_pivot(parse_list(dims), parse_list(measures), filters, sort, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    check_row_format(fmt, numbers)
+    params = {"start_date": start_date, "end_date": end_date, **plan["params"]}
+
+    def build():
+        t0 = time.perf_counter()
+        rows = fetch_all(conn, plan["sql"], params, name=f"pivot:{plan['source']}")
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "dimensions": plan["dimensions"],
+            "measures": plan["measures"],
+            "rows": shape_rows(rows, fmt, numbers),
+            "debug": {
+                "source": plan["source"],
+                "skipped_sources": plan["skipped"],
+                "sort": plan["sort"],
+                "sql": plan["sql"],
+                "sql_ms": round((time.perf_counter() - t0) * 1000, 1),
+            },
+        }
+
+    return cached_report(request, conn, "pivot", {"sql": plan["sql"], **params, "format": fmt, "numbers": numbers}, build)
+
 
 # =========================
 # Data Quality (Validation + Troubleshooting)
@@ -112,68 +528,162 @@ def shipping_breakdown(
 
 @router.get("/data-quality")
 def data_quality(
+    request: Request,
     start_date: str = Query(..., description="YYYY-MM-DD"),
     end_date: str = Query(..., description="YYYY-MM-DD"),
     tol: float = Query(0.05, ge=0.0, le=5.0, description="Mismatch tolerance in dollars"),
-    limit: int = Query(20, ge=1, le=200, description="Max sample rows returned"),
+    limit: int = Query(DQ_SAMPLE_LIMIT, ge=1, le=200, description="Max sample rows returned"),
+    conn=Depends(get_db),
 ):
-    engine = get_engine()
-    params = {"start_date": start_date, "end_date": end_date, "tol": tol}
-
-    with engine.connect() as conn:
-        summary = conn.execute(text(SQL_DATA_QUALITY_SUMMARY), params).mappings().first()
-        samples = conn.execute(
-            text(SQL_DATA_QUALITY_SAMPLES),
-            {**params, "limit": limit}
-        ).mappings().all()
-
-    status = "ok"
-    if summary:
-        if (
-            summary["mismatched_total_count"] > 0
-            or summary["nonpositive_units_count"] > 0
-            or summary["negative_amount_count"] > 0
-        ):
-            status = "warn"
-
-    return {
-        "status": status,
-        "summary": dict(summary) if summary else None,
-        "samples": list(samples),
-        "notes": {
-            "mismatch_rule": f"abs(line_total - round(unit_price*units,2)) > {tol}",
-            "sample_limit": limit,
-        },
-    }
+    params = {"start_date": start_date, "end_date": end_date, "tol": tol, "limit": limit}
+    report = data_quality_report(start_date, end_date, tol, limit)
+    return cached_report(request, conn, "data-quality", params, lambda: run_report(conn, report))
 
 @router.get("/data-quality-samples")
 def data_quality_samples(
+    request: Request,
     start_date: str = Query(..., description="YYYY-MM-DD"),
     end_date: str = Query(..., description="YYYY-MM-DD"),
     tol: float = Query(0.05, ge=0, description="Tolerance for total mismatch"),
-    limit: int = Query(20, ge=1, le=200),
+    limit: int = Query(DQ_SAMPLE_LIMIT, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    fmt: str = Query("rows", alias="format", description="rows (one object per row) or columnar"),
+    numbers: str = Query("float", description="columnar decimals as float or scaled integers"),
+    conn=Depends(get_db),
 ):
-    engine = get_engine()
-    params = {"start_date": start_date, "end_date": end_date, "tol": tol, "limit": limit}
+    """
+    Anomalous lines in (sale_time, line_id) order, one page at a time. Pass
+    the returned next_cursor to get the rows after this page; it is null on
+    the last page. Each page reads only its own rows from idx_fact_dq_anomaly.
+    """
+    check_row_format(fmt, numbers)
+    params = {"start_date": start_date, "end_date": end_date, "tol": tol, "limit": limit, "cursor": cursor}
+    report = data_quality_samples_report(start_date, end_date, tol, limit, cursor, fmt, numbers)
+    cache_params = {**params, "format": fmt, "numbers": numbers}
+    return cached_report(request, conn, "data-quality-samples", cache_params, lambda: run_report(conn, report))
 
-    with engine.connect() as conn:
-        rows = conn.execute(text(SQL_DATA_QUALITY_SAMPLES), params).mappings().all()
 
-    # 把 datetime/date 转成字符串，避免 JSON 序列化问题
-    samples = []
-    for r in rows:
-        d = dict(r)
-        if d.get("sale_time") is not None:
-            d["sale_time"] = d["sale_time"].isoformat()
-        if d.get("sale_date") is not None:
-            d["sale_date"] = d["sale_date"].isoformat()
-        samples.append(d)
+# =========================
+# Dashboard (all panels in one response)
+# =========================
 
-    return {
-        "start_date": start_date,
-        "end_date": end_date,
-        "tol": tol,
-        "limit": limit,
-        "count": len(samples),
-        "samples": samples,
-    }
\ No newline at end of file
+@router.get("/dashboard")
+def dashboard(
+    request: Request,
+    start_date: str = Query(..., description="YYYY-MM-DD"),
+    end_date: str = Query(..., description="YYYY-MM-DD"),
+    limit: int = Query(12, ge=1, le=50, description="Max number of products"),
+    tol: float = Query(0.05, ge=0.0, le=5.0, description="Mismatch tolerance in dollars"),
+    sample_limit: int = Query(DQ_SAMPLE_LIMIT, ge=1, le=200, description="Max sample rows returned"),
+    conn=Depends(get_db),
+):
+    """
+    Same payloads as weekly-summary, seller-ranking, top-products,
+    shipping-breakdown, data-quality (default limit) and data-quality-samples
+    (limit=sample_limit), keyed by endpoint name, each built by the helper
+    its endpoint uses. The four sales panels come from one GROUPING SETS scan.
+    """
+    params = {"start_date": start_date, "end_date": end_date}
+    dq_params = {**params, "tol": tol}
+
+    def build():
+        agg_rows = fetch_all(conn, report_sql(SQL_DASHBOARD_AGGREGATES), params)
+        dq_summary = fetch_first(conn, dq_summary_sql(tol), dq_params)
+        # One keyset read serves both panels: each takes its own prefix, plus
+        # the extra row the samples page needs for next_cursor
+        dq_rows = fetch_all(conn, SQL_DATA_QUALITY_SAMPLES, {
+            **dq_params, **decode_samples_cursor(None), "limit": max(DQ_SAMPLE_LIMIT, sample_limit + 1),
+        })
+
+        panels = split_dashboard_aggregates(agg_rows, limit)
+
+        return {
+            "weekly_summary": panels["summary"] or empty_weekly_summary(start_date, end_date),
+            "seller_ranking": range_rows_response(start_date, end_date, "sellers", panels["sellers"]),
+            "top_products": range_rows_response(
+                start_date, end_date, "top_products", panels["top_products"], limit=limit
+            ),
+            "shipping_breakdown": range_rows_response(
+                start_date, end_date, "shipping_companies", panels["shipping_companies"]
+            ),
+            "data_quality": data_quality_response(dq_summary, dq_rows[:DQ_SAMPLE_LIMIT], tol, DQ_SAMPLE_LIMIT),
+            "data_quality_samples": data_quality_samples_response(
+                start_date, end_date, tol, sample_limit, dq_rows[:sample_limit + 1]
+            ),
+        }
+
+    cache_params = {**dq_params, "limit": limit, "sample_limit": sample_limit}
+    return cached_report(request, conn, "dashboard", cache_params, build)
+
+
+# =========================
+# Export (line-level, streamed)
+# =========================
+
+def iter_export_chunks(engine, params: dict, fmt: str, fetch_rows: int):
+    """
+    Encoded export body, one chunk per cursor fetch. Uses its own connection:
+    the response body is produced after the handler (and its dependencies)
+    have returned, so its connect/sql/encode time is recorded here once the
+    body is done (or the client goes away) instead of by the middleware.
+    """
+    stages = {"connect": 0.0, "sql": 0.0, "encode": 0.0}
+    rows_sent = 0
+    if fmt == "csv":
+        buf = io.StringIO()
+        csv.writer(buf).writerow(EXPORT_COLUMNS)
+        yield buf.getvalue().encode("utf-8")
+
+    t0 = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            stages["connect"] = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            # yield_per -> named (server-side) cursor on psycopg2, fetching fetch_rows at a time
+            result = conn.execution_options(yield_per=fetch_rows).execute(text(SQL_EXPORT_LINES), params)
+            partitions = result.partitions()
+            while True:
+                rows = next(partitions, None)
+                t1 = time.perf_counter()
+                stages["sql"] += t1 - t0
+                if rows is None:
+                    break
+                if fmt == "csv":
+                    buf = io.StringIO()
+                    csv.writer(buf).writerows(rows)
+                    chunk = buf.getvalue().encode("utf-8")
+                else:
+                    chunk = b"".join(encode_json(dict(zip(EXPORT_COLUMNS, r))) + b"\n" for r in rows)
+                rows_sent += len(rows)
+                stages["encode"] += time.perf_counter() - t1
+                yield chunk
+                t0 = time.perf_counter()
+    finally:
+        record_streamed_query("/reports/export", SQL_EXPORT_LINES, params, stages, rows_sent)
+
+
+@router.get("/export")
+def export_lines(
+    request: Request,
+    # Parsed as dates: both end up in the Content-Disposition header
+    start_date: date = Query(..., description="YYYY-MM-DD"),
+    end_date: date = Query(..., description="YYYY-MM-DD"),
+    fmt: str = Query("ndjson", alias="format", description="ndjson or csv"),
+    seller: Optional[str] = Query(None, description="Only this seller_name"),
+    product: Optional[str] = Query(None, description="Only this product_code"),
+):
+    """
+    Every fact line in the range (with product/seller/shipping names), ordered
+    by sale_date, line_id. Streamed from a server-side cursor, so memory use
+    does not depend on the number of rows.
+    """
+    if fmt not in ("ndjson", "csv"):
+        raise HTTPException(status_code=422, detail="format must be ndjson or csv")
+    params = {"start_date": start_date, "end_date": end_date, "seller": seller, "product": product}
+    media_type = "text/csv; charset=utf-8" if fmt == "csv" else "application/x-ndjson"
+    filename = f"sales_lines_{start_date}_to_{end_date}.{fmt}"
+    return StreamingResponse(
+        iter_export_chunks(request.app.state.engine, params, fmt, EXPORT_FETCH_ROWS),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,127 @@
+import asyncio
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import Response
+from app.cache import timed_build, timed_encode
+from app.db import get_async_db_engine
+from app.metrics import fetch_all_async
+from app.routers.reports import (
+    DQ_SAMPLE_LIMIT,
+    check_row_format,
+    data_quality_report,
+    data_quality_samples_report,
+    seller_ranking_report,
+    shipping_breakdown_report,
+    top_products_report,
+    weekly_summary_report,
+)
+
+# Same endpoints, queries and payloads as app/routers/reports.py (built by its
+# *_report definitions), served on the asyncpg engine without the report cache.
+# Enabled with DB_ASYNC=true.
+router = APIRouter(prefix="/async/reports", tags=["reports (async)"])
+
+
+async def run_report_async(engine, report: tuple) -> Response:
+    """A report definition's queries run concurrently, its payload encoded like the sync endpoints'."""
+    queries, respond = report
+    names = list(queries)
+    results = await asyncio.gather(*(fetch_all_async(engine, *queries[name]) for name in names))
+    payload = timed_build(lambda: respond(dict(zip(names, results))))
+    return Response(timed_encode(payload), media_type="application/json")
+
+
+# =========================
+# Weekly Summary
+# =========================
+
+@router.get("/weekly-summary")
+async def weekly_summary(
+    start_date: date = Query(..., description="YYYY-MM-DD"),
+    end_date: date = Query(..., description="YYYY-MM-DD"),
+    engine=Depends(get_async_db_engine),
+):
+    return await run_report_async(engine, weekly_summary_report(start_date, end_date))
+
+
+# =========================
+# Seller Ranking
+# =========================
+
+@router.get("/seller-ranking")
+async def seller_ranking(
+    start_date: date = Query(..., description="YYYY-MM-DD"),
+    end_date: date = Query(..., description="YYYY-MM-DD"),
+    fmt: str = Query("rows", alias="format", description="rows (one object per row) or columnar"),
+    numbers: str = Query("float", description="columnar decimals as float or scaled integers"),
+    engine=Depends(get_async_db_engine),
+):
+    check_row_format(fmt, numbers)
+    return await run_report_async(engine, seller_ranking_report(start_date, end_date, fmt, numbers))
+
+
+# =========================
+# Top Products
+# =========================
+
+@router.get("/top-products")
+async def top_products(
+    start_date: date = Query(..., description="YYYY-MM-DD"),
+    end_date: date = Query(..., description="YYYY-MM-DD"),
+    limit: int = Query(12, ge=1, le=50, description="Max number of products"),
+    fmt: str = Query("rows", alias="format", description="rows (one object per row) or columnar"),
+    numbers: str = Query("float", description="columnar decimals as float or scaled integers"),
+    engine=Depends(get_async_db_engine),
+):
+    check_row_format(fmt, numbers)
+    return await run_report_async(engine, top_products_report(start_date, end_date, limit, fmt, numbers))
+
+
+# =========================
+# Shipping Breakdown
+# =========================
+
+@router.get("/shipping-breakdown")
+async def shipping_breakdown(
+    start_date: date = Query(..., description="YYYY-MM-DD"),
+    end_date: date = Query(..., description="YYYY-MM-DD"),
+    fmt: str = Query("rows", alias="format", description="rows (one object per row) or columnar"),
+    numbers: str = Query("float", description="columnar decimals as float or scaled integers"),
+    engine=Depends(get_async_db_engine),
+):
+    check_row_format(fmt, numbers)
+    return await run_report_async(engine, shipping_breakdown_report(start_date, end_date, fmt, numbers))
+
+
+# =========================
+# Data Quality (Validation + Troubleshooting)
+# =========================
+
+@router.get("/data-quality")
+async def data_quality(
+    start_date: date = Query(..., description="YYYY-MM-DD"),
+    end_date: date = Query(..., description="YYYY-MM-DD"),
+    tol: float = Query(0.05, ge=0.0, le=5.0, description="Mismatch tolerance in dollars"),
+    limit: int = Query(DQ_SAMPLE_LIMIT, ge=1, le=200, description="Max sample rows returned"),
+    engine=Depends(get_async_db_engine),
+):
+    # Summary and samples are independent: run_report_async runs them side by side
+    return await run_report_async(engine, data_quality_report(start_date, end_date, tol, limit))
+
+
+@router.get("/data-quality-samples")
+async def data_quality_samples(
+    start_date: date = Query(..., description="YYYY-MM-DD"),
+    end_date: date = Query(..., description="YYYY-MM-DD"),
+    tol: float = Query(0.05, ge=0, description="Tolerance for total mismatch"),
+    limit: int = Query(DQ_SAMPLE_LIMIT, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    fmt: str = Query("rows", alias="format", description="rows (one object per row) or columnar"),
+    numbers: str = Query("float", description="columnar decimals as float or scaled integers"),
+    engine=Depends(get_async_db_engine),
+):
+    check_row_format(fmt, numbers)
+    report = data_quality_samples_report(start_date, end_date, tol, limit, cursor, fmt, numbers)
+    return await run_report_async(engine, report)
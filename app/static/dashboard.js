@@ -1,10 +1,36 @@
+// url -> { etag, data } of the last 200 response, for If-None-Match revalidation.
+// LRU: a Map iterates in insertion order, so hits are re-inserted and the
+// first key is the least recently used.
+const ETAG_CACHE_MAX = 20;
+const etagCache = new Map();
+let lastFetchNotModified = false;
+
+function etagCacheSet(url, entry) {
+  etagCache.delete(url);
+  etagCache.set(url, entry);
+  while (etagCache.size > ETAG_CACHE_MAX) {
+    etagCache.delete(etagCache.keys().next().value);
+  }
+}
+
 async function fetchJson(url) {
-  const res = await fetch(url);
+  const cached = etagCache.get(url);
+  const headers = cached ? { "If-None-Match": cached.etag } : {};
+  const res = await fetch(url, { headers });
+  if (res.status === 304 && cached) {
+    etagCacheSet(url, cached);
+    lastFetchNotModified = true;
+    return cached.data;
+  }
   if (!res.ok) {
     const text = await res.text();
     throw new Error(`${res.status} ${res.statusText}: ${text}`);
   }
-  return await res.json();
+  const data = await res.json();
+  const etag = res.headers.get("ETag");
+  if (etag) etagCacheSet(url, { etag, data });
+  lastFetchNotModified = false;
+  return data;
 }
 
 function money(x) {
@@ -57,26 +83,15 @@ async function loadAll() {
   setStatus("Loading...");
 
   try {
-    // Your existing APIs
+    // One round trip for every panel
     const q = `start_date=${encodeURIComponent(start)}&end_date=${encodeURIComponent(end)}`;
-    const weekly = await fetchJson(`/reports/weekly-summary?${q}`);
-    const sellers = await fetchJson(`/reports/seller-ranking?${q}`);
-    const topProducts = await fetchJson(`/reports/top-products?${q}&limit=${limit}`);
-    const shipping = await fetchJson(`/reports/shipping-breakdown?${q}`);
-
-    // If you have these endpoints, use them; otherwise you can skip/adjust
-    let dq = null;
-    let dqSamples = null;
-    try {
-      dq = await fetchJson(`/reports/data-quality?${q}&tol=${tol}`);
-    } catch (e) {
-      dq = { error: String(e) };
-    }
-    try {
-      dqSamples = await fetchJson(`/reports/data-quality-samples?${q}&tol=${tol}&limit=${Math.min(50, limit)}`);
-    } catch (e) {
-      dqSamples = { error: String(e) };
-    }
+    const all = await fetchJson(`/reports/dashboard?${q}&limit=${limit}&tol=${tol}&sample_limit=${Math.min(50, limit)}`);
+    const weekly = all.weekly_summary;
+    const sellers = all.seller_ranking;
+    const topProducts = all.top_products;
+    const shipping = all.shipping_breakdown;
+    const dq = all.data_quality;
+    const dqSamples = all.data_quality_samples;
 
     // Weekly summary
     document.getElementById("weeklySummary").innerHTML = `
@@ -109,14 +124,15 @@ async function loadAll() {
 
     // Data quality summary
     if (dq && !dq.error) {
-      const status = (dq.mismatched_total_count || dq.negative_amount_count || dq.nonpositive_units_count) ? "WARN" : "OK";
+      const dqs = dq.summary || {};
+      const status = dq.status === "warn" ? "WARN" : "OK";
       document.getElementById("dqSummary").innerHTML = `
         <div>Status: <span class="${status === "OK" ? "ok" : "bad"}">${status}</span></div>
-        <div><b>Rows</b>: ${Number(dq.rows_in_range || 0).toLocaleString()}</div>
-        <div><b>Mismatched totals</b>: ${Number(dq.mismatched_total_count || 0).toLocaleString()}</div>
-        <div><b>Non-positive units</b>: ${Number(dq.nonpositive_units_count || 0).toLocaleString()}</div>
-        <div><b>Negative amounts</b>: ${Number(dq.negative_amount_count || 0).toLocaleString()}</div>
-        <div><b>Missing shipping</b>: ${Number(dq.missing_shipping_company_count || 0).toLocaleString()}</div>
+        <div><b>Rows</b>: ${Number(dqs.rows_in_range || 0).toLocaleString()}</div>
+        <div><b>Mismatched totals</b>: ${Number(dqs.mismatched_total_count || 0).toLocaleString()}</div>
+        <div><b>Non-positive units</b>: ${Number(dqs.nonpositive_units_count || 0).toLocaleString()}</div>
+        <div><b>Negative amounts</b>: ${Number(dqs.negative_amount_count || 0).toLocaleString()}</div>
+        <div><b>Missing shipping</b>: ${Number(dqs.missing_shipping_company_count || 0).toLocaleString()}</div>
       `;
     } else {
       document.getElementById("dqSummary").innerHTML = `<div class="bad">DQ endpoint error</div><div class="muted">${dq?.error || ""}</div>`;
@@ -137,7 +153,7 @@ async function loadAll() {
       document.getElementById("dqSamples").innerHTML = `<div class="bad">DQ samples endpoint not available</div><div class="muted">${dqSamples?.error || ""}</div>`;
     }
 
-    setStatus("Loaded.");
+    setStatus(lastFetchNotModified ? "Loaded (not modified since last load)." : "Loaded.");
   } catch (err) {
     setStatus(String(err), true);
   } finally {
@@ -0,0 +1,69 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare two benchmarks.suite result files and flag regressions")
+    parser.add_argument("baseline", help="Earlier result JSON")
+    parser.add_argument("candidate", help="Newer result JSON")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative change that counts as a regression (default 0.10 = 10%%)"
+    )
+    return parser.parse_args()
+
+
+def flatten(result: dict) -> dict:
+    """{metric name: (value, higher_is_better)} for every comparable number in a result file."""
+    metrics = {}
+    ingest = result.get("ingest")
+    if ingest and ingest.get("rows_per_sec"):
+        metrics["ingest.rows_per_sec"] = (ingest["rows_per_sec"], True)
+        metrics["ingest.view_refresh_seconds"] = (ingest["view_refresh_seconds"], False)
+    for r in result.get("endpoints") or []:
+        key = f"{r['endpoint']}[{r['width_days']}d,c={r['clients']}]"
+        metrics[f"{key}.p50_ms"] = (r["p50_ms"], False)
+        metrics[f"{key}.p99_ms"] = (r["p99_ms"], False)
+    for r in result.get("weekly_report") or []:
+        if r["ok"]:
+            metrics[f"weekly_report[{r['width_days']}d].seconds"] = (r["seconds"], False)
+    return metrics
+
+
+def main():
+    args = parse_args()
+    with open(Path(args.baseline), encoding="utf-8") as f:
+        base = flatten(json.load(f))
+    with open(Path(args.candidate), encoding="utf-8") as f:
+        cand = flatten(json.load(f))
+
+    regressions = 0
+    print(f"{'metric':<52} {'baseline':>12} {'candidate':>12} {'change':>8}")
+    for name in sorted(base.keys() & cand.keys()):
+        old, higher_is_better = base[name]
+        new, _ = cand[name]
+        if not old:
+            continue
+        change = (new - old) / old
+        worse = -change if higher_is_better else change
+        flag = ""
+        if worse > args.threshold:
+            regressions += 1
+            flag = "  ❌"
+        print(f"{name:<52} {old:>12.1f} {new:>12.1f} {change:>+7.0%}{flag}")
+
+    missing = sorted(base.keys() - cand.keys())
+    if missing:
+        print(f"\n{len(missing)} metric(s) only in the baseline: {', '.join(missing[:10])}")
+    if regressions:
+        print(f"\n{regressions} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+    print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import argparse
+import gzip
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+
+# Ensure project root is on sys.path so "import app" works
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+from app.cache import encode_json, orjson
+from app.routers.reports import columnar
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Encode time and payload size of report rows: jsonable_encoder + json (the old path) "
+                    "vs encode_json rows vs columnar (float / scaled)"
+    )
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5, help="Best of N runs per variant")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--start", dest="start_date", help="Use real export lines from the database starting here")
+    parser.add_argument("--end", dest="end_date", help="Range end for --start (YYYY-MM-DD)")
+    parser.add_argument("--out", help="Also write the results as JSON")
+    return parser.parse_args()
+
+
+def synthetic_rows(n: int, seed: int) -> list:
+    """Rows shaped like /reports/export lines: ids, names, timestamps and NUMERIC(12,2) values."""
+    rng = random.Random(seed)
+    t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for i in range(n):
+        sale_time = t0 + timedelta(seconds=rng.randrange(365 * 86400))
+        unit_price = Decimal(rng.randrange(100, 50_000)).scaleb(-2)
+        units = Decimal(rng.randrange(1, 20)).quantize(Decimal("0.01"))
+        rows.append({
+            "line_id": i + 1,
+            "sale_time": sale_time,
+            "sale_date": sale_time.date(),
+            "product_code": f"P{rng.randrange(2000):06d}",
+            "seller_name": f"Seller {rng.randrange(80):04d}",
+            "shipping_company": rng.choice(["UPS", "FedEx", "DHL", None]),
+            "unit_price": unit_price,
+            "units": units,
+            "line_total": (unit_price * units).quantize(Decimal("0.01")),
+        })
+    return rows
+
+
+def database_rows(start_date: str, end_date: str, n: int) -> list:
+    from sqlalchemy import text
+
+    from app.db import get_engine
+    from app.queries.report_queries import SQL_EXPORT_LINES
+
+    params = {"start_date": start_date, "end_date": end_date or start_date, "seller": None, "product": None}
+    with get_engine().connect() as conn:
+        return conn.execute(text(SQL_EXPORT_LINES), params).mappings().fetchmany(n)
+
+
+def old_encode(payload) -> bytes:
+    # What cached_report sent before encode_json learned Decimal/datetime
+    return json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def best_ms(fn, repeat: int):
+    best = None
+    body = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        body = fn()
+        elapsed = (time.perf_counter() - t0) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, body
+
+
+def main():
+    args = parse_args()
+    if args.start_date:
+        rows = database_rows(args.start_date, args.end_date, args.rows)
+        source = f"export lines {args.start_date} ~ {args.end_date or args.start_date}"
+    else:
+        rows = synthetic_rows(args.rows, args.seed)
+        source = f"synthetic (seed {args.seed})"
+
+    variants = {
+        "rows: jsonable_encoder + json": lambda: old_encode({"rows": list(rows)}),
+        "rows: encode_json": lambda: encode_json({"rows": list(rows)}),
+        "columnar float": lambda: encode_json({"rows": columnar(rows, "float")}),
+        "columnar scaled": lambda: encode_json({"rows": columnar(rows, "scaled")}),
+    }
+
+    print(f"{len(rows):,} rows, {source}, encoder: {'orjson' if orjson is not None else 'json'}")
+    print(f"{'variant':<32} {'encode_ms':>10} {'bytes':>12} {'gzip_bytes':>12} {'speedup':>8}")
+    results = []
+    baseline_ms = None
+    for name, fn in variants.items():
+        ms, body = best_ms(fn, args.repeat)
+        baseline_ms = baseline_ms or ms
+        r = {
+            "variant": name,
+            "encode_ms": round(ms, 2),
+            "bytes": len(body),
+            "gzip_bytes": len(gzip.compress(body, compresslevel=6)),
+            "speedup": round(baseline_ms / ms, 2) if ms > 0 else None,
+        }
+        results.append(r)
+        print(f"{name:<32} {r['encode_ms']:>10.2f} {r['bytes']:>12,} {r['gzip_bytes']:>12,} {r['speedup'] or 0:>7.1f}x")
+
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump({"rows": len(rows), "source": source, "orjson": orjson is not None, "results": results}, f, indent=2)
+        print(f"\nResults: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
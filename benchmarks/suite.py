@@ -0,0 +1,222 @@
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import httpx
+from sqlalchemy import text
+
+# Ensure project root is on sys.path so "import app" works
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+SCRIPTS_DIR = ROOT_DIR / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+from app.db import get_engine
+from app.ingest.readers import DEFAULT_CHUNK_ROWS
+from app.ingest.views import affected_weeks, refresh_sales_views
+from benchmarks.synthetic import write_sales_file
+import bench_api_load
+import import_excel_to_pg as importer
+
+REPORT_ENDPOINTS = [
+    "weekly-summary",
+    "seller-ranking",
+    "top-products",
+    "shipping-breakdown",
+    "daily-trend",
+    "weekly-trend",
+    "data-quality",
+    "data-quality-samples",
+    "dashboard",
+]
+
+DEFAULT_OUT_DIR = Path("outputs") / "bench"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="End-to-end benchmark: ingest rows/sec, /reports/* latency, generate_weekly_report.py run time. "
+                    "Ingest commits rows, so point DATABASE_URL at a scratch database."
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Synthetic rows to generate and ingest")
+    parser.add_argument("--format", choices=["csv", "xlsx", "parquet"], default="csv")
+    parser.add_argument("--file", help="Ingest this file instead of generating one")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--sellers", type=int, default=80)
+    parser.add_argument("--skew", type=float, default=1.1)
+    parser.add_argument("--bad-rate", type=float, default=0.01)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--skip-ingest", action="store_true", help="Benchmark reports against the data already loaded")
+
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="Running API server for endpoint latency")
+    parser.add_argument("--skip-api", action="store_true")
+    parser.add_argument("--endpoints", default=",".join(REPORT_ENDPOINTS))
+    parser.add_argument("--widths", default="7,30,365", help="Comma-separated date-range widths in days")
+    parser.add_argument("--concurrency", default="1,10,50", help="Comma-separated client counts")
+    parser.add_argument("--requests-per-client", type=int, default=10)
+
+    parser.add_argument("--skip-weekly-report", action="store_true")
+    parser.add_argument("--out", help=f"Result JSON path (default: {DEFAULT_OUT_DIR}/bench_<utc timestamp>.json)")
+    return parser.parse_args()
+
+
+def csv_ints(value: str) -> list:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def database_info(engine) -> dict:
+    with engine.connect() as conn:
+        row = conn.execute(text(
+            "SELECT version() AS server_version, "
+            "(SELECT COUNT(*) FROM salesops.fact_sales_line) AS fact_rows, "
+            "(SELECT MIN(sale_date) FROM salesops.fact_sales_line) AS first_date, "
+            "(SELECT MAX(sale_date) FROM salesops.fact_sales_line) AS last_date"
+        )).mappings().first()
+    return dict(row)
+
+
+# ====== stages ======
+def bench_ingest(engine, path: Path, chunk_rows: int) -> dict:
+    result = importer.import_file(engine, path, chunk_rows=chunk_rows, progress=False)
+    t0 = time.perf_counter()
+    view_timings = refresh_sales_views(engine, affected_weeks(result["touched_dates"])) if result["inserted"] > 0 else {}
+    refresh_s = time.perf_counter() - t0
+    return {
+        "file": str(path),
+        "rows": result["rows"],
+        "inserted": result["inserted"],
+        "skipped": result["skipped"],
+        "batches": result["batches"],
+        "seconds": round(result["seconds"], 3),
+        "rows_per_sec": round(result["rows"] / result["seconds"], 1) if result["seconds"] > 0 else None,
+        "view_refresh_seconds": round(refresh_s, 3),
+        "view_refresh": {v: round(s, 3) for v, s in view_timings.items()},
+        "validation": result["validation"],
+    }
+
+
+def bench_endpoints(base_url: str, endpoints, widths, concurrency, per_client, last_date: date) -> list:
+    """One load level per endpoint x width x clients, all ranges ending on the last loaded day."""
+    results = []
+    for width in widths:
+        start = last_date - timedelta(days=width - 1)
+        query = f"start_date={start.isoformat()}&end_date={last_date.isoformat()}"
+        for ep in endpoints:
+            for clients in concurrency:
+                r = asyncio.run(bench_api_load.run_level(base_url, "/reports", [ep], query, clients, per_client))
+                results.append({"endpoint": ep, "width_days": width, "clients": clients, **r})
+                print(
+                    f"  {ep:<22} {width:>4}d clients={clients:<4} "
+                    f"p50={r['p50_ms']:>8.1f} ms  p99={r['p99_ms']:>8.1f} ms  errors={r['errors']}"
+                )
+    return results
+
+
+def report_cache_stats(base_url: str):
+    # Cache hits make repeated requests cheap; record whether the server had it on
+    try:
+        return httpx.get(f"{base_url}/health/report-cache", timeout=10).json()
+    except httpx.HTTPError:
+        return None
+
+
+def bench_weekly_report(widths, last_date: date) -> list:
+    script = SCRIPTS_DIR / "generate_weekly_report.py"
+    results = []
+    for width in widths:
+        start = last_date - timedelta(days=width - 1)
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, str(script), "--start", start.isoformat(), "--end", last_date.isoformat()],
+            cwd=ROOT_DIR, capture_output=True, text=True,
+        )
+        elapsed = time.perf_counter() - t0
+        results.append({
+            "width_days": width,
+            "seconds": round(elapsed, 3),
+            "ok": proc.returncode == 0,
+        })
+        print(f"  generate_weekly_report {width:>4}d {elapsed:>8.2f}s" + ("" if proc.returncode == 0 else " (failed)"))
+    return results
+
+
+# ====== main ======
+def main():
+    args = parse_args()
+    engine = get_engine()
+    started = datetime.now(timezone.utc)
+    widths = csv_ints(args.widths)
+
+    out = {
+        "meta": {
+            "started_at": started.isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+    }
+
+    if not args.skip_ingest:
+        if args.file:
+            path = Path(args.file)
+            out["generator"] = None
+        else:
+            path = DEFAULT_OUT_DIR / f"synthetic_{args.rows}_s{args.seed}.{args.format}"
+            print(f"Generating {args.rows:,} rows -> {path}")
+            t0 = time.perf_counter()
+            out["generator"] = write_sales_file(
+                path, args.rows,
+                products=args.products, sellers=args.sellers, skew=args.skew,
+                bad_rate=args.bad_rate, seed=args.seed,
+            )
+            out["generator"]["seconds"] = round(time.perf_counter() - t0, 3)
+        print(f"Ingesting {path}")
+        out["ingest"] = bench_ingest(engine, path, args.chunk_size)
+        print(f"  {out['ingest']['rows']:,} rows at {out['ingest']['rows_per_sec'] or 0:,.0f} rows/sec")
+
+    out["database"] = database_info(engine)
+    last_date = out["database"]["last_date"]
+    if last_date is None:
+        print("fact_sales_line is empty; skipping report benchmarks.")
+    else:
+        if not args.skip_api:
+            print(f"Endpoint latency against {args.base_url}")
+            out["report_cache"] = report_cache_stats(args.base_url)
+            out["endpoints"] = bench_endpoints(
+                args.base_url,
+                [e.strip() for e in args.endpoints.split(",") if e.strip()],
+                widths,
+                csv_ints(args.concurrency),
+                args.requests_per_client,
+                last_date,
+            )
+        if not args.skip_weekly_report:
+            out["weekly_report"] = bench_weekly_report(widths, last_date)
+
+    out_path = Path(args.out) if args.out else DEFAULT_OUT_DIR / f"bench_{started:%Y%m%dT%H%M%SZ}.json"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(out, f, indent=2, default=str)
+    print(f"\nResults: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
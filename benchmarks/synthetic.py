@@ -0,0 +1,181 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Ensure project root is on sys.path so "import app" works
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+from app.ingest.validation import EXPECTED_COLUMNS
+
+SHIPPING_COMPANIES = ["UPS", "FedEx", "DHL", "USPS", "OnTrac", "Amazon Logistics", "LaserShip", "Purolator"]
+
+# Kinds of bad rows, picked uniformly; the first three match validation CHECKS,
+# missing_seller is dropped by prepare_sales_frame() before validation
+BAD_KINDS = ["mismatched_total", "nonpositive_units", "negative_amount", "missing_seller"]
+
+DEFAULT_BLOCK_ROWS = 100_000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Write a deterministic synthetic sales file in the layout import_excel_to_pg.py expects"
+    )
+    parser.add_argument("--out", required=True, help="Output path (.csv, .xlsx or .parquet)")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--start", dest="start_date", default="2026-01-01", help="First sale date (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, default=365, help="Sale dates span this many days")
+    parser.add_argument("--products", type=int, default=2000, help="Distinct product codes")
+    parser.add_argument("--sellers", type=int, default=80, help="Distinct seller names")
+    parser.add_argument("--shipping", type=int, default=5, help=f"Distinct shipping companies (max {len(SHIPPING_COMPANIES)})")
+    parser.add_argument(
+        "--skew",
+        type=float,
+        default=1.1,
+        help="Zipf exponent for product/seller popularity (0 = uniform)"
+    )
+    parser.add_argument("--bad-rate", type=float, default=0.01, help="Fraction of rows with a data-quality problem")
+    parser.add_argument("--missing-shipping-rate", type=float, default=0.05, help="Fraction of rows without a shipping company")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def zipf_weights(n: int, skew: float) -> np.ndarray:
+    w = 1.0 / np.arange(1, n + 1) ** skew
+    return w / w.sum()
+
+
+def iter_sales_blocks(
+    rows: int,
+    start_date: str = "2026-01-01",
+    days: int = 365,
+    products: int = 2000,
+    sellers: int = 80,
+    shipping: int = 5,
+    skew: float = 1.1,
+    bad_rate: float = 0.01,
+    missing_shipping_rate: float = 0.05,
+    seed: int = 42,
+    block_rows: int = DEFAULT_BLOCK_ROWS,
+):
+    """
+    Yield (frame, bad_counts) blocks of at most block_rows rows with the
+    EXPECTED_COLUMNS layout. Same arguments -> same rows, byte for byte.
+    bad_counts maps each BAD_KINDS entry to the rows of that kind in the block.
+    """
+    rng = np.random.default_rng(seed)
+    product_p = zipf_weights(products, skew)
+    seller_p = zipf_weights(sellers, skew)
+    # Zero-padded so popularity rank is not visible in sort order
+    product_codes = np.array([f"P{i:06d}" for i in rng.permutation(products)], dtype=object)
+    seller_names = np.array([f"Seller {i:04d}" for i in rng.permutation(sellers)], dtype=object)
+    shippers = np.array(SHIPPING_COMPANIES[:max(1, min(shipping, len(SHIPPING_COMPANIES)))], dtype=object)
+    t0 = pd.Timestamp(start_date)
+
+    for offset in range(0, rows, block_rows):
+        n = min(block_rows, rows - offset)
+        unit_price = rng.uniform(1, 500, n).round(2)
+        units = rng.integers(1, 20, n).astype(float)
+        total = (unit_price * units).round(2)
+        product = product_codes[rng.choice(products, n, p=product_p)]
+        seller = seller_names[rng.choice(sellers, n, p=seller_p)]
+        ship = shippers[rng.integers(0, len(shippers), n)]
+        ship[rng.random(n) < missing_shipping_rate] = None
+
+        bad = rng.random(n) < bad_rate
+        kind = rng.integers(0, len(BAD_KINDS), n)
+        counts = {}
+        for k, name in enumerate(BAD_KINDS):
+            mask = bad & (kind == k)
+            counts[name] = int(mask.sum())
+            if name == "mismatched_total":
+                total[mask] = (total[mask] + rng.uniform(1, 50, mask.sum())).round(2)
+            elif name == "nonpositive_units":
+                units[mask] = -rng.integers(0, 3, mask.sum())
+            elif name == "negative_amount":
+                unit_price[mask] = -unit_price[mask]
+                total[mask] = -total[mask]
+            else:
+                seller[mask] = None
+
+        frame = pd.DataFrame({
+            "Time": t0 + pd.to_timedelta(np.sort(rng.integers(0, days * 86400, n)), unit="s"),
+            "Product": product,
+            "Seller": seller,
+            "Unit Price": unit_price,
+            "Units": units,
+            "Total Price": total,
+            "Shipping Company": ship,
+        }, columns=EXPECTED_COLUMNS)
+        yield frame, counts
+
+
+def write_sales_file(path: Path, rows: int, **spec) -> dict:
+    """
+    Write iter_sales_blocks(rows, **spec) to path (format from the suffix)
+    block by block, so memory stays flat at any row count. Returns a summary
+    with the generation arguments and bad-row counts per kind.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    suffix = path.suffix.lower()
+    bad = {name: 0 for name in BAD_KINDS}
+    blocks = iter_sales_blocks(rows, **spec)
+
+    if suffix == ".csv":
+        for i, (frame, counts) in enumerate(blocks):
+            frame.to_csv(path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+            bad = {k: bad[k] + counts[k] for k in bad}
+    elif suffix == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        for frame, counts in blocks:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(str(path), table.schema)
+            writer.write_table(table)
+            bad = {k: bad[k] + counts[k] for k in bad}
+        if writer is not None:
+            writer.close()
+    elif suffix == ".xlsx":
+        from openpyxl import Workbook
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(EXPECTED_COLUMNS)
+        for frame, counts in blocks:
+            for rec in frame.itertuples(index=False):
+                ws.append([rec[0].to_pydatetime(), *rec[1:]])
+            bad = {k: bad[k] + counts[k] for k in bad}
+        wb.save(str(path))
+    else:
+        raise ValueError(f"Unsupported output format: {path.suffix} (use .csv, .xlsx or .parquet)")
+
+    return {"path": str(path), "rows": rows, **spec, "bad_rows": bad}
+
+
+def main():
+    args = parse_args()
+    spec = {
+        "start_date": args.start_date,
+        "days": args.days,
+        "products": args.products,
+        "sellers": args.sellers,
+        "shipping": args.shipping,
+        "skew": args.skew,
+        "bad_rate": args.bad_rate,
+        "missing_shipping_rate": args.missing_shipping_rate,
+        "seed": args.seed,
+    }
+    summary = write_sales_file(Path(args.out), args.rows, **spec)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+import httpx
+
+ENDPOINTS = [
+    "weekly-summary",
+    "seller-ranking",
+    "top-products",
+    "shipping-breakdown",
+    "data-quality",
+    "data-quality-samples",
+]
+
+PREFIXES = {
+    "sync": "/reports",
+    "async": "/async/reports",
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Load-test sync (/reports) vs async (/async/reports) endpoints: p50/p99 latency"
+    )
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--start", dest="start_date", default="2026-01-12")
+    parser.add_argument("--end", dest="end_date", default="2026-01-18")
+    parser.add_argument("--concurrency", default="50,200", help="Comma-separated client counts")
+    parser.add_argument("--requests-per-client", type=int, default=20)
+    parser.add_argument("--modes", default="sync,async", help="Comma-separated: sync, async")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    parser.add_argument("--json", dest="json_out", help="Also write results to this JSON file")
+    return parser.parse_args()
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    k = min(len(sorted_values) - 1, max(0, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+async def client_loop(client, urls, n, latencies, errors, offset):
+    for i in range(n):
+        url = urls[(offset + i) % len(urls)]
+        t0 = time.perf_counter()
+        try:
+            res = await client.get(url)
+            ok = res.status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        latencies.append(time.perf_counter() - t0)
+        if not ok:
+            errors.append(url)
+
+
+async def run_level(base_url, prefix, endpoints, query, clients, per_client):
+    urls = [f"{prefix}/{ep}?{query}" for ep in endpoints]
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        # Warm-up so pool creation is not part of the numbers
+        await client.get(urls[0])
+        t0 = time.perf_counter()
+        await asyncio.gather(*[
+            client_loop(client, urls, per_client, latencies, errors, i) for i in range(clients)
+        ])
+        wall = time.perf_counter() - t0
+
+    ms = sorted(x * 1000 for x in latencies)
+    return {
+        "requests": len(ms),
+        "errors": len(errors),
+        "wall_seconds": round(wall, 2),
+        "req_per_sec": round(len(ms) / wall, 1) if wall > 0 else None,
+        "p50_ms": round(percentile(ms, 50), 1),
+        "p99_ms": round(percentile(ms, 99), 1),
+        "mean_ms": round(statistics.fmean(ms), 1),
+    }
+
+
+def require_uncached(base_url: str):
+    """
+    The sync endpoints answer repeats from the report cache, the async ones
+    always query, so comparing them only means something with the cache off.
+    """
+    stats = httpx.get(f"{base_url}/health/report-cache", timeout=10).json()
+    if stats.get("enabled"):
+        sys.exit(
+            "The server's report cache is enabled, so sync requests would be cache hits. "
+            "Restart the API with REPORT_CACHE_MAX_ENTRIES=0 and run again."
+        )
+
+
+async def main_async(args):
+    query = f"start_date={args.start_date}&end_date={args.end_date}"
+    endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    results = []
+    for clients in [int(c) for c in args.concurrency.split(",") if c.strip()]:
+        for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+            r = await run_level(args.base_url, PREFIXES[mode], endpoints, query, clients, args.requests_per_client)
+            results.append({"mode": mode, "clients": clients, **r})
+            print(
+                f"{mode:<6} clients={clients:<4} requests={r['requests']:<6} errors={r['errors']:<4} "
+                f"p50={r['p50_ms']:>8.1f} ms  p99={r['p99_ms']:>8.1f} ms  {r['req_per_sec']:>8.1f} req/s"
+            )
+    return results
+
+
+def main():
+    args = parse_args()
+    if "sync" in [m.strip() for m in args.modes.split(",")]:
+        require_uncached(args.base_url)
+    results = asyncio.run(main_async(args))
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
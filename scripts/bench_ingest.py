@@ -0,0 +1,99 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Ensure project root is on sys.path so "import app" works
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+SCRIPTS_DIR = ROOT_DIR / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+from app.db import get_engine
+from app.ingest.partitions import ensure_fact_partitions
+import import_excel_to_pg as importer
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark fact ingest throughput (rows/sec)")
+    parser.add_argument("--rows", type=int, default=20000, help="Synthetic rows per run")
+    parser.add_argument("--products", type=int, default=300, help="Distinct product codes")
+    parser.add_argument("--sellers", type=int, default=40, help="Distinct seller names")
+    parser.add_argument(
+        "--modes",
+        default="row,copy",
+        help="Comma-separated insert paths to compare (row, copy)"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def make_frame(rows: int, products: int, sellers: int, seed: int) -> pd.DataFrame:
+    """Synthetic frame in the shape load_sales_frame() returns."""
+    rng = np.random.default_rng(seed)
+    unit_price = rng.uniform(1, 500, rows).round(2)
+    units = rng.integers(1, 20, rows).astype(float)
+    ship = np.array(["UPS", "FedEx", "DHL", "USPS", None], dtype=object)
+
+    return pd.DataFrame({
+        "Time": pd.Timestamp("2026-01-01") + pd.to_timedelta(rng.integers(0, 365 * 86400, rows), unit="s"),
+        "Product": [f"BENCH-P{i:05d}" for i in rng.integers(0, products, rows)],
+        "Seller": [f"Bench Seller {i:03d}" for i in rng.integers(0, sellers, rows)],
+        "Unit Price": unit_price,
+        "Units": units,
+        "Total Price": (unit_price * units).round(2),
+        "Shipping Company": ship[rng.integers(0, len(ship), rows)],
+        "_source_row_number": np.arange(2, rows + 2),
+    })
+
+
+def run_once(engine, mode: str, df: pd.DataFrame):
+    source_file = f"__bench_{mode}_{int(time.time())}.xlsx"
+    insert = importer.insert_bulk if mode == "copy" else importer.insert_row_by_row
+
+    # Everything happens in one transaction that is rolled back, so the
+    # benchmark leaves no rows (or dimension keys) behind.
+    with engine.connect() as conn:
+        # Partitions are created outside the rolled-back transaction and kept (they are empty)
+        ensure_fact_partitions(conn, df["Time"])
+        trans = conn.begin()
+        try:
+            t0 = time.perf_counter()
+            inserted, skipped, _ = insert(conn, df, source_file)
+            elapsed = time.perf_counter() - t0
+        finally:
+            trans.rollback()
+
+    return {
+        "mode": mode,
+        "rows": len(df),
+        "inserted": inserted,
+        "skipped": skipped,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(len(df) / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+def main():
+    args = parse_args()
+    df = make_frame(args.rows, args.products, args.sellers, args.seed)
+    engine = get_engine()
+
+    results = [run_once(engine, m.strip(), df) for m in args.modes.split(",") if m.strip()]
+
+    print(f"{'mode':<6} {'rows':>10} {'seconds':>10} {'rows/sec':>12}")
+    for r in results:
+        print(f"{r['mode']:<6} {r['rows']:>10} {r['seconds']:>10.3f} {r['rows_per_sec']:>12,.0f}")
+
+    by_mode = {r["mode"]: r for r in results}
+    if "row" in by_mode and "copy" in by_mode:
+        speedup = by_mode["copy"]["rows_per_sec"] / by_mode["row"]["rows_per_sec"]
+        print(f"\ncopy vs row speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
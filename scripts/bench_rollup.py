@@ -0,0 +1,71 @@
+import argparse
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Ensure project root is on sys.path so "import app" works
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+from app.db import get_engine
+from app.queries.report_queries import (
+    SQL_WEEKLY_SUMMARY,
+    SQL_SELLER_RANKING,
+    SQL_TOP_PRODUCTS,
+    SQL_SHIPPING,
+    SQL_DASHBOARD_AGGREGATES,
+)
+from app.queries.routing import ROLLUP_EQUIVALENTS
+
+QUERIES = {
+    "weekly_summary": SQL_WEEKLY_SUMMARY,
+    "seller_ranking": SQL_SELLER_RANKING,
+    "top_products": SQL_TOP_PRODUCTS,
+    "shipping": SQL_SHIPPING,
+    "dashboard_aggregates": SQL_DASHBOARD_AGGREGATES,
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Raw facts vs agg_daily_sales latency for report queries")
+    parser.add_argument("--end", dest="end_date", default=date.today().isoformat(), help="Range end (YYYY-MM-DD)")
+    parser.add_argument("--days", default="30,365", help="Comma-separated range widths in days")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query (median is reported)")
+    return parser.parse_args()
+
+
+def time_query(conn, sql: str, params: dict, repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        conn.execute(text(sql), params).fetchall()
+        runs.append(time.perf_counter() - t0)
+    return statistics.median(runs) * 1000
+
+
+def main():
+    args = parse_args()
+    end = date.fromisoformat(args.end_date)
+    engine = get_engine()
+
+    print(f"{'query':<22} {'days':>5} {'raw_ms':>10} {'rollup_ms':>10} {'speedup':>8}")
+    with engine.connect() as conn:
+        for days in [int(d) for d in args.days.split(",") if d.strip()]:
+            params = {
+                "start_date": (end - timedelta(days=days - 1)).isoformat(),
+                "end_date": end.isoformat(),
+                "limit": 12,
+            }
+            for name, sql in QUERIES.items():
+                raw_ms = time_query(conn, sql, params, args.repeat)
+                rollup_ms = time_query(conn, ROLLUP_EQUIVALENTS[sql], params, args.repeat)
+                speedup = raw_ms / rollup_ms if rollup_ms > 0 else float("inf")
+                print(f"{name:<22} {days:>5} {raw_ms:>10.1f} {rollup_ms:>10.1f} {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure project root is on sys.path so "import app" works
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+SCRIPTS_DIR = ROOT_DIR / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+from app.ingest.validation import validate_sales_frame
+from benchmarks.synthetic import write_sales_file
+import import_excel_to_pg as importer
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Peak memory / throughput of whole-file vs chunked ingest")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Rows in the synthetic file")
+    parser.add_argument("--format", choices=["csv", "xlsx", "parquet"], default="csv")
+    parser.add_argument(
+        "--chunk-sizes",
+        default="0,50000,200000",
+        help="Comma-separated chunk sizes to compare (0 = whole file at once)"
+    )
+    parser.add_argument("--file", help="Reuse an existing file instead of generating one")
+    parser.add_argument(
+        "--with-db",
+        action="store_true",
+        help="Also insert into DATABASE_URL (commits rows; use a scratch database)"
+    )
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    # ru_maxrss is KiB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def worker(path: Path, chunk_rows: int, with_db: bool):
+    t0 = time.perf_counter()
+    if with_db:
+        from app.db import get_engine
+
+        result = importer.import_file(get_engine(), path, chunk_rows=chunk_rows)
+        rows = result["rows"]
+    else:
+        rows = 0
+        for df, _ in importer.iter_sales_frames(path, chunk_rows):
+            validate_sales_frame(df)
+            rows += len(df)
+    elapsed = time.perf_counter() - t0
+
+    print(json.dumps({
+        "chunk_rows": chunk_rows,
+        "rows": rows,
+        "seconds": round(elapsed, 2),
+        "rows_per_sec": round(rows / elapsed, 1) if elapsed > 0 else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }))
+
+
+def main():
+    args = parse_args()
+
+    if args.worker:
+        worker(Path(args.file), int(args.chunk_sizes), args.with_db)
+        return
+
+    if args.file:
+        path = Path(args.file)
+    else:
+        path = Path(tempfile.gettempdir()) / f"salesops_bench_{args.rows}.{args.format}"
+        if not path.exists():
+            print(f"Generating {args.rows:,} rows -> {path}")
+            write_sales_file(path, args.rows, products=500, sellers=50, skew=0.0, bad_rate=0.0, seed=7)
+
+    # One fresh process per chunk size so peak RSS is not shared between runs
+    results = []
+    for chunk in [int(c) for c in args.chunk_sizes.split(",") if c.strip()]:
+        cmd = [sys.executable, __file__, "--worker", "--file", str(path), "--chunk-sizes", str(chunk)]
+        if args.with_db:
+            cmd.append("--with-db")
+        out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+
+    print(f"{'chunk_rows':>10} {'rows':>10} {'seconds':>9} {'rows/sec':>12} {'peak_rss_mb':>12}")
+    for r in results:
+        label = "whole" if r["chunk_rows"] == 0 else str(r["chunk_rows"])
+        print(f"{label:>10} {r['rows']:>10} {r['seconds']:>9.2f} {r['rows_per_sec']:>12,.0f} {str(r['peak_rss_mb']):>12}")
+
+
+if __name__ == "__main__":
+    main()
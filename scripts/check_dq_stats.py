@@ -0,0 +1,70 @@
+import argparse
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Ensure project root is on sys.path so "import app" works
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+from app.db import get_engine
+from app.ingest.dq_stats import DQ_COUNTS, check_dq_stats, recompute_dq_stats
+from app.ingest.version import bump_data_version
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare salesops.agg_daily_dq with fact_sales_line for a date range (and optionally recompute it)"
+    )
+    parser.add_argument("--start", dest="start_date", help="Start date (YYYY-MM-DD, default: first sale_date)")
+    parser.add_argument("--end", dest="end_date", help="End date (YYYY-MM-DD, default: last sale_date)")
+    parser.add_argument(
+        "--recompute",
+        action="store_true",
+        help="Recompute the daily DQ counts for the range from the raw facts (also used for the initial backfill)"
+    )
+    parser.add_argument("--show", type=int, default=20, help="Max mismatching days to print")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    engine = get_engine()
+
+    with engine.connect() as conn:
+        bounds = conn.execute(
+            text("SELECT MIN(sale_date) AS lo, MAX(sale_date) AS hi FROM salesops.fact_sales_line")
+        ).first()
+    start_date = args.start_date or bounds.lo
+    end_date = args.end_date or bounds.hi
+    if start_date is None or end_date is None:
+        print("fact_sales_line is empty; nothing to check.")
+        return
+
+    if args.recompute:
+        with engine.begin() as conn:
+            n = recompute_dq_stats(conn, start_date, end_date)
+        bump_data_version(engine)
+        print(f"Recomputed agg_daily_dq for {start_date} ~ {end_date}: {n} day(s)")
+
+    with engine.connect() as conn:
+        diffs = check_dq_stats(conn, start_date, end_date)
+
+    if not diffs:
+        print(f"DQ stats consistent ✅ ({start_date} ~ {end_date})")
+        return
+
+    print(f"DQ stats MISMATCH ❌ {len(diffs)} day(s) differ ({start_date} ~ {end_date})")
+    for d in diffs[:args.show]:
+        changed = [
+            f"{c} {d['raw_' + c]} vs {d['stored_' + c]}"
+            for c in DQ_COUNTS if d["raw_" + c] != d["stored_" + c]
+        ]
+        print(f"  {d['sale_date']}: {', '.join(changed)}")
+    print("Run again with --recompute to rebuild the range.")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
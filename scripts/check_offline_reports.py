@@ -0,0 +1,135 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Ensure project root is on sys.path so "import app" works
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+from app.db import get_engine
+from app.offline import engine as offline
+from app.queries.dq_queries import SQL_DATA_QUALITY_SAMPLES, SQL_DATA_QUALITY_SUMMARY
+from app.queries.report_queries import SQL_SELLER_RANKING, SQL_SHIPPING, SQL_TOP_PRODUCTS, SQL_WEEKLY_SUMMARY
+
+SQL_LINES_AFTER_WATERMARK = """
+SELECT COUNT(*)
+FROM salesops.fact_sales_line
+WHERE sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
+  AND ingested_at >= CAST(:watermark AS timestamptz);
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare the offline Parquet engine with the report SQL in app/queries for a date range"
+    )
+    parser.add_argument("--snapshot", default="outputs/snapshot", help="Snapshot directory (scripts/snapshot_parquet.py)")
+    parser.add_argument("--start", dest="start_date", help="Start date (YYYY-MM-DD, default: first sale_date)")
+    parser.add_argument("--end", dest="end_date", help="End date (YYYY-MM-DD, default: last sale_date)")
+    parser.add_argument("--limit", type=int, default=10, help="Top products limit")
+    parser.add_argument("--tol", type=float, default=0.05, help="DQ mismatch tolerance")
+    parser.add_argument("--samples", type=int, default=200, help="DQ samples to compare")
+    return parser.parse_args()
+
+
+def ordered(rows, key: str) -> list:
+    # ORDER BY revenue DESC leaves ties in any order
+    return sorted((dict(r) for r in rows), key=lambda r: (-r["revenue"], r[key]))
+
+
+def same_ranking(sql_rows, offline_rows, key: str, limited: bool = False) -> bool:
+    a, b = ordered(sql_rows, key), ordered(offline_rows, key)
+    if limited and a:
+        # LIMIT may keep any of the rows tied at the cutoff
+        cutoff = a[-1]["revenue"]
+        return (
+            [r["revenue"] for r in a] == [r["revenue"] for r in b]
+            and [r for r in a if r["revenue"] != cutoff] == [r for r in b if r["revenue"] != cutoff]
+        )
+    return a == b
+
+
+def first_difference(a: list, b: list):
+    for i, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            return f"row {i}: sql {x} vs offline {y}"
+    return f"row count: sql {len(a)} vs offline {len(b)}"
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, (time.perf_counter() - t0) * 1000
+
+
+def main():
+    args = parse_args()
+    engine = get_engine()
+
+    with engine.connect() as conn:
+        bounds = conn.execute(
+            text("SELECT MIN(sale_date) AS lo, MAX(sale_date) AS hi FROM salesops.fact_sales_line")
+        ).first()
+    start_date = args.start_date or bounds.lo
+    end_date = args.end_date or bounds.hi
+    if start_date is None or end_date is None:
+        print("fact_sales_line is empty; nothing to check.")
+        return
+
+    snapshot = offline.OfflineSnapshot(args.snapshot)
+    lines, load_ms = timed(lambda: snapshot.lines(start_date, end_date, columns=offline.DQ_COLUMNS))
+    print(f"Loaded {len(lines):,} snapshot line(s) for {start_date} ~ {end_date} in {load_ms:.1f} ms")
+
+    params = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "limit": args.limit,
+        "tol": args.tol,
+        "after_time": None,
+        "after_id": None,
+    }
+    checks = [
+        ("weekly summary", SQL_WEEKLY_SUMMARY, params,
+         lambda: [offline.weekly_summary(lines, start_date, end_date)], None),
+        ("seller ranking", SQL_SELLER_RANKING, params, lambda: offline.seller_ranking(lines), "seller_name"),
+        ("top products", SQL_TOP_PRODUCTS, params, lambda: offline.top_products(lines, args.limit), "product_code"),
+        ("shipping", SQL_SHIPPING, params, lambda: offline.shipping_breakdown(lines), "shipping_company"),
+        ("dq summary", SQL_DATA_QUALITY_SUMMARY, params,
+         lambda: [offline.data_quality_summary(lines, start_date, end_date, args.tol)], None),
+        ("dq samples", SQL_DATA_QUALITY_SAMPLES, {**params, "limit": args.samples},
+         lambda: offline.data_quality_samples(lines, args.tol, args.samples), None),
+    ]
+
+    failed = 0
+    print(f"{'check':<16} {'sql_ms':>10} {'offline_ms':>12}  result")
+    with engine.connect() as conn:
+        watermark = snapshot.watermark()
+        behind = conn.execute(
+            text(SQL_LINES_AFTER_WATERMARK),
+            {"start_date": start_date, "end_date": end_date, "watermark": watermark},
+        ).scalar_one()
+
+        for name, sql, sql_params, run_offline, key in checks:
+            sql_rows, sql_ms = timed(lambda: [dict(r) for r in conn.execute(text(sql), sql_params).mappings()])
+            offline_rows, offline_ms = timed(run_offline)
+            if key:
+                ok = same_ranking(sql_rows, offline_rows, key, limited=name == "top products")
+                detail = "" if ok else first_difference(ordered(sql_rows, key), ordered(offline_rows, key))
+            else:
+                ok = sql_rows == offline_rows
+                detail = "" if ok else first_difference(sql_rows, offline_rows)
+            failed += not ok
+            print(f"{name:<16} {sql_ms:>10.1f} {offline_ms:>12.1f}  {'match ✅' if ok else 'MISMATCH ❌ ' + detail}")
+
+    if behind:
+        print(f"\nNote: {behind:,} line(s) in the range were ingested after the snapshot watermark ({watermark}); "
+              "run scripts/snapshot_parquet.py first.")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import argparse
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Ensure project root is on sys.path so "import app" works
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+from app.db import get_engine
+from app.ingest.partitions import list_fact_partitions, partition_month
+from app.queries.dq_queries import SQL_DATA_QUALITY_SAMPLES, SQL_DATA_QUALITY_SUMMARY
+from app.queries.report_queries import (
+    SQL_DASHBOARD_AGGREGATES,
+    SQL_SELLER_RANKING,
+    SQL_SHIPPING,
+    SQL_TOP_PRODUCTS,
+    SQL_WEEKLY_SUMMARY,
+)
+
+# Every report query that reads fact_sales_line directly
+QUERIES = {
+    "weekly_summary": SQL_WEEKLY_SUMMARY,
+    "seller_ranking": SQL_SELLER_RANKING,
+    "top_products": SQL_TOP_PRODUCTS,
+    "shipping": SQL_SHIPPING,
+    "dashboard_aggregates": SQL_DASHBOARD_AGGREGATES,
+    "dq_summary": SQL_DATA_QUALITY_SUMMARY,
+    "dq_samples": SQL_DATA_QUALITY_SAMPLES,
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="EXPLAIN the raw report queries and check they only scan the partitions of the requested range"
+    )
+    parser.add_argument("--start", dest="start_date", help="Range start (YYYY-MM-DD, default: first day of latest partition)")
+    parser.add_argument("--end", dest="end_date", help="Range end (YYYY-MM-DD, default: start + 6 days)")
+    return parser.parse_args()
+
+
+def scanned_relations(plan: dict) -> set:
+    """Relation names of every scan node in an EXPLAIN (FORMAT JSON) plan tree."""
+    found = set()
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if "Relation Name" in node:
+            found.add(node["Relation Name"])
+        stack.extend(node.get("Plans", []))
+    return found
+
+
+def months_between(start: date, end: date) -> set:
+    months = set()
+    d = start.replace(day=1)
+    while d <= end:
+        months.add(d)
+        d = (d + timedelta(days=32)).replace(day=1)
+    return months
+
+
+def main():
+    args = parse_args()
+    engine = get_engine()
+
+    with engine.connect() as conn:
+        partitions = list_fact_partitions(conn)
+        if not partitions:
+            print("fact_sales_line has no partitions yet; import some data first.")
+            return
+
+        start = date.fromisoformat(args.start_date) if args.start_date else partitions[-1]["month"]
+        end = date.fromisoformat(args.end_date) if args.end_date else start + timedelta(days=6)
+        expected = months_between(start, end)
+        params = {"start_date": start.isoformat(), "end_date": end.isoformat(), "tol": 0.05, "limit": 12,
+                  "after_time": None, "after_id": None}
+
+        print(f"Range {start} ~ {end}: {len(expected)} month(s) of {len(partitions)} partition(s) should be scanned")
+        failures = 0
+        for name, sql in QUERIES.items():
+            plan = conn.execute(text("EXPLAIN (FORMAT JSON) " + sql), params).scalar_one()
+            scanned = {
+                rel for rel in scanned_relations(plan[0]["Plan"])
+                if partition_month(rel) is not None
+            }
+            extra = sorted(rel for rel in scanned if partition_month(rel) not in expected)
+            if extra:
+                failures += 1
+                print(f"  ❌ {name:<22} scans {len(scanned)} partition(s), outside range: {', '.join(extra)}")
+            else:
+                print(f"  ✅ {name:<22} scans {len(scanned)} partition(s)")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+import argparse
+import hashlib
+import importlib
+import json
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Ensure project root is on sys.path so "import app" works
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+from app.db import get_engine
+
+# Modules whose SQL_* string constants are report queries
+QUERY_MODULES = [
+    "app.queries.report_queries",
+    "app.queries.dq_queries",
+]
+# Plain .sql files with ;-separated report queries
+QUERY_FILES = [ROOT_DIR / "sql" / "03_weekly_report.sql"]
+
+FACT_TABLE = "fact_sales_line"
+# fact_sales_line_p2026_01 -> fact_sales_line, so fingerprints survive new months
+PARTITION_RE = re.compile(r"^(fact_sales_line)_p\d{4}_\d{2}$")
+DML_RE = re.compile(r"\b(INSERT|UPDATE|DELETE|TRUNCATE|REFRESH)\b", re.IGNORECASE)
+IDENT_RE = re.compile(r"\b([a-z_][a-z0-9_]*)\b")
+
+DEFAULT_BASELINE = Path("outputs") / "plans" / "baseline.json"
+DEFAULT_OUT = Path("outputs") / "plans" / "latest.json"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="EXPLAIN (ANALYZE, BUFFERS) every report query constant and compare with a stored baseline"
+    )
+    parser.add_argument("--end", dest="end_date", help="Range end (YYYY-MM-DD, default: last loaded sale_date)")
+    parser.add_argument("--days", type=int, default=7, help="Range width for the representative parameters")
+    parser.add_argument("--tol", type=float, default=0.05)
+    parser.add_argument("--limit", type=int, default=12)
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--out", default=str(DEFAULT_OUT), help="Where to write this run's plans and numbers")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument(
+        "--buffer-growth",
+        type=float,
+        default=0.5,
+        help="Fail when shared buffers (hit + read) grow by more than this fraction over the baseline"
+    )
+    parser.add_argument(
+        "--seq-scan-min-mb",
+        type=float,
+        default=16.0,
+        help="Without a baseline for a query, fail on a fact Seq Scan only over partitions at least this large"
+    )
+    parser.add_argument("--filter", help="Only queries whose name contains this text")
+    return parser.parse_args()
+
+
+# ====== discovery ======
+def is_report_query(sql: str) -> bool:
+    head = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+    return head in ("SELECT", "WITH") and not DML_RE.search(sql)
+
+
+def discover_queries() -> dict:
+    """{name: sql} for every SQL_* constant in QUERY_MODULES and every statement in QUERY_FILES."""
+    queries = {}
+    for module_name in QUERY_MODULES:
+        module = importlib.import_module(module_name)
+        for attr, value in vars(module).items():
+            if attr.startswith("SQL_") and isinstance(value, str) and is_report_query(value):
+                queries[f"{module_name.rsplit('.', 1)[-1]}.{attr}"] = value
+    for path in QUERY_FILES:
+        body = "\n".join(
+            line for line in path.read_text(encoding="utf-8").splitlines() if not line.lstrip().startswith("--")
+        )
+        statements = [s.strip() for s in body.split(";") if s.strip()]
+        for i, sql in enumerate(statements, start=1):
+            if is_report_query(sql):
+                queries[f"{path.name}#{i}"] = sql
+    return queries
+
+
+# ====== plan analysis ======
+def walk(plan: dict):
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.get("Plans", []))
+
+
+def base_relation(name):
+    m = PARTITION_RE.match(name or "")
+    return m.group(1) if m else name
+
+
+def fingerprint(plan: dict) -> str:
+    """Node types, relations and indexes in tree order; costs and row counts are left out."""
+    def shape(node):
+        parts = [node["Node Type"]]
+        if "Relation Name" in node:
+            parts.append(base_relation(node["Relation Name"]))
+        if "Index Name" in node:
+            parts.append(re.sub(r"fact_sales_line_p\d{4}_\d{2}", "fact_sales_line", node["Index Name"]))
+        children = ",".join(shape(c) for c in node.get("Plans", []))
+        return ":".join(parts) + (f"({children})" if children else "")
+
+    return hashlib.sha1(shape(plan).encode("utf-8")).hexdigest()[:12]
+
+
+def fact_seq_scans(plan: dict) -> list:
+    return sorted({
+        n["Relation Name"] for n in walk(plan)
+        if n["Node Type"] == "Seq Scan" and base_relation(n.get("Relation Name")) == FACT_TABLE
+    })
+
+
+def relation_mb(conn, names) -> dict:
+    """{name: heap size in MB} for salesops relations."""
+    return {
+        name: conn.execute(
+            text("SELECT pg_relation_size(to_regclass(:rel))"), {"rel": f"salesops.{name}"}
+        ).scalar() / 1024 / 1024
+        for name in names
+    }
+
+
+def covering_index_suggestion(plan: dict, fact_columns: set):
+    """
+    When fact rows are read through the heap (seq/index/bitmap scan, not an
+    index-only scan), the columns the query needs from fact_sales_line;
+    an index on sale_date INCLUDE-ing the rest lets the same query run as an
+    index-only scan.
+    """
+    needed = set()
+    heap_scan = False
+    for n in walk(plan):
+        if base_relation(n.get("Relation Name")) != FACT_TABLE:
+            continue
+        if n["Node Type"] != "Index Only Scan":
+            heap_scan = True
+        for expr in n.get("Output", []) + [n.get(k, "") for k in ("Index Cond", "Filter", "Recheck Cond")]:
+            needed |= {c for c in IDENT_RE.findall(expr.lower()) if c in fact_columns}
+    if not heap_scan or "sale_date" not in needed:
+        return None
+    include = sorted(needed - {"sale_date"})
+    return (
+        f"CREATE INDEX IF NOT EXISTS idx_fact_date_cov_{hashlib.sha1(','.join(include).encode()).hexdigest()[:6]} "
+        f"ON salesops.fact_sales_line (sale_date) INCLUDE ({', '.join(include)});"
+    )
+
+
+def explain(conn, sql: str, params: dict) -> dict:
+    plan = conn.execute(text("EXPLAIN (ANALYZE, BUFFERS, VERBOSE, FORMAT JSON) " + sql), params).scalar_one()
+    return plan[0]
+
+
+# ====== main ======
+def main():
+    args = parse_args()
+    engine = get_engine()
+    queries = discover_queries()
+    if args.filter:
+        queries = {k: v for k, v in queries.items() if args.filter in k}
+
+    baseline_path = Path(args.baseline)
+    baseline = {}
+    if baseline_path.exists():
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)["queries"]
+
+    results = {}
+    failures = []
+    suggestions = {}
+    with engine.connect() as conn:
+        end = args.end_date or conn.execute(text("SELECT MAX(sale_date) FROM salesops.fact_sales_line")).scalar()
+        if end is None:
+            print("fact_sales_line is empty; seed it first (python -m benchmarks.synthetic + import_excel_to_pg.py).")
+            sys.exit(1)
+        end = datetime.fromisoformat(str(end)).date()
+        params = {
+            "start_date": (end - timedelta(days=args.days - 1)).isoformat(),
+            "end_date": end.isoformat(),
+            "tol": args.tol,
+            "limit": args.limit,
+            # First page of keyset-paginated queries
+            "after_time": None,
+            "after_id": None,
+            # Optional filters off; weekly buckets for the time series
+            "seller": None,
+            "product": None,
+            "shipping": None,
+            "granularity": "week",
+            "year_step": "52 weeks",
+        }
+        # Batch report queries: the range as a single period
+        params["period_starts"] = [params["start_date"]]
+        params["period_ends"] = [params["end_date"]]
+        fact_columns = set(conn.execute(text(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_schema = 'salesops' AND table_name = 'fact_sales_line'"
+        )).scalars().all())
+        # End the autobegun transaction so each EXPLAIN gets its own
+        conn.rollback()
+
+        print(f"{len(queries)} queries, range {params['start_date']} ~ {params['end_date']}")
+        print(f"{'query':<52} {'plan':<12} {'exec_ms':>9} {'buffers':>9}  notes")
+        for name, sql in sorted(queries.items()):
+            # ANALYZE runs the query; nothing is written, but keep it in a rolled-back transaction anyway
+            trans = conn.begin()
+            try:
+                top = explain(conn, sql, params)
+                seq_scan_mb = relation_mb(conn, fact_seq_scans(top["Plan"]))
+            finally:
+                trans.rollback()
+            plan = top["Plan"]
+            r = {
+                "fingerprint": fingerprint(plan),
+                "planning_ms": round(top.get("Planning Time", 0.0), 3),
+                "execution_ms": round(top.get("Execution Time", 0.0), 3),
+                "shared_hit_blocks": plan.get("Shared Hit Blocks", 0),
+                "shared_read_blocks": plan.get("Shared Read Blocks", 0),
+                "fact_seq_scans": fact_seq_scans(plan),
+                "plan": plan,
+            }
+            results[name] = r
+
+            notes = []
+            prev = baseline.get(name)
+            # Scans the baseline already had are accepted (by parent table, as
+            # the range moves to other months); without a baseline only scans
+            # over partitions big enough to matter fail
+            if prev:
+                accepted = {base_relation(t) for t in prev.get("fact_seq_scans", [])}
+                new_scans = [t for t in r["fact_seq_scans"] if base_relation(t) not in accepted]
+            else:
+                new_scans = [t for t in r["fact_seq_scans"] if seq_scan_mb[t] >= args.seq_scan_min_mb]
+            if new_scans:
+                failures.append(f"{name}: Seq Scan on {', '.join(new_scans)}")
+                notes.append("SEQ SCAN on fact")
+            elif r["fact_seq_scans"]:
+                notes.append("seq scan on fact (accepted)")
+            buffers = r["shared_hit_blocks"] + r["shared_read_blocks"]
+            if prev:
+                prev_buffers = prev["shared_hit_blocks"] + prev["shared_read_blocks"]
+                # A few blocks of slack so tiny queries do not flap
+                if buffers > prev_buffers * (1 + args.buffer_growth) + 8:
+                    failures.append(f"{name}: buffers {prev_buffers} -> {buffers}")
+                    notes.append(f"buffers +{buffers - prev_buffers}")
+                if prev["fingerprint"] != r["fingerprint"]:
+                    notes.append(f"plan changed (was {prev['fingerprint']})")
+            else:
+                notes.append("new")
+
+            suggestion = covering_index_suggestion(plan, fact_columns)
+            if suggestion:
+                suggestions.setdefault(suggestion, []).append(name)
+
+            print(f"{name:<52} {r['fingerprint']:<12} {r['execution_ms']:>9.1f} {buffers:>9}  {'; '.join(notes)}")
+
+    run = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "params": params,
+        "queries": results,
+    }
+    out_path = Path(args.out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(run, f, indent=2, default=str)
+    if args.update_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2, default=str)
+        print(f"\nBaseline updated: {baseline_path}")
+
+    if suggestions:
+        print("\nCovering index suggestions (index-only scans also need a recent VACUUM):")
+        for ddl, names in suggestions.items():
+            print(f"  {ddl}\n    -- used by {', '.join(names)}")
+
+    if failures:
+        print(f"\n{len(failures)} plan regression(s):")
+        for f in failures:
+            print(f"  ❌ {f}")
+        sys.exit(1)
+    print("\nNo plan regressions.")
+
+
+if __name__ == "__main__":
+    main()
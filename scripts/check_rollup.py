@@ -0,0 +1,75 @@
+import argparse
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Ensure project root is on sys.path so "import app" works
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+from app.db import get_engine
+from app.ingest.rollup import check_rollup, rebuild_rollup
+from app.ingest.version import bump_data_version
+from app.ingest.views import refresh_sales_views
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare salesops.agg_daily_sales with fact_sales_line for a date range (and optionally rebuild it)"
+    )
+    parser.add_argument("--start", dest="start_date", help="Start date (YYYY-MM-DD, default: first sale_date)")
+    parser.add_argument("--end", dest="end_date", help="End date (YYYY-MM-DD, default: last sale_date)")
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Recompute the rollup for the range from the raw facts"
+    )
+    parser.add_argument("--show", type=int, default=20, help="Max mismatching keys to print")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    engine = get_engine()
+
+    with engine.connect() as conn:
+        bounds = conn.execute(
+            text("SELECT MIN(sale_date) AS lo, MAX(sale_date) AS hi FROM salesops.fact_sales_line")
+        ).first()
+    start_date = args.start_date or bounds.lo
+    end_date = args.end_date or bounds.hi
+    if start_date is None or end_date is None:
+        print("fact_sales_line is empty; nothing to check.")
+        return
+
+    if args.rebuild:
+        with engine.begin() as conn:
+            n = rebuild_rollup(conn, start_date, end_date)
+        bump_data_version(engine)
+        print(f"Rebuilt agg_daily_sales for {start_date} ~ {end_date}: {n} rollup rows")
+        # Trend totals are only rewritten for imported weeks, so redo them all
+        refresh_sales_views(engine)
+        print("Refreshed agg_daily_totals / agg_weekly_totals")
+
+    with engine.connect() as conn:
+        diffs = check_rollup(conn, start_date, end_date)
+
+    if not diffs:
+        print(f"Rollup consistent ✅ ({start_date} ~ {end_date})")
+        return
+
+    print(f"Rollup MISMATCH ❌ {len(diffs)} key(s) differ ({start_date} ~ {end_date})")
+    for d in diffs[:args.show]:
+        print(
+            f"  {d['sale_date']} seller={d['seller_id']} product={d['product_id']} ship={d['shipping_company_id']}: "
+            f"revenue {d['raw_revenue']} vs {d['rollup_revenue']}, "
+            f"units {d['raw_units']} vs {d['rollup_units']}, "
+            f"lines {d['raw_lines']} vs {d['rollup_lines']}"
+        )
+    print("Run again with --rebuild to recompute the range.")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
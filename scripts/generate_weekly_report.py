@@ -1,9 +1,10 @@
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import pandas as pd
-from sqlalchemy import create_engine, text
-from datetime import date, datetime
+from sqlalchemy import text
+from datetime import date, timedelta
 import argparse
 
 # Ensure project root is on sys.path so "import app" works
@@ -11,11 +12,19 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 from app.db import get_engine
+from app.queries.report_queries import SQL_PERIOD_AGGREGATES
+from app.queries.routing import report_sql
+
+TOP_PRODUCTS = 10
+
+# grouping_id of SQL_PERIOD_AGGREGATES rows (see SQL_DASHBOARD_AGGREGATES)
+GROUP_TOTAL, GROUP_SELLER, GROUP_PRODUCT, GROUP_SHIPPING = 7, 3, 5, 6
 
-engine = get_engine()
 
 def parse_args():
-    parser = argparse.ArgumentParser(description="Generate weekly sales report")
+    parser = argparse.ArgumentParser(
+        description="Generate the weekly sales report for one range, or one report per week/month in batch"
+    )
     parser.add_argument(
         "--start",
         dest="start_date",
@@ -28,100 +37,170 @@ def parse_args():
         default="2026-01-23",
         help="End date (YYYY-MM-DD)"
     )
+    # ====== batch mode ======
+    parser.add_argument("--from", dest="from_date", help="Batch: first day (YYYY-MM-DD); reports for every period overlapping --from..--to")
+    parser.add_argument("--to", dest="to_date", help="Batch: last day (YYYY-MM-DD, default: last loaded sale_date)")
+    parser.add_argument("--weeks", type=int, help="Batch: the last N weeks up to --to (instead of --from)")
+    parser.add_argument("--by", choices=["week", "month"], default="week", help="Batch period (weeks start on Monday)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes writing workbooks in batch mode (1 = write in this process)"
+    )
+    parser.add_argument("--out-dir", default="outputs")
+    parser.add_argument(
+        "--snapshot",
+        help="Read a Parquet snapshot directory (scripts/snapshot_parquet.py) instead of the database"
+    )
     return parser.parse_args()
 
-SQL_SUMMARY = """
-SELECT
-  CAST(:start_date AS date) AS start_date,
-  CAST(:end_date   AS date) AS end_date,
-  ROUND(COALESCE(SUM(line_total), 0), 2) AS revenue,
-  ROUND(COALESCE(SUM(units), 0), 2)      AS units,
-  COUNT(*)                  AS line_count
-FROM salesops.fact_sales_line
-WHERE sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date);
-"""
-
-SQL_SELLER = """
-SELECT
-  s.seller_name,
-  ROUND(COALESCE(SUM(line_total), 0), 2) AS revenue,
-  ROUND(COALESCE(SUM(units), 0), 2)      AS units,
-  COUNT(*)                    AS line_count
-FROM salesops.fact_sales_line f
-JOIN salesops.dim_seller s ON s.seller_id = f.seller_id
-WHERE f.sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
-GROUP BY s.seller_name
-ORDER BY revenue DESC;
-"""
-
-SQL_TOP_PRODUCTS = """
-SELECT
-  p.product_code,
-  ROUND(COALESCE(SUM(line_total), 0), 2) AS revenue,
-  ROUND(COALESCE(SUM(units), 0), 2)      AS units
-FROM salesops.fact_sales_line f
-JOIN salesops.dim_product p ON p.product_id = f.product_id
-WHERE f.sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
-GROUP BY p.product_code
-ORDER BY revenue DESC
-LIMIT 10;
-"""
-
-SQL_SHIPPING = """
-SELECT
-  COALESCE(sc.company_name, 'UNKNOWN') AS shipping_company,
-  ROUND(COALESCE(SUM(line_total), 0), 2) AS revenue,
-  COUNT(*)                    AS line_count
-FROM salesops.fact_sales_line f
-LEFT JOIN salesops.dim_shipping_company sc
-  ON sc.shipping_company_id = f.shipping_company_id
-WHERE f.sale_date BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date)
-GROUP BY 1
-ORDER BY revenue DESC;
-"""
-
-def df_query(sql: str, params: dict) -> pd.DataFrame:
-    with engine.begin() as conn:
-        return pd.read_sql(text(sql), conn, params=params)
 
-def main():
-    args = parse_args()
-    START_DATE = args.start_date
-    END_DATE = args.end_date
-    params = {"start_date": START_DATE, "end_date": END_DATE}
-
-    df_summary = df_query(SQL_SUMMARY, params)
-    df_seller = df_query(SQL_SELLER, params)
-    df_top = df_query(SQL_TOP_PRODUCTS, params)
-    df_ship = df_query(SQL_SHIPPING, params)
-
-    # 1) Export an Excel weekly report
-    os.makedirs("outputs", exist_ok=True)
-    out_xlsx = os.path.join("outputs", f"weekly_report_{START_DATE}_to_{END_DATE}.xlsx")
-    with pd.ExcelWriter(out_xlsx, engine="openpyxl") as writer:
-        df_summary.to_excel(writer, index=False, sheet_name="Summary")
-        df_seller.to_excel(writer, index=False, sheet_name="Seller_Ranking")
-        df_top.to_excel(writer, index=False, sheet_name="Top_Products")
-        df_ship.to_excel(writer, index=False, sheet_name="Shipping_Share")
-
-    # 2) Build a boss-friendly text (copy-paste into WeChat)
-    s = df_summary.iloc[0]
+# ====== periods ======
+def week_periods(first: date, last: date) -> list:
+    """(monday, sunday) for every week overlapping first..last."""
+    start = first - timedelta(days=first.weekday())
+    periods = []
+    while start <= last:
+        periods.append((start, start + timedelta(days=6)))
+        start += timedelta(days=7)
+    return periods
+
+
+def month_periods(first: date, last: date) -> list:
+    """(1st, last day) for every month overlapping first..last."""
+    start = first.replace(day=1)
+    periods = []
+    while start <= last:
+        nxt = (start + timedelta(days=32)).replace(day=1)
+        periods.append((start, nxt - timedelta(days=1)))
+        start = nxt
+    return periods
+
+
+def batch_periods(engine, args) -> list:
+    if args.to_date:
+        last = date.fromisoformat(args.to_date)
+    elif args.snapshot:
+        days = [p.name.split("=", 1)[1] for p in Path(args.snapshot).glob("sale_date=*")]
+        if not days:
+            print(f"{args.snapshot} has no snapshot files; nothing to report.")
+            sys.exit(1)
+        last = date.fromisoformat(max(days))
+    else:
+        with engine.connect() as conn:
+            last = conn.execute(text("SELECT MAX(sale_date) FROM salesops.fact_sales_line")).scalar()
+        if last is None:
+            print("fact_sales_line is empty; nothing to report.")
+            sys.exit(1)
+    if args.weeks:
+        first = last - timedelta(days=last.weekday()) - timedelta(weeks=args.weeks - 1)
+        return week_periods(first, last)
+    first = date.fromisoformat(args.from_date)
+    return week_periods(first, last) if args.by == "week" else month_periods(first, last)
+
+
+# ====== fetch ======
+def fetch_period_frames(engine, periods: list) -> dict:
+    """
+    {(start, end): {"summary", "seller", "top", "ship"} DataFrames} for every
+    period, from one SQL_PERIOD_AGGREGATES query in a read-only transaction.
+    """
+    params = {
+        "start_date": min(p[0] for p in periods),
+        "end_date": max(p[1] for p in periods),
+        "period_starts": [p[0] for p in periods],
+        "period_ends": [p[1] for p in periods],
+    }
+    with engine.connect().execution_options(postgresql_readonly=True) as conn, conn.begin():
+        df = pd.read_sql(text(report_sql(SQL_PERIOD_AGGREGATES)), conn, params=params)
+
+    df["period_start"] = pd.to_datetime(df["period_start"]).dt.date
+    df["period_end"] = pd.to_datetime(df["period_end"]).dt.date
+    by_period = {key: g for key, g in df.groupby(["period_start", "period_end"], sort=False)}
+
+    frames = {}
+    for start, end in periods:
+        g = by_period.get((start, end), df.iloc[0:0])
+        total = g[g["grouping_id"] == GROUP_TOTAL]
+        summary = pd.DataFrame([{
+            "start_date": start,
+            "end_date": end,
+            "revenue": total["revenue"].iloc[0] if len(total) else 0,
+            "units": total["units"].iloc[0] if len(total) else 0,
+            "line_count": int(total["line_count"].iloc[0]) if len(total) else 0,
+        }])
+        seller = (
+            g[g["grouping_id"] == GROUP_SELLER][["seller_name", "revenue", "units", "line_count"]]
+            .sort_values("revenue", ascending=False, kind="stable")
+        )
+        top = (
+            g[g["grouping_id"] == GROUP_PRODUCT][["product_code", "revenue", "units"]]
+            .sort_values("revenue", ascending=False, kind="stable")
+            .head(TOP_PRODUCTS)
+        )
+        ship = (
+            g[g["grouping_id"] == GROUP_SHIPPING][["shipping_company", "revenue", "line_count"]]
+            .sort_values("revenue", ascending=False, kind="stable")
+        )
+        frames[(start, end)] = {"summary": summary, "seller": seller, "top": top, "ship": ship}
+    return frames
+
+
+def fetch_snapshot_frames(snapshot_dir: str, periods: list) -> dict:
+    """Same frames as fetch_period_frames, computed by the offline engine from one snapshot read."""
+    from app.offline import engine as offline
+
+    lines = offline.OfflineSnapshot(snapshot_dir).lines(min(p[0] for p in periods), max(p[1] for p in periods))
+    frames = {}
+    for start, end in periods:
+        period = offline.between(lines, start, end)
+        frames[(start, end)] = {
+            "summary": pd.DataFrame([offline.weekly_summary(period, start, end)]),
+            "seller": pd.DataFrame(
+                offline.seller_ranking(period), columns=["seller_name", "revenue", "units", "line_count"]
+            ),
+            "top": pd.DataFrame(offline.top_products(period, TOP_PRODUCTS), columns=["product_code", "revenue", "units"]),
+            "ship": pd.DataFrame(
+                offline.shipping_breakdown(period), columns=["shipping_company", "revenue", "line_count"]
+            ),
+        }
+    return frames
+
+
+def fetch_frames(engine, args, periods: list) -> dict:
+    if args.snapshot:
+        return fetch_snapshot_frames(args.snapshot, periods)
+    return fetch_period_frames(engine, periods)
+
+
+# ====== write ======
+def append_sheet(wb, title: str, df: pd.DataFrame):
+    # write_only sheets stream rows to disk instead of keeping cell objects
+    ws = wb.create_sheet(title)
+    ws.append(list(df.columns))
+    for rec in df.itertuples(index=False, name=None):
+        ws.append([None if pd.isna(v) else v for v in rec])
+
+
+def build_message(start, end, frames: dict, out_xlsx: str, kind: str = "weekly") -> str:
+    s = frames["summary"].iloc[0]
     revenue = float(s["revenue"] or 0)
     units = float(s["units"] or 0)
     line_count = int(s["line_count"] or 0)
 
     top_seller_line = ""
-    if len(df_seller) > 0:
-        ts = df_seller.iloc[0]
+    if len(frames["seller"]) > 0:
+        ts = frames["seller"].iloc[0]
         top_seller_line = f"- Top Seller: {ts['seller_name']}  Revenue ${float(ts['revenue']):.2f}\n"
 
     top_product_line = ""
-    if len(df_top) > 0:
-        tp = df_top.iloc[0]
+    if len(frames["top"]) > 0:
+        tp = frames["top"].iloc[0]
         top_product_line = f"- Top Product: {tp['product_code']}  Revenue ${float(tp['revenue']):.2f} (Units {float(tp['units']):.0f})\n"
 
-    msg = (
-        f"Weekly Sales Report ({START_DATE} ~ {END_DATE})\n"
+    return (
+        f"{kind.capitalize()} Sales Report ({start} ~ {end})\n"
         f"- Total Revenue: ${revenue:.2f}\n"
         f"- Total Units: {units:.0f}\n"
         f"- Line Items: {line_count}\n"
@@ -130,8 +209,64 @@ def main():
         f"\n(Details attached: {out_xlsx})"
     )
 
-    print(msg)
-    print(f"\nSaved Excel report: {out_xlsx} ✅")
+
+def write_period_report(start, end, frames: dict, out_dir: str, kind: str = "weekly", write_text: bool = False) -> tuple:
+    """Write one period's workbook (and WeChat text file); returns (xlsx path, message). Runs in pool workers."""
+    from openpyxl import Workbook
+
+    os.makedirs(out_dir, exist_ok=True)
+    out_xlsx = os.path.join(out_dir, f"{kind}_report_{start}_to_{end}.xlsx")
+    wb = Workbook(write_only=True)
+    append_sheet(wb, "Summary", frames["summary"])
+    append_sheet(wb, "Seller_Ranking", frames["seller"])
+    append_sheet(wb, "Top_Products", frames["top"])
+    append_sheet(wb, "Shipping_Share", frames["ship"])
+    wb.save(out_xlsx)
+
+    msg = build_message(start, end, frames, out_xlsx, kind)
+    if write_text:
+        with open(os.path.join(out_dir, f"{kind}_report_{start}_to_{end}.txt"), "w", encoding="utf-8") as f:
+            f.write(msg + "\n")
+    return out_xlsx, msg
+
+
+# ====== main ======
+def main():
+    args = parse_args()
+    engine = None if args.snapshot else get_engine()
+
+    if not (args.from_date or args.weeks):
+        # 1) Export an Excel weekly report  2) Print a boss-friendly text (copy-paste into WeChat)
+        start, end = date.fromisoformat(args.start_date), date.fromisoformat(args.end_date)
+        frames = fetch_frames(engine, args, [(start, end)])
+        out_xlsx, msg = write_period_report(start, end, frames[(start, end)], args.out_dir)
+        print(msg)
+        print(f"\nSaved Excel report: {out_xlsx} ✅")
+        return
+
+    periods = batch_periods(engine, args)
+    kind = "monthly" if args.by == "month" and not args.weeks else "weekly"
+    print(f"{len(periods)} {args.by} report(s): {periods[0][0]} ~ {periods[-1][1]}")
+    frames = fetch_frames(engine, args, periods)
+
+    if args.workers > 1 and len(periods) > 1:
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(periods))) as pool:
+            futures = [
+                pool.submit(write_period_report, start, end, frames[(start, end)], args.out_dir, kind, True)
+                for start, end in periods
+            ]
+            results = [f.result() for f in futures]
+    else:
+        results = [
+            write_period_report(start, end, frames[(start, end)], args.out_dir, kind, True)
+            for start, end in periods
+        ]
+
+    for (start, end), (out_xlsx, _) in zip(periods, results):
+        revenue = float(frames[(start, end)]["summary"].iloc[0]["revenue"] or 0)
+        print(f"  {start} ~ {end}  revenue ${revenue:,.2f}  -> {out_xlsx}")
+    print(f"\nSaved {len(results)} Excel report(s) and WeChat texts to {args.out_dir} ✅")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,132 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# Ensure project root is on sys.path so "import app" works
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+SCRIPTS_DIR = ROOT_DIR / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+from app.db import get_engine
+from app.ingest.readers import DEFAULT_CHUNK_ROWS, SUPPORTED_SUFFIXES
+from app.ingest.views import refresh_sales_views
+from app.ingest.validation import DEFAULT_TOL
+import import_excel_to_pg as importer
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Import every sales file in a directory on a process pool")
+    parser.add_argument("paths", nargs="+", help="Directories and/or individual sales files")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (default: CPU count)"
+    )
+    parser.add_argument("--pattern", default="*", help="Glob applied inside directories, e.g. '2025*.xlsx'")
+    parser.add_argument("--mode", choices=["copy", "row"], default="copy")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--tol", type=float, default=DEFAULT_TOL)
+    parser.add_argument("--report-dir", default=str(importer.DEFAULT_REPORT_DIR))
+    parser.add_argument("--force", action="store_true", help="Re-import files already loaded with the same content")
+    return parser.parse_args()
+
+
+def collect_files(paths, pattern: str):
+    files = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            files.extend(
+                f for f in sorted(p.glob(pattern))
+                if f.is_file() and f.suffix.lower() in SUPPORTED_SUFFIXES and not f.name.startswith("~$")
+            )
+        elif p.is_file():
+            files.append(p)
+        else:
+            raise FileNotFoundError(f"Not found: {p}")
+    # Same file listed twice would just race itself
+    return list(dict.fromkeys(files))
+
+
+# One engine per worker process (engines/pools must not be shared across fork)
+_engine = None
+
+
+def _init_worker():
+    global _engine
+    _engine = get_engine()
+
+
+def _ingest_one(path: Path, force: bool, import_kwargs: dict) -> dict:
+    try:
+        # Trend totals are refreshed once after the whole batch, not by every worker
+        return importer.ingest_with_manifest(
+            _engine, path, force=force, refresh_views=False, progress=False, **import_kwargs
+        )
+    except Exception as e:
+        # Errors inside import_file() are already recorded as failed in the
+        # manifest. Hashing the file, the manifest lookup or mark_running()
+        # fail before there is a manifest row, so the full path and error
+        # printed by main() are the only record. Keep the pool going either way.
+        return {"source_file": path.name, "path": str(path), "status": "failed", "error": f"{type(e).__name__}: {e}"}
+
+
+def main():
+    args = parse_args()
+    files = collect_files(args.paths, args.pattern)
+    if not files:
+        print("No sales files found.")
+        return
+
+    import_kwargs = {
+        "mode": args.mode,
+        "chunk_rows": args.chunk_size,
+        "tol": args.tol,
+        "report_dir": Path(args.report_dir),
+    }
+    workers = max(1, min(args.workers, len(files)))
+    print(f"Importing {len(files)} file(s) with {workers} worker(s)")
+
+    t0 = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {pool.submit(_ingest_one, f, args.force, import_kwargs): f for f in files}
+        for fut in as_completed(futures):
+            r = fut.result()
+            results.append(r)
+            if r["status"] == "loaded":
+                print(
+                    f"  ✅ {r['source_file']}: rows={r['rows']}, inserted={r['inserted']}, "
+                    f"skipped={r['skipped']}, {r['seconds']:.1f}s"
+                )
+            elif r["status"] == "unchanged":
+                print(f"  ⏭ {r['source_file']}: unchanged (already loaded as {r['previous_source_file']})")
+            else:
+                print(f"  ❌ {r['path']}: {r['error']}", file=sys.stderr)
+
+    elapsed = time.perf_counter() - t0
+    loaded = [r for r in results if r["status"] == "loaded"]
+    total_rows = sum(r["rows"] for r in loaded)
+    print(
+        f"\nDone in {elapsed:.1f}s: loaded={len(loaded)}, "
+        f"unchanged={sum(r['status'] == 'unchanged' for r in results)}, "
+        f"failed={sum(r['status'] == 'failed' for r in results)}, "
+        f"rows={total_rows} ({total_rows / elapsed if elapsed > 0 else 0:,.0f} rows/sec overall)"
+    )
+    if any(r["inserted"] > 0 for r in loaded):
+        weeks = importer.affected_weeks(d for r in loaded for d in r["touched_dates"])
+        print(f"Weeks with new rows: {len(weeks)} ({weeks[0]} ~ {weeks[-1]})")
+        timings = refresh_sales_views(get_engine(), weeks)
+        print("Refreshed trend totals: " + ", ".join(f"{v} {sec:.2f}s" for v, sec in timings.items()))
+
+    if any(r["status"] == "failed" for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
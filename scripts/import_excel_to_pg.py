@@ -1,47 +1,101 @@
+import argparse
 import os
 import sys
+import time
 from pathlib import Path
 
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 
 # Ensure project root is on sys.path so "import app" works
 ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 from app.db import get_engine
+from app.ingest.bulk import copy_fact_rows
+from app.ingest.dimensions import DimensionResolver
+from app.ingest.manifest import (
+    file_sha256,
+    find_loaded,
+    mark_failed,
+    mark_loaded,
+    mark_running,
+    save_checkpoint,
+)
+from app.ingest.partitions import ensure_fact_partitions
+from app.ingest.dq_stats import SQL_DQ_STATS_ADD_LINE
+from app.ingest.rollup import SQL_ROLLUP_ADD_LINE
+from app.ingest.version import bump_data_version
+from app.ingest.views import affected_weeks, refresh_sales_views
+from app.ingest.readers import DEFAULT_CHUNK_ROWS, TEXT_DTYPES, iter_sales_chunks
+from app.ingest.validation import (
+    CHECKS,
+    DEFAULT_TOL,
+    merge_summaries,
+    offending_rows,
+    prepare_sales_frame,
+    rejected_mask,
+    summarize_flags,
+    validate_sales_frame,
+    write_validation_report,
+)
 
 
 # ====== config ======
 DEFAULT_EXCEL_PATH = Path("data") / "2026SalesData.xlsx"
-EXCEL_PATH = Path(os.getenv("SALES_DATA_FILE", str(DEFAULT_EXCEL_PATH)))
+DEFAULT_REPORT_DIR = Path("outputs") / "validation"
 
-if not EXCEL_PATH.exists():
-    raise FileNotFoundError(
-        f"Excel file not found: {EXCEL_PATH}\n"
-        "Tip: Put your file under ./data/ or set env var SALES_DATA_FILE.\n"
-        'PowerShell example: $env:SALES_DATA_FILE="data\\2026SalesData.xlsx"'
-    )
-
-SOURCE_FILE_NAME = EXCEL_PATH.name
 
-engine = get_engine()
+def parse_args():
+    parser = argparse.ArgumentParser(description="Import a sales file (xlsx/CSV/Parquet) into PostgreSQL")
+    parser.add_argument(
+        "--file",
+        default=os.getenv("SALES_DATA_FILE", str(DEFAULT_EXCEL_PATH)),
+        help="Sales file to import: .xlsx, .csv or .parquet (default: $SALES_DATA_FILE or data/2026SalesData.xlsx)"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_ROWS,
+        help="Rows read, validated and committed per batch (0 = whole file in one transaction)"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["copy", "row"],
+        default="copy",
+        help="copy = COPY into a staging table + one set-based upsert; row = one INSERT per line"
+    )
+    parser.add_argument(
+        "--tol",
+        type=float,
+        default=DEFAULT_TOL,
+        help="Price mismatch tolerance in dollars (same rule as /reports/data-quality)"
+    )
+    parser.add_argument(
+        "--report-dir",
+        default=str(DEFAULT_REPORT_DIR),
+        help="Directory for the per-file validation report"
+    )
+    parser.add_argument(
+        "--report-format",
+        choices=["csv", "parquet"],
+        default="csv",
+        help="Format of the offending-rows sidecar"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Import even if ingest_manifest already has this file content as loaded"
+    )
+    parser.add_argument(
+        "--no-refresh-views",
+        action="store_true",
+        help="Skip refreshing agg_daily_totals / agg_weekly_totals for the imported weeks"
+    )
+    return parser.parse_args()
 
 
 # ====== helpers ======
-def norm_str(x):
-    if pd.isna(x):
-        return None
-    s = str(x).strip()
-    return s if s else None
-
-
-def approx_equal(a, b, tol=0.01):
-    if a is None or b is None:
-        return False
-    return abs(float(a) - float(b)) <= tol
-
-
 def get_or_create_product_id(conn, product_code: str) -> int:
     row = conn.execute(
         text("SELECT product_id FROM salesops.dim_product WHERE product_code = :v"),
@@ -90,88 +144,376 @@ def get_or_create_shipping_id(conn, company_name: str) -> int:
     )
 
 
-# ====== main ======
-def main():
-    # Read excel
-    df = pd.read_excel(str(EXCEL_PATH))
-
-    expected = ["Time", "Product", "Seller", "Unit Price", "Units", "Total Price", "Shipping Company"]
-    missing = [c for c in expected if c not in df.columns]
-    if missing:
-        raise RuntimeError(f"Missing columns in Excel: {missing}. Found: {list(df.columns)}")
-
-    # Keep original excel row number (best effort: header is row 1; data starts row 2)
-    df["_source_row_number"] = df.index + 2
-
-    # Parse datetime
-    df["Time"] = pd.to_datetime(df["Time"], errors="coerce")
-    if df["Time"].isna().any():
-        bad = df[df["Time"].isna()][["_source_row_number", "Time", "Product", "Seller"]].head(20)
-        raise RuntimeError(f"Found unparsable Time values (showing up to 20):\n{bad}")
-
-    # Clean strings
-    df["Product"] = df["Product"].apply(norm_str)
-    df["Seller"] = df["Seller"].apply(norm_str)
-    df["Shipping Company"] = df["Shipping Company"].apply(norm_str)
-
-    # Drop rows missing required fields
-    df = df.dropna(subset=["Product", "Seller", "Unit Price", "Units", "Total Price"]).copy()
-
-    # Price math sanity check (warn only)
-    for _, r in df.iterrows():
-        calc = float(r["Unit Price"]) * float(r["Units"])
-        if not approx_equal(calc, r["Total Price"], tol=0.05):
-            print(
-                f"[WARN] Excel row {int(r['_source_row_number'])}: "
-                f"unit_price*units={calc:.2f}, total={float(r['Total Price']):.2f}"
-            )
-
+def load_sales_frame(path: Path) -> pd.DataFrame:
+    # Whole-file read, then clean with vectorized column operations
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        df = pd.read_csv(path, skip_blank_lines=False, dtype=TEXT_DTYPES)
+    elif suffix == ".parquet":
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_excel(str(path), dtype=TEXT_DTYPES)
+    return prepare_sales_frame(df)
+
+
+def iter_sales_frames(path: Path, chunk_rows: int, resume_after: int = 0):
+    """
+    Yield (cleaned_frame, last_source_row_number) per chunk of at most chunk_rows
+    rows; chunk_rows=0 reads the whole file. Rows up to resume_after (a committed
+    checkpoint) are skipped before cleaning.
+    """
+    if chunk_rows <= 0:
+        df = load_sales_frame(path)
+        last_row = int(df["_source_row_number"].max()) if len(df) else 1
+        yield df[df["_source_row_number"] > resume_after], last_row
+        return
+    for raw, first_row_number in iter_sales_chunks(path, chunk_rows):
+        last_row = first_row_number + len(raw) - 1
+        if last_row <= resume_after:
+            continue
+        df = prepare_sales_frame(raw, first_row_number)
+        yield df[df["_source_row_number"] > resume_after], last_row
+
+
+# ====== insert paths ======
+def insert_row_by_row(conn, df: pd.DataFrame, source_file: str):
     inserted = 0
     skipped = 0
+    touched = set()
 
-    with engine.begin() as conn:
-        for _, r in df.iterrows():
-            source_row_number = int(r["_source_row_number"])
-
-            product_id = get_or_create_product_id(conn, r["Product"])
-            seller_id = get_or_create_seller_id(conn, r["Seller"])
-
-            shipping_company_id = None
-            if r["Shipping Company"]:
-                shipping_company_id = get_or_create_shipping_id(conn, r["Shipping Company"])
-
-            res = conn.execute(
-                text(
-                    """
-                    INSERT INTO salesops.fact_sales_line
-                      (sale_time, product_id, seller_id, shipping_company_id,
-                       unit_price, units, line_total, source_file, source_row_number)
-                    VALUES
-                      (:sale_time, :product_id, :seller_id, :shipping_company_id,
-                       :unit_price, :units, :line_total, :source_file, :source_row_number)
-                    ON CONFLICT (source_file, source_row_number) DO NOTHING
-                    """
-                ),
+    for _, r in df.iterrows():
+        source_row_number = int(r["_source_row_number"])
+
+        product_id = get_or_create_product_id(conn, r["Product"])
+        seller_id = get_or_create_seller_id(conn, r["Seller"])
+
+        shipping_company_id = None
+        if r["Shipping Company"]:
+            shipping_company_id = get_or_create_shipping_id(conn, r["Shipping Company"])
+
+        res = conn.execute(
+            text(
+                """
+                WITH new_key AS (
+                  INSERT INTO salesops.fact_source_key (source_file, source_row_number, sale_date)
+                  VALUES (:source_file, :source_row_number, (CAST(:sale_time AS timestamptz) AT TIME ZONE 'UTC')::date)
+                  ON CONFLICT (source_file, source_row_number) DO NOTHING
+                  RETURNING sale_date
+                )
+                INSERT INTO salesops.fact_sales_line
+                  (sale_time, sale_date, product_id, seller_id, shipping_company_id,
+                   unit_price, units, line_total, source_file, source_row_number)
+                SELECT
+                  :sale_time, sale_date, :product_id, :seller_id, :shipping_company_id,
+                  :unit_price, :units, :line_total, :source_file, :source_row_number
+                FROM new_key
+                RETURNING sale_date
+                """
+            ),
+            {
+                "sale_time": r["Time"].to_pydatetime(),
+                "product_id": product_id,
+                "seller_id": seller_id,
+                "shipping_company_id": shipping_company_id,
+                "unit_price": float(r["Unit Price"]),
+                "units": float(r["Units"]),
+                "line_total": float(r["Total Price"]),
+                "source_file": source_file,
+                "source_row_number": source_row_number,
+            },
+        )
+
+        row = res.first()
+        if row:
+            inserted += 1
+            touched.add(row.sale_date)
+            conn.execute(
+                text(SQL_ROLLUP_ADD_LINE),
                 {
-                    "sale_time": r["Time"].to_pydatetime(),
-                    "product_id": product_id,
+                    "sale_date": row.sale_date,
                     "seller_id": seller_id,
+                    "product_id": product_id,
+                    "shipping_company_id": shipping_company_id,
+                    "line_total": float(r["Total Price"]),
+                    "units": float(r["Units"]),
+                },
+            )
+            conn.execute(
+                text(SQL_DQ_STATS_ADD_LINE),
+                {
+                    "sale_date": row.sale_date,
+                    "unit_price": float(r["Unit Price"]),
+                    "units": float(r["Units"]),
+                    "line_total": float(r["Total Price"]),
                     "shipping_company_id": shipping_company_id,
-                    "unit_price": round(float(r["Unit Price"]), 2),
-                    "units": round(float(r["Units"]), 2),
-                    "line_total": round(float(r["Total Price"]), 2),
-                    "source_file": SOURCE_FILE_NAME,
-                    "source_row_number": source_row_number,
                 },
             )
+        else:
+            skipped += 1
+
+    return inserted, skipped, touched
+
+
+def resolve_fact_rows(conn, df: pd.DataFrame, source_file: str, resolver: DimensionResolver = None) -> pd.DataFrame:
+    """Frame of FACT_COLUMNS with dimension names replaced by their ids."""
+    # Resolve each distinct dimension value once (batched, cached) instead of once per row
+    if resolver is None:
+        resolver = DimensionResolver().preload(conn)
+    product_ids = resolver.resolve(conn, "product", df["Product"].unique())
+    seller_ids = resolver.resolve(conn, "seller", df["Seller"].unique())
+    shipping_ids = resolver.resolve(conn, "shipping", df["Shipping Company"].dropna().unique())
+
+    staged = pd.DataFrame({
+        "sale_time": df["Time"],
+        "product_id": df["Product"].map(product_ids),
+        "seller_id": df["Seller"].map(seller_ids),
+        "shipping_company_id": df["Shipping Company"].map(shipping_ids),
+        "unit_price": df["Unit Price"],
+        "units": df["Units"],
+        "line_total": df["Total Price"],
+        "source_file": source_file,
+        "source_row_number": df["_source_row_number"],
+    })
+    return staged
+
+
+def insert_bulk(conn, df: pd.DataFrame, source_file: str, resolver: DimensionResolver = None):
+    return copy_fact_rows(conn, resolve_fact_rows(conn, df, source_file, resolver))
+
+
+# ====== import ======
+def import_file(
+    engine,
+    path: Path,
+    mode: str = "copy",
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    tol: float = DEFAULT_TOL,
+    report_dir: Path = DEFAULT_REPORT_DIR,
+    report_format: str = "csv",
+    progress: bool = True,
+    resume_after: int = 0,
+    checkpoint=None,
+) -> dict:
+    """
+    Read, validate and insert one sales file chunk by chunk. Each chunk is its
+    own transaction; checkpoint(conn, last_source_row_number) runs inside it,
+    so a crashed run can restart with resume_after = the last saved value.
+    Returns run counters.
+    """
+    source_file = path.name
+    resolver = DimensionResolver()
+    summaries = []
+    offending = []
+    rows = inserted = skipped = batches = 0
+    touched_dates = set()
+    # read = parse + clean, resolve = dimension ids (copy mode; row mode resolves inside insert)
+    stages = {"read": 0.0, "validate": 0.0, "partitions": 0.0, "resolve": 0.0, "insert": 0.0, "commit": 0.0}
+
+    t0 = time.perf_counter()
+    with engine.connect() as conn:
+        if mode == "copy":
+            with conn.begin():
+                resolver.preload(conn)
+
+        frames = iter_sales_frames(path, chunk_rows, resume_after)
+        while True:
+            t_read = time.perf_counter()
+            batch = next(frames, None)
+            stages["read"] += time.perf_counter() - t_read
+            if batch is None:
+                break
+            df, last_row = batch
+
+            # Validation (warn only, except rows the table CHECK constraints would reject)
+            t_validate = time.perf_counter()
+            flags = validate_sales_frame(df, tol=tol)
+            summaries.append(summarize_flags(flags))
+            offending.append(offending_rows(flags))
+            df = df[~rejected_mask(flags)]
+            stages["validate"] += time.perf_counter() - t_validate
+
+            t_batch = time.perf_counter()
+            ensure_fact_partitions(conn, df["Time"])
+            t_resolve = time.perf_counter()
+            stages["partitions"] += t_resolve - t_batch
+            trans = conn.begin()
+            try:
+                if mode == "copy":
+                    staged = resolve_fact_rows(conn, df, source_file, resolver)
+                    t_insert = time.perf_counter()
+                    stages["resolve"] += t_insert - t_resolve
+                    ins, sk, days = copy_fact_rows(conn, staged)
+                else:
+                    t_insert = time.perf_counter()
+                    ins, sk, days = insert_row_by_row(conn, df, source_file)
+                if checkpoint is not None:
+                    checkpoint(conn, last_row)
+                t_commit = time.perf_counter()
+                stages["insert"] += t_commit - t_insert
+                trans.commit()
+            except Exception:
+                trans.rollback()
+                # Keys created in the rolled-back batch no longer exist
+                resolver.reset()
+                raise
+            t_done = time.perf_counter()
+            stages["commit"] += t_done - t_commit
+            if ins > 0:
+                # After the commit, so a cache that sees the new version also sees the rows
+                bump_data_version(engine)
+
+            batches += 1
+            rows += len(df)
+            inserted += ins
+            skipped += sk
+            touched_dates |= days
+            if progress:
+                batch_s = t_done - t_batch
+                print(
+                    f"  batch {batches}: rows<={last_row}, {len(df)} rows in {batch_s:.2f}s "
+                    f"({len(df) / batch_s if batch_s > 0 else 0:,.0f} rows/sec), "
+                    f"commit {(t_done - t_commit) * 1000:.0f} ms, "
+                    f"total {rows} rows ({rows / (t_done - t0):,.0f} rows/sec)"
+                )
+
+    elapsed = time.perf_counter() - t0
+
+    summary = merge_summaries(summaries)
+    report_path = write_validation_report(
+        pd.concat(offending, ignore_index=True) if offending else pd.DataFrame(columns=["_source_row_number", *CHECKS]),
+        source_file,
+        Path(report_dir),
+        tol=tol,
+        fmt=report_format,
+        summary=summary,
+    )
+
+    return {
+        "source_file": source_file,
+        "mode": mode,
+        "rows": rows,
+        "inserted": inserted,
+        "skipped": skipped,
+        "batches": batches,
+        "touched_dates": sorted(touched_dates),
+        "resumed_after": resume_after,
+        "seconds": elapsed,
+        "validation": summary,
+        "report_path": report_path,
+        "dimension_cache": resolver.stats() if mode == "copy" else None,
+        "stage_seconds": {k: round(v, 3) for k, v in stages.items()},
+    }
+
+
+def ingest_with_manifest(
+    engine, path: Path, force: bool = False, refresh_views: bool = True, **import_kwargs
+) -> dict:
+    """
+    import_file() guarded by salesops.ingest_manifest: content already recorded
+    as loaded is skipped before parsing; every attempt is recorded with its
+    row count, duration and status. When rows were inserted, the trend totals
+    of the affected weeks are refreshed (refresh_views=False leaves that to the caller).
+    """
+    content_hash = file_sha256(path)
+
+    if not force:
+        prev = find_loaded(engine, content_hash)
+        if prev:
+            return {
+                "source_file": path.name,
+                "status": "unchanged",
+                "content_hash": content_hash,
+                "previous_source_file": prev["source_file"],
+            }
+
+    resume_after = mark_running(engine, path.name, content_hash)
+    if resume_after and import_kwargs.get("progress", True):
+        print(f"Resuming {path.name} after committed row {resume_after}")
+
+    def checkpoint(conn, last_row):
+        save_checkpoint(conn, path.name, content_hash, last_row)
+
+    t0 = time.perf_counter()
+    try:
+        result = import_file(engine, path, resume_after=resume_after, checkpoint=checkpoint, **import_kwargs)
+    except Exception as e:
+        mark_failed(engine, path.name, content_hash, f"{type(e).__name__}: {e}", time.perf_counter() - t0)
+        raise
+
+    mark_loaded(
+        engine, path.name, content_hash,
+        row_count=result["rows"],
+        inserted=result["inserted"],
+        skipped=result["skipped"],
+        seconds=result["seconds"],
+    )
+    view_refresh = None
+    if refresh_views and result["inserted"] > 0:
+        view_refresh = refresh_sales_views(engine, affected_weeks(result["touched_dates"]))
+    return {**result, "status": "loaded", "content_hash": content_hash, "view_refresh": view_refresh}
+
 
-            if res.rowcount == 1:
-                inserted += 1
-            else:
-                skipped += 1
+# ====== main ======
+def main():
+    args = parse_args()
+    excel_path = Path(args.file)
+
+    if not excel_path.exists():
+        raise FileNotFoundError(
+            f"Excel file not found: {excel_path}\n"
+            "Tip: Put your file under ./data/ or set env var SALES_DATA_FILE.\n"
+            'PowerShell example: $env:SALES_DATA_FILE="data\\2026SalesData.xlsx"'
+        )
+
+    engine = get_engine()
+    result = ingest_with_manifest(
+        engine,
+        excel_path,
+        force=args.force,
+        refresh_views=not args.no_refresh_views,
+        mode=args.mode,
+        chunk_rows=args.chunk_size,
+        tol=args.tol,
+        report_dir=Path(args.report_dir),
+        report_format=args.report_format,
+    )
 
-    print(f"Import complete ✅ Inserted={inserted}, Skipped(duplicate)={skipped}")
-    print(f"Source file: {SOURCE_FILE_NAME}")
+    if result["status"] == "unchanged":
+        print(
+            f"Skipped ⏭ {result['source_file']}: same content already loaded "
+            f"(as {result['previous_source_file']}). Use --force to re-import."
+        )
+        return
+
+    summary = result["validation"]
+    elapsed = result["seconds"]
+    rate = result["rows"] / elapsed if elapsed > 0 else 0.0
+
+    print(f"Import complete ✅ Inserted={result['inserted']}, Skipped(duplicate)={result['skipped']}")
+    print(f"Source file: {result['source_file']}")
+    print(
+        f"Validation: mismatched_total={summary['mismatched_total_count']}, "
+        f"nonpositive_units={summary['nonpositive_units_count']}, "
+        f"negative_amount={summary['negative_amount_count']}, "
+        f"missing_shipping_company={summary['missing_shipping_company_count']}, "
+        f"Rejected={summary['rejected_count']} (report: {result['report_path']})"
+    )
+    print(
+        f"Mode: {args.mode}, {result['rows']} rows in {result['batches']} batch(es), "
+        f"{elapsed:.2f}s ({rate:,.0f} rows/sec)"
+    )
+    print("Stages: " + ", ".join(f"{stage} {sec:.2f}s" for stage, sec in result["stage_seconds"].items()))
+    if result["resumed_after"]:
+        print(f"Resumed after committed row {result['resumed_after']}")
+    weeks = affected_weeks(result["touched_dates"])
+    if weeks:
+        print(f"Weeks with new rows: {', '.join(w.isoformat() for w in weeks)}")
+    if result["view_refresh"]:
+        timings = ", ".join(f"{v} {sec:.2f}s" for v, sec in result["view_refresh"].items())
+        print(f"Refreshed trend totals for {len(weeks)} week(s): {timings}")
+    if result["dimension_cache"]:
+        for dim, st in result["dimension_cache"].items():
+            print(f"Dimension cache [{dim}]: hits={st['hits']}, misses={st['misses']}, created={st['created']}")
 
 
 if __name__ == "__main__":
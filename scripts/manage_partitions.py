@@ -0,0 +1,93 @@
+import argparse
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+# Ensure project root is on sys.path so "import app" works
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+from app.db import get_engine
+from app.ingest.partitions import (
+    archive_partition,
+    detach_partition,
+    drop_partition,
+    list_fact_partitions,
+    month_bounds,
+)
+from app.ingest.views import affected_weeks, refresh_sales_views
+
+DEFAULT_ARCHIVE_DIR = Path("outputs") / "archive"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="List, detach and archive monthly fact_sales_line partitions")
+    parser.add_argument(
+        "--archive-before",
+        metavar="YYYY-MM",
+        help="Detach every month before this one and write it to --archive-dir as CSV.gz"
+    )
+    parser.add_argument("--archive-dir", default=str(DEFAULT_ARCHIVE_DIR))
+    parser.add_argument("--drop", action="store_true", help="Drop each detached table once its archive is written")
+    parser.add_argument(
+        "--concurrently",
+        action="store_true",
+        help="DETACH ... CONCURRENTLY (PostgreSQL 14+, does not block report queries)"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only print what would be archived")
+    return parser.parse_args()
+
+
+def print_partitions(partitions):
+    print(f"{'partition':<28} {'approx_rows':>12} {'size_mb':>9}  bounds")
+    for p in partitions:
+        print(
+            f"{p['partition_name']:<28} {p['approx_rows']:>12,} "
+            f"{p['total_bytes'] / 1024 / 1024:>9.1f}  {p['bounds']}"
+        )
+
+
+def main():
+    args = parse_args()
+    engine = get_engine()
+
+    with engine.connect() as conn:
+        partitions = list_fact_partitions(conn)
+
+    if not args.archive_before:
+        print_partitions(partitions)
+        return
+
+    cutoff = date.fromisoformat(f"{args.archive_before}-01")
+    old = [p for p in partitions if p["month"] is not None and p["month"] < cutoff]
+    if not old:
+        print(f"No partitions before {args.archive_before}.")
+        return
+    if args.dry_run:
+        print_partitions(old)
+        return
+
+    # Rows leave fact_sales_line together with their agg_daily_sales and
+    # agg_daily_dq rows, so every report stops counting archived months.
+    archive_dir = Path(args.archive_dir)
+    for p in old:
+        name = p["partition_name"]
+        if args.concurrently:
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                detach_partition(conn, name, concurrently=True)
+        else:
+            with engine.begin() as conn:
+                detach_partition(conn, name)
+        # Trend totals of the month's weeks; also bumps the data version
+        first, last = month_bounds(p["month"])
+        refresh_sales_views(engine, affected_weeks(first + timedelta(days=i) for i in range((last - first).days + 1)))
+
+        with engine.begin() as conn:
+            path, rows = archive_partition(conn, name, archive_dir)
+            if args.drop:
+                drop_partition(conn, name)
+        print(f"  {name}: {rows} rows -> {path}" + (" (dropped)" if args.drop else " (detached)"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Ensure project root is on sys.path so "import app" works
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+from app.db import get_engine
+from app.ingest.dq_stats import recompute_dq_stats
+from app.ingest.rollup import rebuild_rollup
+from app.ingest.views import refresh_sales_views
+
+SCHEMA_SQL = ROOT_DIR / "sql" / "01_create_tables.sql"
+OLD_SUFFIX = "_unpartitioned"
+
+SQL_RELKIND = """
+SELECT c.relkind
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = 'salesops' AND c.relname = :name;
+"""
+
+SQL_TABLE_INDEXES = """
+SELECT indexname FROM pg_indexes
+WHERE schemaname = 'salesops' AND tablename = :name;
+"""
+
+SQL_OLD_DATE_RANGE = "SELECT MIN(sale_date), MAX(sale_date) FROM salesops.{old};"
+
+SQL_OLD_MONTHS = """
+SELECT DISTINCT date_trunc('month', sale_date)::date AS m
+FROM salesops.{old}
+ORDER BY m;
+"""
+
+# Columns copied as-is (sale_date was a generated column and becomes a plain one)
+COPY_COLUMNS = (
+    "line_id, sale_time, sale_date, product_id, seller_id, shipping_company_id, "
+    "unit_price, units, line_total, source_file, source_row_number, ingested_at"
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Move an existing unpartitioned salesops.fact_sales_line into the monthly partitioned layout"
+    )
+    parser.add_argument(
+        "--keep-old",
+        action="store_true",
+        help=f"Keep the original table as salesops.fact_sales_line{OLD_SUFFIX} instead of dropping it"
+    )
+    return parser.parse_args()
+
+
+def relkind(conn, name: str):
+    return conn.execute(text(SQL_RELKIND), {"name": name}).scalar()
+
+
+def main():
+    args = parse_args()
+    engine = get_engine()
+    old = f"fact_sales_line{OLD_SUFFIX}"
+
+    with engine.connect() as conn:
+        kind = relkind(conn, "fact_sales_line")
+    if kind == "p":
+        print("salesops.fact_sales_line is already partitioned; nothing to do.")
+        return
+    if kind != "r":
+        print("salesops.fact_sales_line not found; run sql/01_create_tables.sql instead.")
+        sys.exit(1)
+
+    t0 = time.perf_counter()
+    # One transaction: either the partitioned table replaces the old one, or nothing changed
+    with engine.begin() as conn:
+        # Importers and reports wait here until the move commits
+        conn.execute(text("LOCK TABLE salesops.fact_sales_line IN ACCESS EXCLUSIVE MODE"))
+
+        # Free every name the new table, its indexes and its sequence will use.
+        # Views keep pointing at the renamed table until 01_create_tables.sql replaces them.
+        conn.execute(text(f"ALTER TABLE salesops.fact_sales_line RENAME TO {old}"))
+        for idx in conn.execute(text(SQL_TABLE_INDEXES), {"name": old}).scalars().all():
+            conn.execute(text(f'ALTER INDEX salesops."{idx}" RENAME TO "{idx[:63 - len(OLD_SUFFIX)]}{OLD_SUFFIX}"'))
+        conn.execute(text(
+            f"ALTER SEQUENCE IF EXISTS salesops.fact_sales_line_line_id_seq RENAME TO fact_sales_line_line_id_seq{OLD_SUFFIX}"
+        ))
+
+        # Same DDL as a fresh install (everything else in it is IF NOT EXISTS / OR REPLACE)
+        conn.exec_driver_sql(SCHEMA_SQL.read_text(encoding="utf-8"))
+
+        months = conn.execute(text(SQL_OLD_MONTHS.format(old=old))).scalars().all()
+        moved = 0
+        for m in months:
+            part = conn.execute(text("SELECT salesops.ensure_fact_partition(:m)"), {"m": m}).scalar_one()
+            n = conn.execute(text(f"""
+                INSERT INTO salesops.fact_sales_line ({COPY_COLUMNS})
+                SELECT {COPY_COLUMNS}
+                FROM salesops.{old}
+                WHERE sale_date >= CAST(:m AS date) AND sale_date < CAST(:m AS date) + INTERVAL '1 month'
+            """), {"m": m}).rowcount
+            moved += n
+            print(f"  {part}: {n} rows")
+
+        conn.execute(text(f"""
+            INSERT INTO salesops.fact_source_key (source_file, source_row_number, sale_date)
+            SELECT source_file, source_row_number, sale_date FROM salesops.{old}
+            ON CONFLICT (source_file, source_row_number) DO NOTHING
+        """))
+        conn.execute(text(
+            "SELECT setval(pg_get_serial_sequence('salesops.fact_sales_line', 'line_id'), "
+            "COALESCE((SELECT MAX(line_id) FROM salesops.fact_sales_line), 0) + 1, false)"
+        ))
+
+        expected = conn.execute(text(f"SELECT COUNT(*) FROM salesops.{old}")).scalar_one()
+        if moved != expected:
+            raise RuntimeError(f"Moved {moved} rows but salesops.{old} has {expected}; rolling back")
+
+        # The schema's one-time fills saw an empty fact table, so rollups it
+        # just created are still empty; fill those from the moved rows
+        first, last = conn.execute(text(SQL_OLD_DATE_RANGE.format(old=old))).one()
+        if first is not None:
+            for table, rebuild in (("agg_daily_sales", rebuild_rollup), ("agg_daily_dq", recompute_dq_stats)):
+                if not conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM salesops.{table})")).scalar():
+                    rebuild(conn, first, last)
+
+        if not args.keep_old:
+            conn.execute(text(f"DROP TABLE salesops.{old}"))
+
+    # Trend totals from the (possibly just filled) rollup; also bumps the data version
+    refresh_sales_views(engine)
+    print(
+        f"Partitioned salesops.fact_sales_line: {moved} rows in {len(months)} month(s), "
+        f"{time.perf_counter() - t0:.1f}s" + (f" (old table kept as salesops.{old})" if args.keep_old else "")
+    )
+
+
+if __name__ == "__main__":
+    main()
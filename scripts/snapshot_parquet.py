@@ -0,0 +1,43 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ensure project root is on sys.path so "import app" works
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+from app.db import get_engine
+from app.offline.snapshot import DEFAULT_FETCH_ROWS, export_snapshot
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Append fact_sales_line lines ingested since the last run to a date-partitioned Parquet snapshot"
+    )
+    parser.add_argument("--out-dir", default="outputs/snapshot", help="Snapshot directory")
+    parser.add_argument("--fetch-rows", type=int, default=DEFAULT_FETCH_ROWS, help="Rows per server-side cursor fetch")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Delete the snapshot and export every line again (picks up archived or deleted rows)"
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    t0 = time.perf_counter()
+    run = export_snapshot(get_engine(), args.out_dir, fetch_rows=args.fetch_rows, full=args.full)
+    elapsed = time.perf_counter() - t0
+
+    if run["orphans_removed"]:
+        print(f"Removed {run['orphans_removed']} file(s) left by an unfinished run")
+    print(
+        f"Snapshot {args.out_dir}: {run['rows']:,} line(s) ingested "
+        f"{run['after'] or 'beginning'} ~ {run['before']} across {run['days']} day(s) in {elapsed:.1f}s ✅"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -33,13 +33,19 @@ CREATE TABLE IF NOT EXISTS salesops.dim_shipping_company (
 
 -- =========================
 -- Fact table: one row per excel line item
+-- Range-partitioned by sale_date month (fact_sales_line_pYYYY_MM). The
+-- importer calls salesops.ensure_fact_partition() for every month it is
+-- about to insert; report queries filter on sale_date, so the planner
+-- prunes to the months in range.
 -- =========================
 
 CREATE TABLE IF NOT EXISTS salesops.fact_sales_line (
-  line_id             BIGSERIAL PRIMARY KEY,
+  line_id             BIGSERIAL,
 
   sale_time           TIMESTAMPTZ NOT NULL,
-  sale_date           DATE GENERATED ALWAYS AS ((sale_time AT TIME ZONE 'UTC')::date) STORED,
+  -- Partition key. A generated column cannot be one, so the importer fills it
+  -- and chk_sale_date_utc keeps it equal to the UTC date of sale_time.
+  sale_date           DATE NOT NULL,
 
   product_id          BIGINT NOT NULL REFERENCES salesops.dim_product(product_id),
   seller_id           BIGINT NOT NULL REFERENCES salesops.dim_seller(seller_id),
@@ -48,26 +54,188 @@ CREATE TABLE IF NOT EXISTS salesops.fact_sales_line (
   unit_price          NUMERIC(12,2) NOT NULL,
   units               NUMERIC(12,2) NOT NULL,
   line_total          NUMERIC(12,2) NOT NULL,
+  -- line_total - round(unit_price*units, 2), non-zero on mismatched rows
+  total_diff          NUMERIC(14,2) GENERATED ALWAYS AS (line_total - ROUND(unit_price * units, 2)) STORED,
 
   source_file         TEXT NOT NULL,
   source_row_number   INTEGER NOT NULL,
   ingested_at         TIMESTAMPTZ NOT NULL DEFAULT now(),
 
   -- Basic sanity constraints
+  CONSTRAINT chk_sale_date_utc CHECK (sale_date = (sale_time AT TIME ZONE 'UTC')::date),
   CONSTRAINT chk_unit_price_nonneg CHECK (unit_price >= 0),
   CONSTRAINT chk_units_pos CHECK (units > 0),
   CONSTRAINT chk_line_total_nonneg CHECK (line_total >= 0),
 
-  -- Prevent duplicate re-import for same file & row
-  CONSTRAINT uq_fact_source UNIQUE (source_file, source_row_number)
-);
+  -- Unique constraints on a partitioned table must include the partition key
+  PRIMARY KEY (line_id, sale_date)
+) PARTITION BY RANGE (sale_date);
 
--- Helpful indexes for reporting
+-- Helpful indexes for reporting (created on every partition)
 CREATE INDEX IF NOT EXISTS idx_fact_sale_date ON salesops.fact_sales_line (sale_date);
 CREATE INDEX IF NOT EXISTS idx_fact_seller_date ON salesops.fact_sales_line (seller_id, sale_date);
 CREATE INDEX IF NOT EXISTS idx_fact_product_date ON salesops.fact_sales_line (product_id, sale_date);
 CREATE INDEX IF NOT EXISTS idx_fact_ship_date ON salesops.fact_sales_line (shipping_company_id, sale_date);
 
+-- Databases created before total_diff existed (rewrites every partition once)
+ALTER TABLE salesops.fact_sales_line
+  ADD COLUMN IF NOT EXISTS total_diff NUMERIC(14,2)
+  GENERATED ALWAYS AS (line_total - ROUND(unit_price * units, 2)) STORED;
+
+-- Data-quality samples: only anomalous rows, in keyset order. Small, since
+-- most lines are clean; SQL_DATA_QUALITY_SAMPLES repeats this predicate.
+CREATE INDEX IF NOT EXISTS idx_fact_dq_anomaly ON salesops.fact_sales_line (sale_time, line_id)
+  WHERE total_diff <> 0 OR units <= 0 OR unit_price < 0 OR line_total < 0;
+
+-- Incremental Parquet snapshots read lines by ingested_at. Rows are appended in
+-- ingest order, so a BRIN index stays tiny and cheap to maintain.
+CREATE INDEX IF NOT EXISTS idx_fact_ingested_at_brin ON salesops.fact_sales_line USING brin (ingested_at);
+
+-- Prevent duplicate re-import for same file & row.
+-- On the partitioned table this could only be UNIQUE (..., sale_date), which
+-- would accept the same source row again under a different date, so the key
+-- lives in its own unpartitioned table. The importer inserts here first and
+-- only writes fact rows whose key was new. Keys of archived months stay, so
+-- archived rows are not re-imported either.
+CREATE TABLE IF NOT EXISTS salesops.fact_source_key (
+  source_file         TEXT NOT NULL,
+  source_row_number   INTEGER NOT NULL,
+  sale_date           DATE NOT NULL,
+
+  CONSTRAINT uq_fact_source UNIQUE (source_file, source_row_number)
+);
+
+-- Create (if missing) the partition holding p_month; returns its name.
+-- Refuses months whose partition was detached for archiving.
+CREATE OR REPLACE FUNCTION salesops.ensure_fact_partition(p_month DATE)
+RETURNS TEXT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  month_start DATE := date_trunc('month', p_month)::date;
+  part_name   TEXT := format('fact_sales_line_p%s', to_char(date_trunc('month', p_month), 'YYYY_MM'));
+  part_oid    REGCLASS;
+BEGIN
+  part_oid := to_regclass(format('salesops.%I', part_name));
+  IF part_oid IS NULL THEN
+    -- Importers that see the same new month at once create it only once
+    PERFORM pg_advisory_xact_lock(hashtext('salesops.fact_sales_line'));
+    part_oid := to_regclass(format('salesops.%I', part_name));
+    IF part_oid IS NULL THEN
+      EXECUTE format(
+        'CREATE TABLE salesops.%I PARTITION OF salesops.fact_sales_line FOR VALUES FROM (%L) TO (%L)',
+        part_name, month_start, (month_start + INTERVAL '1 month')::date
+      );
+      RETURN part_name;
+    END IF;
+  END IF;
+
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_inherits
+    WHERE inhrelid = part_oid AND inhparent = 'salesops.fact_sales_line'::regclass
+  ) THEN
+    RAISE EXCEPTION 'salesops.% exists but is not attached to fact_sales_line (archived month?)', part_name;
+  END IF;
+  RETURN part_name;
+END;
+$$;
+
+-- =========================
+-- Daily rollup: sale_date x seller x product x shipping company
+-- Maintained incrementally by the importer; report queries that only need
+-- day-level grouping read it instead of fact_sales_line.
+-- =========================
+
+CREATE TABLE IF NOT EXISTS salesops.agg_daily_sales (
+  sale_date           DATE NOT NULL,
+  seller_id           BIGINT NOT NULL REFERENCES salesops.dim_seller(seller_id),
+  product_id          BIGINT NOT NULL REFERENCES salesops.dim_product(product_id),
+  shipping_company_id BIGINT NULL REFERENCES salesops.dim_shipping_company(shipping_company_id),
+
+  revenue             NUMERIC(16,2) NOT NULL,
+  units               NUMERIC(16,2) NOT NULL,
+  line_count          BIGINT NOT NULL
+);
+
+-- NULL shipping company is its own group, so the key uses COALESCE(..., 0)
+CREATE UNIQUE INDEX IF NOT EXISTS uq_agg_daily_key
+  ON salesops.agg_daily_sales (sale_date, seller_id, product_id, COALESCE(shipping_company_id, 0));
+CREATE INDEX IF NOT EXISTS idx_agg_daily_seller_date ON salesops.agg_daily_sales (seller_id, sale_date);
+CREATE INDEX IF NOT EXISTS idx_agg_daily_product_date ON salesops.agg_daily_sales (product_id, sale_date);
+
+-- Initial fill for databases that had facts before the rollup existed. Report
+-- queries route here (USE_DAILY_ROLLUP=true), so it must not start empty.
+INSERT INTO salesops.agg_daily_sales
+  (sale_date, seller_id, product_id, shipping_company_id, revenue, units, line_count)
+SELECT sale_date, seller_id, product_id, shipping_company_id,
+       SUM(line_total), SUM(units), COUNT(*)
+FROM salesops.fact_sales_line
+WHERE NOT EXISTS (SELECT 1 FROM salesops.agg_daily_sales)
+GROUP BY sale_date, seller_id, product_id, shipping_company_id;
+
+-- =========================
+-- Daily data-quality counts at the default tolerance (0.05), maintained by the
+-- importer like agg_daily_sales. /reports/data-quality sums days from here
+-- and only scans fact_sales_line for other tolerances.
+-- =========================
+
+CREATE TABLE IF NOT EXISTS salesops.agg_daily_dq (
+  sale_date                      DATE PRIMARY KEY,
+
+  line_count                     BIGINT NOT NULL,
+  mismatched_total_count         BIGINT NOT NULL,
+  nonpositive_units_count        BIGINT NOT NULL,
+  negative_amount_count          BIGINT NOT NULL,
+  missing_shipping_company_count BIGINT NOT NULL
+);
+
+-- Initial fill, same as agg_daily_sales above. Mirrors DQ_COUNT_SELECT in
+-- app/ingest/dq_stats.py (tolerance DQ_STATS_TOL = 0.05).
+INSERT INTO salesops.agg_daily_dq
+  (sale_date, line_count, mismatched_total_count, nonpositive_units_count,
+   negative_amount_count, missing_shipping_company_count)
+SELECT
+  sale_date,
+  COUNT(*),
+  COUNT(*) FILTER (WHERE ABS(line_total - ROUND((unit_price * units)::numeric, 2)) > 0.05),
+  COUNT(*) FILTER (WHERE units <= 0),
+  COUNT(*) FILTER (WHERE unit_price < 0 OR line_total < 0),
+  COUNT(*) FILTER (WHERE shipping_company_id IS NULL)
+FROM salesops.fact_sales_line
+WHERE NOT EXISTS (SELECT 1 FROM salesops.agg_daily_dq)
+GROUP BY sale_date;
+
+-- =========================
+-- Data version: bumped (nextval) after every commit that changes report data.
+-- The API's report cache drops its entries when the version moves.
+-- =========================
+
+CREATE SEQUENCE IF NOT EXISTS salesops.data_version_seq;
+
+-- =========================
+-- Ingest manifest: one row per imported file version (content hash)
+-- =========================
+
+CREATE TABLE IF NOT EXISTS salesops.ingest_manifest (
+  manifest_id     BIGSERIAL PRIMARY KEY,
+  source_file     TEXT NOT NULL,
+  content_hash    TEXT NOT NULL,
+  status          TEXT NOT NULL,
+  row_count       INTEGER NULL,
+  inserted_count  INTEGER NULL,
+  skipped_count   INTEGER NULL,
+  duration_ms     INTEGER NULL,
+  last_committed_row INTEGER NULL,  -- resume checkpoint (source_row_number)
+  error_message   TEXT NULL,
+  started_at      TIMESTAMPTZ NOT NULL DEFAULT now(),
+  finished_at     TIMESTAMPTZ NULL,
+
+  CONSTRAINT chk_manifest_status CHECK (status IN ('running', 'loaded', 'failed')),
+  CONSTRAINT uq_manifest_file_hash UNIQUE (source_file, content_hash)
+);
+
+CREATE INDEX IF NOT EXISTS idx_manifest_hash_status ON salesops.ingest_manifest (content_hash, status);
+
 -- =========================
 -- Optional views for daily/weekly reports
 -- =========================
@@ -92,3 +260,36 @@ FROM salesops.fact_sales_line
 GROUP BY 1
 ORDER BY 1;
 
+-- =========================
+-- Daily/weekly totals for trend charts
+-- Built from agg_daily_sales (already day-grain). After an import,
+-- refresh_sales_views() rewrites only the weeks that received rows
+-- (app/ingest/views.py).
+-- =========================
+
+CREATE TABLE IF NOT EXISTS salesops.agg_daily_totals (
+  sale_date   DATE PRIMARY KEY,
+  revenue     NUMERIC NOT NULL,
+  units       NUMERIC NOT NULL,
+  line_count  BIGINT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS salesops.agg_weekly_totals (
+  week_start_monday DATE PRIMARY KEY,
+  revenue           NUMERIC NOT NULL,
+  units             NUMERIC NOT NULL,
+  line_count        BIGINT NOT NULL
+);
+
+-- Initial fill for databases whose agg_daily_sales predates these tables
+INSERT INTO salesops.agg_daily_totals (sale_date, revenue, units, line_count)
+SELECT sale_date, ROUND(SUM(revenue), 2), SUM(units), SUM(line_count)::bigint
+FROM salesops.agg_daily_sales
+WHERE NOT EXISTS (SELECT 1 FROM salesops.agg_daily_totals)
+GROUP BY sale_date;
+
+INSERT INTO salesops.agg_weekly_totals (week_start_monday, revenue, units, line_count)
+SELECT date_trunc('week', sale_date::timestamp)::date, ROUND(SUM(revenue), 2), SUM(units), SUM(line_count)::bigint
+FROM salesops.agg_daily_sales
+WHERE NOT EXISTS (SELECT 1 FROM salesops.agg_weekly_totals)
+GROUP BY 1;
@@ -1,4 +1,11 @@
 TRUNCATE TABLE salesops.fact_sales_line;
+TRUNCATE TABLE salesops.fact_source_key;
+TRUNCATE TABLE salesops.agg_daily_sales;
+TRUNCATE TABLE salesops.agg_daily_dq;
+TRUNCATE TABLE salesops.ingest_manifest;
 TRUNCATE TABLE salesops.dim_product CASCADE;
 TRUNCATE TABLE salesops.dim_seller CASCADE;
 TRUNCATE TABLE salesops.dim_shipping_company CASCADE;
+TRUNCATE TABLE salesops.agg_daily_totals;
+TRUNCATE TABLE salesops.agg_weekly_totals;
+SELECT nextval('salesops.data_version_seq');
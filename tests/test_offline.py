@@ -0,0 +1,166 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pyarrow.parquet as pq
+import pytest
+
+from app.offline import engine
+from app.offline.snapshot import (
+    STATE_FILE,
+    arrow_schema,
+    partition_dir,
+    read_state,
+    remove_orphans,
+    rows_to_table,
+    write_state,
+)
+
+RUN_ID = "20260110T000000000000Z"
+D1, D2 = date(2026, 1, 5), date(2026, 1, 6)
+
+
+def line(line_id, day, hour, product, seller, ship, price, units, total):
+    t = datetime(day.year, day.month, day.day, hour, tzinfo=timezone.utc)
+    return (
+        day, line_id, t, product, seller, ship,
+        Decimal(price), Decimal(units), Decimal(total), "sales.xlsx", line_id + 1, t,
+    )
+
+
+# Rows as SQL_SNAPSHOT_LINES returns them (sale_date first)
+LINES = [
+    line(1, D1, 9, "P1", "S1", "DHL", "0.10", "1.00", "0.10"),
+    line(2, D1, 10, "P1", "S2", "DHL", "0.20", "1.00", "0.20"),
+    # 1.25 * 0.50 = 0.625 -> ROUND gives 0.63 (half away from zero), so this line is clean
+    line(3, D1, 11, "P2", "S1", None, "1.25", "0.50", "0.63"),
+    # 0.05 off: within the default tolerance (mismatch is "> tol"), caught at tol=0.04
+    line(4, D2, 9, "P2", "S2", "UPS", "2.00", "3.00", "6.05"),
+    # 0.06 off: mismatched
+    line(5, D2, 10, "P3", "S2", "UPS", "2.00", "3.00", "6.06"),
+]
+
+
+def write_snapshot(snapshot_dir, rows, run_id=RUN_ID):
+    schema = arrow_schema()
+    for day in sorted({r[0] for r in rows}):
+        out_dir = partition_dir(snapshot_dir, day)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        pq.write_table(rows_to_table([r for r in rows if r[0] == day], schema), out_dir / f"part-{run_id}.parquet")
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    write_snapshot(tmp_path, LINES)
+    write_state(tmp_path, {"watermark": "2026-01-10T00:00:00+00:00", "runs": [{"run_id": RUN_ID}]})
+    return engine.OfflineSnapshot(tmp_path)
+
+
+def test_money_is_summed_in_exact_cents(snapshot):
+    lines = snapshot.lines(D1, D2)
+    summary = engine.weekly_summary(engine.between(lines, D1, D1), D1, D1)
+
+    # 0.10 + 0.20 + 0.63 as floats would be 0.9299999999999999
+    assert summary == {
+        "start_date": D1, "end_date": D1,
+        "revenue": Decimal("0.93"), "units": Decimal("2.50"), "line_count": 3,
+    }
+    assert str(summary["revenue"]) == "0.93"
+
+
+def test_rankings_match_the_sql(snapshot):
+    lines = snapshot.lines(D1, D2)
+
+    assert engine.seller_ranking(lines) == [
+        {"seller_name": "S2", "revenue": Decimal("12.31"), "units": Decimal("7.00"), "line_count": 3},
+        {"seller_name": "S1", "revenue": Decimal("0.73"), "units": Decimal("1.50"), "line_count": 2},
+    ]
+    assert [r["product_code"] for r in engine.top_products(lines, limit=2)] == ["P2", "P3"]
+    # NULL company counted as 'UNKNOWN', like COALESCE in SQL_SHIPPING
+    assert engine.shipping_breakdown(lines) == [
+        {"shipping_company": "UPS", "revenue": Decimal("12.11"), "line_count": 2},
+        {"shipping_company": "UNKNOWN", "revenue": Decimal("0.63"), "line_count": 1},
+        {"shipping_company": "DHL", "revenue": Decimal("0.30"), "line_count": 2},
+    ]
+
+
+def test_equal_revenue_ties_are_broken_by_name(tmp_path):
+    write_snapshot(tmp_path, [
+        line(1, D1, 9, "P1", "Zed", "DHL", "1.00", "1.00", "1.00"),
+        line(2, D1, 9, "P1", "Amy", "DHL", "1.00", "1.00", "1.00"),
+    ])
+    lines = engine.OfflineSnapshot(tmp_path).lines(D1, D1)
+    assert [r["seller_name"] for r in engine.seller_ranking(lines)] == ["Amy", "Zed"]
+
+
+def test_round_cents_and_tolerance_follow_numeric_semantics():
+    assert engine.round_cents(6250).tolist() == 63
+    assert engine.round_cents(-6250).tolist() == -63
+    assert engine.round_cents(6249).tolist() == 62
+    assert engine.tol_cents(0.05) == 5
+    assert engine.tol_cents(0.055) == 5
+    assert engine.tol_cents(0) == 0
+
+
+def test_data_quality_summary(snapshot):
+    lines = snapshot.lines(D1, D2, columns=engine.DQ_COLUMNS)
+
+    assert engine.data_quality_summary(lines, D1, D2) == {
+        "start_date": D1,
+        "end_date": D2,
+        "rows_in_range": 5,
+        "mismatched_total_count": 1,
+        "nonpositive_units_count": 0,
+        "negative_amount_count": 0,
+        "missing_shipping_company_count": 1,
+    }
+    assert engine.data_quality_summary(lines, D1, D2, tol=0.04)["mismatched_total_count"] == 2
+    # SUM over no rows is NULL
+    empty = engine.between(lines, date(2025, 1, 1), date(2025, 1, 1))
+    assert engine.data_quality_summary(empty, "2025-01-01", "2025-01-01")["mismatched_total_count"] is None
+
+
+def test_data_quality_samples_keyset_pages(snapshot):
+    lines = snapshot.lines(D1, D2, columns=engine.DQ_COLUMNS)
+
+    first = engine.data_quality_samples(lines, tol=0.04, limit=1)
+    assert [r["line_id"] for r in first] == [4]
+    assert first[0]["expected_total"] == Decimal("6.00")
+    assert first[0]["diff"] == Decimal("0.05")
+    assert first[0]["sale_date"] == D2
+
+    after = engine.data_quality_samples(
+        lines, tol=0.04, limit=10, after_time=first[0]["sale_time"], after_id=first[0]["line_id"]
+    )
+    assert [r["line_id"] for r in after] == [5]
+
+
+def test_lines_prune_to_the_requested_days(snapshot):
+    assert snapshot.lines(D2, D2)["sale_day"].unique().tolist() == [engine.day_number(D2)]
+    assert snapshot.watermark() == "2026-01-10T00:00:00+00:00"
+
+
+def test_missing_snapshot_is_an_error(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        engine.OfflineSnapshot(tmp_path)
+
+
+def test_state_file_round_trip(tmp_path):
+    assert read_state(tmp_path) == {"watermark": None, "runs": []}
+
+    state = {"watermark": "2026-01-10T00:00:00+00:00", "runs": [{"run_id": RUN_ID, "rows": 5}]}
+    write_state(tmp_path, state)
+
+    assert read_state(tmp_path) == state
+    assert sorted(p.name for p in tmp_path.iterdir()) == [STATE_FILE]
+
+
+def test_remove_orphans_deletes_only_unrecorded_runs(tmp_path):
+    crashed = "20260111T000000000000Z"
+    write_snapshot(tmp_path, LINES)
+    write_snapshot(tmp_path, LINES[:1], run_id=crashed)
+
+    removed = remove_orphans(tmp_path, {"watermark": None, "runs": [{"run_id": RUN_ID}]})
+
+    assert removed == 1
+    assert not (partition_dir(tmp_path, D1) / f"part-{crashed}.parquet").exists()
+    assert len(list(tmp_path.glob(f"sale_date=*/part-{RUN_ID}.parquet"))) == 2
@@ -0,0 +1,81 @@
+import pytest
+
+from app.queries.pivot import MAX_PIVOT_LIMIT, parse_list, plan_pivot
+
+
+@pytest.fixture(autouse=True)
+def rollup_on(monkeypatch):
+    monkeypatch.setenv("USE_DAILY_ROLLUP", "true")
+
+
+def test_parse_list():
+    assert parse_list(None) == []
+    assert parse_list("a, b,,") == ["a", "b"]
+    assert parse_list(["a", "b,c", " "]) == ["a", "b", "c"]
+
+
+@pytest.mark.parametrize("kwargs, message", [
+    ({"dimensions": ["seller; DROP TABLE x"]}, "Unknown dimension"),
+    ({"measures": ["sum(line_total)"]}, "Unknown measure"),
+    ({"filters": {"source_file": ["a.xlsx"]}}, "Unknown filter"),
+    ({"limit": 0}, "limit must be"),
+    ({"limit": MAX_PIVOT_LIMIT + 1}, "limit must be"),
+    ({"sort": "-seller_id"}, "sort must be"),
+])
+def test_rejects_anything_outside_the_whitelists(kwargs, message):
+    args = {"dimensions": ["seller"], "measures": ["revenue"], "filters": {}, **kwargs}
+    with pytest.raises(ValueError, match=message):
+        plan_pivot(args.pop("dimensions"), args.pop("measures"), args.pop("filters"), **args)
+
+
+def test_day_grain_request_reads_the_rollup():
+    plan = plan_pivot(["seller", "sale_date"], ["revenue", "avg_price"], {"product": ["P1"]})
+
+    assert plan["source"] == "agg_daily_sales"
+    assert plan["skipped"] == []
+    assert "FROM salesops.agg_daily_sales src" in plan["sql"]
+    assert "SUM(src.revenue) / NULLIF(SUM(src.units), 0)" in plan["sql"]
+    assert plan["sort"] == "-revenue"
+
+
+def test_line_level_measure_falls_back_to_the_facts():
+    plan = plan_pivot(["product"], ["revenue", "max_line_total"], {})
+
+    assert plan["source"] == "fact_sales_line"
+    assert plan["skipped"] == ["agg_daily_sales: max_line_total needs line-level rows"]
+    assert "FROM salesops.fact_sales_line src" in plan["sql"]
+    assert "SUM(src.line_total)" in plan["sql"]
+    assert "MAX(src.line_total) AS max_line_total" in plan["sql"]
+
+
+def test_rollup_switched_off_reads_the_facts(monkeypatch):
+    monkeypatch.setenv("USE_DAILY_ROLLUP", "false")
+    plan = plan_pivot(["seller"], ["line_count"], {})
+
+    assert plan["source"] == "fact_sales_line"
+    assert plan["skipped"] == ["agg_daily_sales: USE_DAILY_ROLLUP is off"]
+
+
+def test_values_are_bound_never_interpolated():
+    evil = "x'); DROP TABLE salesops.fact_sales_line; --"
+    plan = plan_pivot(["seller"], ["revenue"], {"seller": [evil], "product": []}, limit=5)
+
+    assert evil not in plan["sql"]
+    assert plan["params"] == {"f_seller": [evil], "limit": 5}
+    # Empty filters are dropped
+    assert plan["filters"] == {"seller": [evil]}
+
+
+def test_order_is_stable_and_grouped_by_dimensions():
+    plan = plan_pivot(["seller", "product", "seller"], ["units"], {}, sort="product")
+
+    assert plan["dimensions"] == ["seller", "product"]
+    assert "GROUP BY 1, 2" in plan["sql"]
+    assert "ORDER BY product ASC NULLS LAST, seller" in plan["sql"]
+
+
+def test_no_dimensions_is_a_single_total_row():
+    plan = plan_pivot([], None, {})
+
+    assert plan["measures"] == ["revenue", "units", "line_count"]
+    assert "GROUP BY" not in plan["sql"]
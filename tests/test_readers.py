@@ -0,0 +1,63 @@
+from datetime import datetime
+
+from openpyxl import Workbook
+
+from app.ingest.readers import iter_sales_chunks, text_cell
+from app.ingest.validation import EXPECTED_COLUMNS, prepare_sales_frame
+
+
+def write_xlsx(path, rows):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(EXPECTED_COLUMNS)
+    for r in rows:
+        ws.append(r)
+    wb.save(path)
+
+
+def test_text_cell():
+    assert text_cell(None) is None
+    assert text_cell(" A1 ") == " A1 "
+    assert text_cell(123) == "123"
+    assert text_cell(123.0) == "123"
+    assert text_cell(12.5) == "12.5"
+
+
+def test_xlsx_numeric_codes_are_the_same_text_in_every_chunk(tmp_path):
+    t = datetime(2026, 1, 5, 10, 0)
+    path = tmp_path / "sales.xlsx"
+    write_xlsx(path, [
+        # chunk 1: no blanks
+        [t, 123, 7, 1.5, 2, 3.0, "DHL"],
+        [t, 123, 7, 1.5, 2, 3.0, None],
+        # chunk 2: a blank product and seller next to the numeric codes
+        [t, 123, 7, 1.5, 2, 3.0, 42],
+        [t, None, None, 1.5, 2, 3.0, "DHL"],
+    ])
+
+    frames = [prepare_sales_frame(raw, first) for raw, first in iter_sales_chunks(path, chunk_rows=2)]
+
+    assert len(frames) == 2
+    assert [f["_source_row_number"].tolist() for f in frames] == [[2, 3], [4]]
+    for f in frames:
+        assert f["Product"].tolist() == ["123"] * len(f)
+        assert f["Seller"].tolist() == ["7"] * len(f)
+    assert frames[0]["Shipping Company"].tolist() == ["DHL", None]
+    assert frames[1]["Shipping Company"].tolist() == ["42"]
+
+
+def test_csv_codes_keep_leading_zeros_in_every_chunk(tmp_path):
+    path = tmp_path / "sales.csv"
+    path.write_text(
+        ",".join(EXPECTED_COLUMNS) + "\n"
+        "2026-01-05 10:00,00123,007,1.5,2,3.0,DHL\n"
+        "2026-01-05 10:00,00123,007,1.5,2,3.0,DHL\n"
+        "2026-01-05 10:00,00123,007,1.5,2,3.0,\n"
+        "2026-01-05 10:00,,007,1.5,2,3.0,DHL\n",
+        encoding="utf-8",
+    )
+
+    frames = [prepare_sales_frame(raw, first) for raw, first in iter_sales_chunks(path, chunk_rows=2)]
+
+    assert [f["Product"].tolist() for f in frames] == [["00123", "00123"], ["00123"]]
+    assert [f["Seller"].tolist() for f in frames] == [["007", "007"], ["007"]]
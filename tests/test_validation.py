@@ -0,0 +1,105 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.ingest.validation import (
+    CHECKS,
+    EXPECTED_COLUMNS,
+    REJECT_CHECKS,
+    norm_str_series,
+    prepare_sales_frame,
+    rejected_mask,
+    round_half_away,
+    summarize_flags,
+    validate_sales_frame,
+)
+
+T = datetime(2026, 1, 5, 10, 0)
+CLEAN = [T, "P1", "S1", 2.5, 2, 5.0, "DHL"]
+
+
+def frame(rows):
+    return pd.DataFrame(rows, columns=EXPECTED_COLUMNS)
+
+
+def test_round_half_away_matches_postgres_round():
+    values = [0.125, -0.125, 2.675, -2.675, 1.005, 0.004, 0.0, 12.344999]
+    expected = [0.13, -0.13, 2.68, -2.68, 1.01, 0.0, 0.0, 12.34]
+    assert round_half_away(values).tolist() == pytest.approx(expected, abs=1e-12)
+
+
+def test_prepare_sales_frame_rounds_numbers_once():
+    df = prepare_sales_frame(frame([[T, "P1", "S1", 1.005, 2.675, 2.685, "DHL"]]))
+    assert df[["Unit Price", "Units", "Total Price"]].iloc[0].tolist() == pytest.approx([1.01, 2.68, 2.69])
+
+
+# One row per rule that trips that rule and no other
+FLAGGED_ROWS = {
+    "mismatched_total": [T, "P1", "S1", 2.5, 2, 5.06, "DHL"],
+    "nonpositive_units": [T, "P1", "S1", 2.5, 0, 0.0, "DHL"],
+    "negative_amount": [T, "P1", "S1", -2.5, 2, -5.0, "DHL"],
+    "missing_shipping_company": [T, "P1", "S1", 2.5, 2, 5.0, "  "],
+}
+
+
+def test_every_check_has_a_test_row():
+    assert set(FLAGGED_ROWS) == set(CHECKS)
+
+
+@pytest.mark.parametrize("check", sorted(CHECKS))
+def test_each_check_flags_only_its_row(check):
+    flags = validate_sales_frame(prepare_sales_frame(frame([CLEAN, FLAGGED_ROWS[check]])))
+
+    assert flags[check].tolist() == [False, True]
+    others = [c for c in CHECKS if c != check]
+    assert not flags[others].any(axis=None)
+    assert rejected_mask(flags).tolist() == [False, check in REJECT_CHECKS]
+
+
+def test_mismatch_tolerance_is_inclusive():
+    df = prepare_sales_frame(frame([
+        [T, "P1", "S1", 2.5, 2, 5.05, "DHL"],
+        [T, "P1", "S1", 2.5, 2, 4.95, "DHL"],
+        [T, "P1", "S1", 2.5, 2, 5.06, "DHL"],
+    ]))
+    assert validate_sales_frame(df, tol=0.05)["mismatched_total"].tolist() == [False, False, True]
+    assert not validate_sales_frame(df, tol=0.1)["mismatched_total"].any()
+
+
+def test_summarize_flags_counts_every_check_and_rejections():
+    flags = validate_sales_frame(prepare_sales_frame(frame([CLEAN, *FLAGGED_ROWS.values()])))
+    summary = summarize_flags(flags)
+
+    assert summary["rows_checked"] == 5
+    for name in CHECKS:
+        assert summary[f"{name}_count"] == 1
+    assert summary["rejected_count"] == len(REJECT_CHECKS)
+
+
+def test_norm_str_series_strips_and_blanks_to_none():
+    out = norm_str_series(pd.Series([" a ", "b", "", "   ", None, np.nan]))
+    assert out.tolist() == ["a", "b", None, None, None, None]
+
+
+def test_prepare_sales_frame_cleans_text_and_drops_incomplete_rows():
+    df = prepare_sales_frame(frame([
+        [T, " P1 ", "S1\t", 2.5, 2, 5.0, " DHL "],
+        [T, "  ", "S1", 2.5, 2, 5.0, "DHL"],
+        [T, "P2", "S2", 2.5, 2, 5.0, ""],
+        [T, "P3", None, 2.5, 2, 5.0, "DHL"],
+    ]), first_row_number=10)
+
+    assert df["Product"].tolist() == ["P1", "P2"]
+    assert df["Seller"].tolist() == ["S1", "S2"]
+    assert df["Shipping Company"].tolist() == ["DHL", None]
+    # Sheet row numbers of the rows that were kept
+    assert df["_source_row_number"].tolist() == [10, 12]
+
+
+def test_prepare_sales_frame_rejects_missing_columns_and_bad_times():
+    with pytest.raises(RuntimeError, match="Missing columns"):
+        prepare_sales_frame(frame([CLEAN]).drop(columns=["Seller"]))
+    with pytest.raises(RuntimeError, match="unparsable Time"):
+        prepare_sales_frame(frame([["not a time", *CLEAN[1:]]]))